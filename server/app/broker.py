@@ -0,0 +1,139 @@
+"""
+In-process pub/sub used to push events to streaming (SSE) clients.
+
+Subscribers get a small bounded queue each. Publishing never blocks: when
+a queue is full the oldest event is dropped and counted, and events that
+share a ``coalesce`` key replace the queued one instead of piling up
+(e.g. successive unread-count updates). A subscriber that sees
+``dropped`` > 0 should resync over the regular REST endpoints.
+
+Events are published only after the surrounding DB transaction commits;
+see ``publish_after_commit``.
+"""
+import json
+import threading
+from collections import deque
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = 'broker_pending_events'
+
+
+class Subscription:
+    __slots__ = ('_broker', 'channels', 'maxsize', 'dropped', '_items', '_cond', '_closed')
+
+    def __init__(self, broker, channels, maxsize):
+        self._broker  = broker
+        self.channels = tuple(channels)
+        self.maxsize  = maxsize
+        self.dropped  = 0
+        self._items   = deque()
+        self._cond    = threading.Condition(threading.Lock())
+        self._closed  = False
+
+    def put(self, event):
+        with self._cond:
+            key = event.get('coalesce')
+            if key is not None:
+                for i, queued in enumerate(self._items):
+                    if queued.get('coalesce') == key:
+                        del self._items[i]
+                        break
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(event)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Next event, or None on timeout / close."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        self._broker.unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Broker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._channels  = {}
+        self._lock      = threading.Lock()
+
+    def init_app(self, app):
+        self.queue_size = app.config.get('BROKER_QUEUE_SIZE', self.queue_size)
+        app.extensions['broker'] = self
+
+    def subscribe(self, *channels, maxsize=None):
+        sub = Subscription(self, channels, maxsize or self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._channels.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            for channel in sub.channels:
+                subs = self._channels.get(channel)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._channels[channel]
+
+    def publish(self, channel, event):
+        """Deliver to every current subscriber; returns how many received it."""
+        with self._lock:
+            subs = list(self._channels.get(channel, ()))
+        for sub in subs:
+            sub.put(event)
+        return len(subs)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._channels.get(channel, ()))
+            return sum(len(s) for s in self._channels.values())
+
+
+broker = Broker()
+
+
+def publish_after_commit(session, channel, event):
+    """Queue an event that is published only if the session's transaction commits."""
+    session.info.setdefault(_PENDING_KEY, []).append((channel, event))
+
+
+@sa_event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for channel, event in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(channel, event)
+
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def sse_format(event):
+    """Render a broker event as a Server-Sent Events frame."""
+    lines = []
+    if event.get('id') is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event.get('event', 'message')}")
+    lines.append(f"data: {json.dumps(event.get('data'))}")
+    return '\n'.join(lines) + '\n\n'
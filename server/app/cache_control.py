@@ -0,0 +1,46 @@
+"""
+Cache-Control policies declared next to the routes.
+
+A blueprint states its default once, right after it is created, and
+individual views can override it:
+
+    task_bp = Blueprint('task_bp', __name__)
+    cache_policy(task_bp, private=True, no_cache=True)
+
+    @task_bp.route('/export')
+    @cache_control(no_store=True)
+    def export(): ...
+
+Keyword arguments are werkzeug ``ResponseCacheControl`` attributes
+(``max_age=60``, ``public=True``, ``must_revalidate=True`` ...). A
+response that already carries a Cache-Control header (the SSE streams)
+is left as it is.
+"""
+from functools import wraps
+from flask import make_response
+
+
+def apply_cache_control(response, directives):
+    if 'Cache-Control' in response.headers:
+        return response
+    for name, value in directives.items():
+        setattr(response.cache_control, name, value)
+    return response
+
+
+def cache_control(**directives):
+    """View decorator setting Cache-Control on the view's response."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return apply_cache_control(make_response(view(*args, **kwargs)), directives)
+        return wrapper
+    return decorator
+
+
+def cache_policy(blueprint, **directives):
+    """Default Cache-Control for every response from ``blueprint``."""
+    @blueprint.after_request
+    def _apply_cache_policy(response):
+        return apply_cache_control(response, directives)
+    return blueprint
@@ -0,0 +1,225 @@
+"""
+Per-project change feed for client sync.
+
+``change_log`` holds one row per task, comment and collaborator a
+project has had: whether it currently exists ('upsert') or was deleted
+(a 'delete' tombstone), and ``seq``, the project ``revision`` (see
+app.etags) of the transaction that last wrote it. A write replaces the
+entity's row rather than appending one, so the log is compacted by key
+as it goes: it never holds more than one row per entity, and reading a
+project's rows after ``since`` yields each changed entity once.
+
+The revision is bumped under the project's row lock in the same
+transaction, so a project's seqs become visible in order: a client that
+has synced up to ``since`` can't later miss a commit with a lower seq.
+
+ORM writes are captured by the flush hooks below; bulk Core writes call
+``log_changes`` themselves after ``bump_revision``. Tombstones older
+than CHANGES_TOMBSTONE_DAYS are pruned by a daily job (or ``flask
+changes compact``), which raises the project's ``changes_floor`` past
+them; a client whose ``since`` is below the floor may have missed a
+deletion and is told to rebuild its copy from the feed.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from extensions import db
+from app.database import dialect_insert
+from app.jobs import enqueue, job_handler
+from models.change_log import ChangeLog
+from models.collaborator import Collaborator
+from models.comment import Comment
+from models.project import Project
+from models.task import Task
+
+UPSERT, DELETE = 'upsert', 'delete'
+MODELS = {'task': Task, 'comment': Comment, 'collaborator': Collaborator}
+COMPACT_JOB = 'changes.compact'
+
+_PENDING_KEY = 'change_log'
+
+
+def log_changes(changes, session=None):
+    """
+    Record ``changes``, {project_id: {(entity, entity_id): op}}, at each
+    project's current revision, so call it after the revision bump.
+    """
+    changes = {pid: c for pid, c in changes.items() if c}
+    if not changes:
+        return
+    session    = session or db.session
+    connection = session.connection()
+    revisions  = dict(connection.execute(
+        db.select(Project.id, Project.revision).where(Project.id.in_(changes))
+    ).all())
+    now  = datetime.utcnow()
+    rows = [
+        {'project_id': pid, 'entity': entity, 'entity_id': entity_id, 'op': op,
+         'seq': revisions[pid], 'changed_at': now}
+        for pid, entries in changes.items() if pid in revisions
+        for (entity, entity_id), op in entries.items()
+    ]
+    if not rows:
+        return
+    table = ChangeLog.__table__
+    stmt  = dialect_insert(connection)(table)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['project_id', 'entity', 'entity_id'],
+            set_={'op': stmt.excluded.op, 'seq': stmt.excluded.seq, 'changed_at': stmt.excluded.changed_at}
+        ),
+        rows
+    )
+    if any(row['op'] == DELETE for row in rows):
+        # one pending compaction per day; it runs a day later
+        enqueue(COMPACT_JOB, key=f'{COMPACT_JOB}:{date.today()}', delay=86400, session=session)
+
+
+def _comment_projects(session, task_ids):
+    """project_id per task id, from Task objects already in the session where possible."""
+    projects, missing = {}, set()
+    for task_id in task_ids:
+        task = session.identity_map.get(session.identity_key(Task, task_id))
+        if task is not None:
+            projects[task_id] = task.project_id
+        else:
+            missing.add(task_id)
+    if missing:
+        projects.update(session.connection().execute(
+            db.select(Task.id, Task.project_id).where(Task.id.in_(missing))
+        ).all())
+    return projects
+
+
+@event.listens_for(Session, 'after_flush')
+def _capture_changes(session, flush_context):
+    changes, comments, dropped = defaultdict(dict), [], set()
+    # deletes last, so they win over an update in the same flush
+    for objs, op in ((session.new, UPSERT), (session.dirty, UPSERT), (session.deleted, DELETE)):
+        for obj in objs:
+            if op == UPSERT and obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            if isinstance(obj, Task):
+                changes[obj.project_id][('task', obj.id)] = op
+            elif isinstance(obj, Collaborator):
+                changes[obj.project_id][('collaborator', obj.id)] = op
+            elif isinstance(obj, Comment):
+                comments.append((obj, op))
+            elif isinstance(obj, Project) and op == DELETE:
+                dropped.add(obj.id)
+
+    if comments:
+        projects = _comment_projects(session, {c.task_id for c, _ in comments})
+        for comment, op in comments:
+            if comment.task_id in projects:
+                changes[projects[comment.task_id]][('comment', comment.id)] = op
+
+    if dropped:
+        # ON DELETE CASCADE does this where foreign keys are enforced
+        session.connection().execute(
+            db.delete(ChangeLog.__table__).where(ChangeLog.__table__.c.project_id.in_(dropped))
+        )
+    for project_id in dropped | {None}:
+        changes.pop(project_id, None)
+    if changes:
+        session.info[_PENDING_KEY] = changes
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _write_changes(session, flush_context):
+    # after every after_flush hook, i.e. once app.etags has bumped the revisions
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        log_changes(changes, session)
+
+
+def read_changes(project_id, since, limit, after=None):
+    """
+    Up to ``limit`` of the project's changes with seq > ``since`` (and
+    after the (seq, id) cursor ``after``), in seq order, plus the cursor of
+    the next page or None. Upserts carry the entity's current fields.
+    """
+    table = ChangeLog.__table__
+    stmt  = (
+        db.select(table.c.id, table.c.seq, table.c.entity, table.c.entity_id, table.c.op)
+          .where(table.c.project_id == project_id, table.c.seq > since)
+    )
+    if after is not None:
+        stmt = stmt.where(db.or_(
+            table.c.seq > after[0],
+            db.and_(table.c.seq == after[0], table.c.id > after[1])
+        ))
+    rows = db.session.execute(stmt.order_by(table.c.seq, table.c.id).limit(limit + 1)).all()
+    next_after = (rows[limit - 1].seq, rows[limit - 1].id) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    wanted = defaultdict(list)
+    for row in rows:
+        if row.op == UPSERT:
+            wanted[row.entity].append(row.entity_id)
+    data = {}
+    for entity, ids in wanted.items():
+        model = MODELS[entity]
+        dump  = model.schema.dumper()
+        for found in db.session.execute(db.select(*model.schema.columns()).where(model.id.in_(ids))):
+            data[(entity, found.id)] = dump(found)
+
+    changes = []
+    for row in rows:
+        record = data.get((row.entity, row.entity_id))
+        # an upsert whose entity is gone was deleted after the log was read;
+        # its tombstone comes with a later sync
+        op = UPSERT if record is not None else DELETE
+        changes.append({'seq': row.seq, 'entity': row.entity, 'id': row.entity_id, 'op': op, 'data': record})
+    return changes, next_after
+
+
+def compact(retention=timedelta(days=30), now=None):
+    """
+    Prune tombstones older than ``retention`` and raise each affected
+    project's ``changes_floor`` to the highest pruned seq. Returns how many
+    were removed; the caller commits. Upserts are never pruned, they are
+    the current state.
+    """
+    cutoff = (now or datetime.utcnow()) - retention
+    table  = ChangeLog.__table__
+    stale  = db.and_(table.c.op == DELETE, table.c.changed_at < cutoff)
+    floors = db.session.execute(
+        db.select(table.c.project_id, db.func.max(table.c.seq)).where(stale).group_by(table.c.project_id)
+    ).all()
+    if not floors:
+        return 0
+    projects = Project.__table__
+    db.session.execute(
+        db.update(projects)
+          .where(projects.c.id == db.bindparam('pid'))
+          .values(changes_floor=db.case(
+              (projects.c.changes_floor < db.bindparam('floor'), db.bindparam('floor')),
+              else_=projects.c.changes_floor
+          )),
+        [{'pid': pid, 'floor': floor} for pid, floor in floors]
+    )
+    return db.session.execute(db.delete(table).where(stale)).rowcount
+
+
+@job_handler(COMPACT_JOB, max_attempts=3)
+def compact_job(payload):
+    compact(timedelta(days=current_app.config.get('CHANGES_TOMBSTONE_DAYS', 30)))
+
+
+changes_cli = AppGroup('changes', help='Project change feed.')
+
+
+@changes_cli.command('compact')
+@click.option('--days', type=float, help='Tombstone retention (default CHANGES_TOMBSTONE_DAYS).')
+def compact_command(days):
+    """Prune old tombstones from the change log."""
+    if days is None:
+        days = current_app.config.get('CHANGES_TOMBSTONE_DAYS', 30)
+    removed = compact(timedelta(days=days))
+    db.session.commit()
+    click.echo(f'removed {removed} tombstone(s)')
@@ -0,0 +1,194 @@
+"""
+Per-project chat: message persistence and fan-out.
+
+Messages are delivered to connected clients through ``app.broker`` on the
+``project:<id>:chat`` channel, always *after* they are committed so every
+pushed message carries its database id (which is also the history and
+long-poll cursor).
+
+How a send is persisted depends on ``CHAT_DURABILITY``:
+
+``sync``
+    The request inserts and commits the message itself and answers 201
+    with the id. The sender knows the message is stored.
+``async`` (default)
+    The request hands the message to ``ChatWriter`` and answers 202
+    straight away. A background thread drains the queue and writes
+    whatever has accumulated in one INSERT + commit (group commit), so
+    send latency isn't bound to commit latency and a busy channel costs
+    one transaction per batch rather than per message. Messages still in
+    the queue are lost if the process dies; when the queue is full the
+    request falls back to a synchronous write instead of dropping.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from extensions import db
+from models.chat_message import ChatMessage
+from app.broker import publish_after_commit
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def chat_channel(project_id):
+    return f'project:{project_id}:chat'
+
+
+def message_entry(project_id, user_id, text):
+    """Row dict for a new message, stamped at send time."""
+    return {
+        'project_id': project_id,
+        'user_id':    user_id,
+        'text':       text,
+        'uuid':       str(uuid.uuid4()),
+        'created_at': datetime.utcnow(),
+    }
+
+
+def message_data(message_id, entry):
+    """The JSON shape of a message, as returned by ``ChatMessage.serialize``."""
+    return {
+        'id':         message_id,
+        'project_id': entry['project_id'],
+        'user_id':    entry['user_id'],
+        'text':       entry['text'],
+        'uuid':       entry['uuid'],
+        'created_at': entry['created_at'].isoformat(),
+    }
+
+
+def insert_messages(entries):
+    """
+    Insert messages in the current session with one statement and queue
+    their broker events for after the commit. The caller commits.
+    """
+    ids = db.session.scalars(
+        db.insert(ChatMessage).returning(ChatMessage.id, sort_by_parameter_order=True),
+        entries
+    ).all()
+    for message_id, entry in zip(ids, entries):
+        publish_after_commit(db.session, chat_channel(entry['project_id']), {
+            'event': 'message',
+            'id':    message_id,
+            'data':  message_data(message_id, entry),
+        })
+    return ids
+
+
+class ChatWriter:
+    """Background group-commit writer for chat messages."""
+
+    def __init__(self, app=None):
+        self.app        = None
+        self.mode       = 'async'
+        self.batch_size = 500
+        self.queue_size = 10000
+        self.retries    = 3
+        self.written    = 0
+        self.failed     = 0
+        self._queue     = None
+        self._thread    = None
+        self._pid       = None
+        self._lock      = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app        = app
+        self.mode       = app.config.get('CHAT_DURABILITY', self.mode)
+        self.batch_size = app.config.get('CHAT_WRITER_BATCH_SIZE', self.batch_size)
+        self.queue_size = app.config.get('CHAT_WRITER_QUEUE_SIZE', self.queue_size)
+        if self.mode not in ('sync', 'async'):
+            raise ValueError(f"CHAT_DURABILITY must be 'sync' or 'async', not {self.mode!r}")
+        app.extensions['chat_writer'] = self
+
+    @property
+    def durable(self):
+        return self.mode == 'sync'
+
+    def submit(self, entry):
+        """Queue a message; False if the queue is full (caller writes it itself)."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self):
+        # started lazily, and again in each forked worker (threads don't survive fork)
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue  = queue.Queue(maxsize=self.queue_size)
+            self._pid    = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='chat-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                self._queue.task_done()
+                return
+            batch, stop = [entry], False
+            # take whatever piled up while the previous batch was committing
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        with self.app.app_context():
+            for attempt in range(1, self.retries + 1):
+                try:
+                    insert_messages(batch)
+                    db.session.commit()
+                    self.written += len(batch)
+                    return
+                except Exception:
+                    db.session.rollback()
+                    if attempt == self.retries:
+                        self.failed += len(batch)
+                        logger.exception('dropping %d chat message(s) after %d attempts', len(batch), attempt)
+                        return
+                    time.sleep(0.05 * attempt)
+                finally:
+                    db.session.remove()
+
+
+chat_writer = ChatWriter()
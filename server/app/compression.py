@@ -0,0 +1,145 @@
+"""
+gzip / brotli response compression.
+
+``compression.init_app(app)`` installs an ``after_request`` hook that
+negotiates an encoding from Accept-Encoding (brotli when the ``brotli``
+package is installed and the client prefers it or ties, else gzip) and:
+
+* buffered responses: compresses the body when it is at least
+  COMPRESS_MIN_SIZE bytes;
+* streamed responses (exports): wraps the generator, flushing a
+  compressed block per chunk so the client still receives data as it is
+  produced.
+
+Server-Sent Events, 304s, HEAD requests, range responses, file
+passthroughs and bodies that already carry a Content-Encoding are left
+alone. Compressed responses get ``Vary: Accept-Encoding``, and a strong
+ETag is downgraded to weak since the bytes now differ per encoding (see
+``etags.not_modified``, which compares weakly).
+"""
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:      # optional; gzip only
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain',
+)
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits=31: zlib stream with a gzip header and trailer
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, chunk):
+        return self._z.compress(chunk) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._c = brotli.Compressor(quality=quality)
+
+    def process(self, chunk):
+        return self._c.process(chunk) + self._c.flush()
+
+    def finish(self):
+        return self._c.finish()
+
+
+class Compression:
+    def __init__(self):
+        self.min_size       = 1024
+        self.gzip_level     = 6
+        self.brotli_quality = 4
+        self.mimetypes      = frozenset(DEFAULT_MIMETYPES)
+        self.encodings      = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def init_app(self, app):
+        """Read the COMPRESS_* settings and register the after_request hook."""
+        self.min_size       = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level     = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.mimetypes      = frozenset(app.config.get('COMPRESS_MIMETYPES', self.mimetypes))
+        enabled             = app.config.get('COMPRESS_ALGORITHMS', self.encodings)
+        self.encodings      = tuple(e for e in enabled if e == 'gzip' or (e == 'br' and brotli is not None))
+        app.after_request(self.compress_response)
+        app.extensions['compression'] = self
+
+    def negotiate(self):
+        """The encoding to use for this request, or None."""
+        if not self.encodings:
+            return None
+        return request.accept_encodings.best_match(self.encodings)
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def stream(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def compress_response(self, response):
+        if (
+            request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.mimetype not in self.mimetypes
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if not response.is_streamed and (response.calculate_content_length() or 0) < self.min_size:
+            return response
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _CompressedBody(response.response, self.stream(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(self.compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+class _CompressedBody:
+    """Compresses a streamed body chunk by chunk; closing it closes the source."""
+
+    def __init__(self, chunks, stream):
+        self._chunks = chunks
+        self._stream = stream
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            out = self._stream.process(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out:
+                yield out
+        yield self._stream.finish()
+
+    def close(self):
+        if hasattr(self._chunks, 'close'):
+            self._chunks.close()
+
+
+compression = Compression()
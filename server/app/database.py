@@ -0,0 +1,62 @@
+"""
+Engine-level database tuning.
+
+``RoutingSession`` sends reads made while serving GET/HEAD requests to
+the ``replica`` bind when one is configured; flushes and DML always go to
+the primary. ``configure_engines`` applies the SQLite pragmas from Config
+to every new connection. ``dialect_insert`` picks the INSERT construct
+that supports ON CONFLICT for the connection's backend.
+"""
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_ONLY_METHODS = frozenset(('GET', 'HEAD'))
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and has_request_context()
+            and request.method in READ_ONLY_METHODS
+        ):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _sqlite_pragmas(config):
+    journal_mode = config.get('SQLITE_JOURNAL_MODE')
+    synchronous  = config.get('SQLITE_SYNCHRONOUS')
+    busy_timeout = config.get('SQLITE_BUSY_TIMEOUT')
+
+    def on_connect(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        if busy_timeout is not None:
+            cursor.execute(f'PRAGMA busy_timeout = {int(busy_timeout)}')
+        if journal_mode:
+            cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+        if synchronous:
+            cursor.execute(f'PRAGMA synchronous = {synchronous}')
+        cursor.close()
+    return on_connect
+
+
+def dialect_insert(connection):
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def configure_engines(app, db):
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _sqlite_pragmas(app.config))
@@ -0,0 +1,110 @@
+"""
+Conditional GET support for the project/task/comment listings.
+
+Every project carries a ``revision`` counter that is bumped in the same
+transaction as any write to the project, its tasks, their comments or
+the project's collaborators.
+Listing endpoints derive a strong ETag from that counter (plus the query
+string, since different params produce different bodies), so an
+``If-None-Match`` hit costs one primary-key lookup and no serialization.
+Compressed responses carry the weak form of the tag (see app.compression),
+so matching is weak as RFC 9110 prescribes for If-None-Match.
+
+Writes to a single task are conditional on ``If-Match`` against the
+task's own version tag instead, compared strongly.
+"""
+import hashlib
+from flask import Response, abort, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from extensions import db
+from models.project import Project
+from models.task import Task
+from models.comment import Comment
+from models.collaborator import Collaborator
+
+
+def make_etag(*parts):
+    """Hash the parts together with the request's query string."""
+    raw = ':'.join(str(p) for p in parts) + '?' + request.query_string.decode()
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def not_modified(etag):
+    """A 304 response when the client already holds ``etag``, else None."""
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+    return None
+
+
+def with_etag(rv, etag):
+    """Attach the ETag to a ``(response, status)`` tuple returned by a view."""
+    resp, status = rv
+    resp.set_etag(etag)
+    return resp, status
+
+
+def version_etag(kind, row_id, version):
+    """Strong ETag of a single versioned row (see Task.version), for If-Match."""
+    return f'{kind}-{row_id}-v{version}'
+
+
+def if_match_failed(etag):
+    """True when the request carries an If-Match that ``etag`` doesn't satisfy."""
+    return bool(request.if_match) and not request.if_match.contains(etag)
+
+
+def project_revision(project_id):
+    """Current revision of the project; 404 if it doesn't exist."""
+    revision = db.session.scalar(db.select(Project.revision).where(Project.id == project_id))
+    if revision is None:
+        abort(404)
+    return revision
+
+
+def task_project_revision(task_id):
+    """(project_id, revision) of the project owning the task; 404 if missing."""
+    row = db.session.execute(
+        db.select(Project.id, Project.revision)
+          .join(Task, Task.project_id == Project.id)
+          .where(Task.id == task_id)
+    ).first()
+    if row is None:
+        abort(404)
+    return row
+
+
+def bump_revision(project_ids, connection=None):
+    """Increment the revision of each project; used by bulk (non-ORM) writes."""
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+    stmt = (
+        db.update(Project.__table__)
+          .where(Project.__table__.c.id.in_(project_ids))
+          .values(revision=Project.__table__.c.revision + 1)
+    )
+    (connection or db.session).execute(stmt)
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_flush(session, flush_context):
+    project_ids, task_ids = set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, (Task, Collaborator)):
+            project_ids.add(obj.project_id)
+        elif isinstance(obj, Comment):
+            task_ids.add(obj.task_id)
+        elif isinstance(obj, Project) and obj not in session.new:
+            project_ids.add(obj.id)
+
+    if task_ids:
+        project_ids.update(session.connection().execute(
+            db.select(Task.project_id).where(Task.id.in_(task_ids))
+        ).scalars())
+    project_ids.discard(None)
+    bump_revision(project_ids, session.connection())
@@ -0,0 +1,222 @@
+"""
+SQL statement counting and request-level performance metrics.
+
+``count_queries`` is a context manager for scripts and ad-hoc checks.
+
+``metrics`` (a ``RequestMetrics``) is initialised by ``create_app`` and
+records, per endpoint:
+
+* request latency (histogram) and request count by status;
+* SQL statements per request (histogram) and total DB time, from the
+  engines' cursor events;
+* response size as sent (histogram; streamed bodies are not sized).
+
+Statements slower than SLOW_QUERY_MS are logged with their SQL and the
+endpoint that ran them. ``metrics.render()`` produces the Prometheus text
+exposition served at ``/metrics``.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+# [started, statements, db seconds, slow, endpoint, method] for the request
+# being served; a ContextVar rather than flask.g because the cursor hooks
+# run per statement and LocalProxy lookups cost microseconds each
+_request_state = ContextVar('request_metrics', default=None)
+
+
+class QueryCounter:
+    """Collects every SQL statement sent to the engine while attached."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Count the SQL statements executed inside the block.
+
+        with count_queries() as q:
+            client.get('/api/projects/1')
+        assert q.count == 1
+
+    Must be used inside an application context when ``engine`` is omitted.
+    """
+    engine  = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+
+# histogram bucket upper bounds: seconds, bytes, statements
+LATENCY_BUCKETS   = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS      = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Per-label-set bucket counts, sum and count; callers hold the lock."""
+
+    def __init__(self, name, help, labels, buckets):
+        self.name    = name
+        self.help    = help
+        self.labels  = labels
+        self.buckets = buckets
+        self.series  = {}
+
+    def observe(self, key, value):
+        series = self.series.get(key)
+        if series is None:
+            # one slot per bucket plus +Inf
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for key, (counts, total) in sorted(self.series.items()):
+            labels     = _labels(self.labels, key)
+            cumulative = 0
+            for bound, n in zip(self.buckets + ('+Inf',), counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name   = name
+        self.help   = help
+        self.labels = labels
+        self.series = {}
+
+    def inc(self, key, value=1):
+        self.series[key] = self.series.get(key, 0) + value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for key, value in sorted(self.series.items()):
+            lines.append(f'{self.name}{{{_labels(self.labels, key)}}} {value}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.enabled       = True
+        self.slow_query_ms = 200
+        self._lock         = threading.Lock()
+        self.latency       = Histogram('http_request_duration_seconds', 'Request latency.',
+                                       ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.requests      = Counter('http_requests_total', 'Requests by response status.',
+                                     ('endpoint', 'method', 'status'))
+        self.size          = Histogram('http_response_size_bytes', 'Response body size as sent.',
+                                       ('endpoint',), SIZE_BUCKETS)
+        self.statements    = Histogram('db_statements_per_request', 'SQL statements executed per request.',
+                                       ('endpoint',), STATEMENT_BUCKETS)
+        self.db_time       = Counter('db_time_seconds_total', 'Time spent executing SQL.', ('endpoint',))
+        self.slow_queries  = Counter('db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', ('endpoint',))
+
+    def init_app(self, app):
+        """
+        Read METRICS_ENABLED / SLOW_QUERY_MS and install the request hooks
+        and cursor listeners. Call before compression.init_app so the
+        after_request hook runs last and sees the final response.
+        """
+        self.enabled       = app.config.get('METRICS_ENABLED', self.enabled)
+        self.slow_query_ms = app.config.get('SLOW_QUERY_MS', self.slow_query_ms)
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        with app.app_context():
+            for engine in db.engines.values():
+                if not event.contains(engine, 'before_cursor_execute', self._before_cursor):
+                    event.listen(engine, 'before_cursor_execute', self._before_cursor)
+                    event.listen(engine, 'after_cursor_execute', self._after_cursor)
+
+    def _start_request(self):
+        req = request._get_current_object()
+        _request_state.set([time.perf_counter(), 0, 0.0, 0, req.endpoint or 'unmatched', req.method])
+
+    def _finish_request(self, response):
+        state = _request_state.get()
+        if state is None:
+            return response
+        _request_state.set(None)
+        elapsed  = time.perf_counter() - state[0]
+        endpoint = state[4]
+        size     = None if response.is_streamed else response.calculate_content_length()
+        with self._lock:
+            self.latency.observe((endpoint, state[5]), elapsed)
+            self.requests.inc((endpoint, state[5], response.status_code))
+            self.statements.observe((endpoint,), state[1])
+            if state[1]:
+                self.db_time.inc((endpoint,), state[2])
+            if state[3]:
+                self.slow_queries.inc((endpoint,), state[3])
+            if size is not None:
+                self.size.observe((endpoint,), size)
+        return response
+
+    def _before_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        # on the execution context, so a statement that raises takes its
+        # start time with it instead of leaving it on the connection
+        context._metrics_start = time.perf_counter()
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_start', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        state   = _request_state.get()
+        slow    = elapsed * 1000 >= self.slow_query_ms
+        if state is not None:
+            state[1] += 1
+            state[2] += elapsed
+            state[3] += slow
+        if slow:
+            logger.warning(
+                'slow query (%.1f ms) in %s: %s',
+                elapsed * 1000, state[4] if state is not None else 'background', statement
+            )
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.latency, self.requests, self.size,
+                           self.statements, self.db_time, self.slow_queries):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = RequestMetrics()
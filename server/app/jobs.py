@@ -0,0 +1,290 @@
+"""
+Durable background jobs backed by the ``job`` table.
+
+Routes only ``enqueue``: the job row is inserted in the request's own
+transaction, so it exists exactly when the request's writes commit, and
+the response doesn't wait for the work. An ``idempotency_key`` makes a
+repeated enqueue (double submit, client retry) a no-op.
+
+Workers claim the oldest due job with one ``UPDATE ... RETURNING``
+(``FOR UPDATE SKIP LOCKED`` on Postgres), run its handler and mark it
+done in the same transaction as the handler's own writes. A failing job
+is retried with exponential backoff (JOBS_BACKOFF_BASE doubling per
+attempt, capped at JOBS_BACKOFF_MAX, +/-20% jitter) until
+``max_attempts``, then left ``failed`` with the error. A job whose
+worker died mid-run is claimed again once its lease
+(JOBS_LEASE_SECONDS) expires, so handlers must tolerate running twice.
+
+Workers run in the web process (JOBS_WORKERS threads, started lazily and
+woken right after a commit that enqueued something) and/or in a
+dedicated process with ``flask jobs run``.
+"""
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from extensions import db
+from app.database import dialect_insert
+from models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_WAKE_KEY = 'jobs_enqueued'
+_handlers = {}
+
+
+def job_handler(kind, max_attempts=5):
+    """Register ``fn(payload)`` as the handler for jobs of ``kind``."""
+    def decorator(fn):
+        _handlers[kind] = (fn, max_attempts)
+        return fn
+    return decorator
+
+
+def enqueue(kind, payload=None, key=None, delay=0, session=None):
+    """
+    Add a job to the current transaction (the caller commits). Returns its
+    id, or None when a job with the same idempotency ``key`` exists.
+    """
+    if kind not in _handlers:
+        raise ValueError(f'No handler registered for job {kind!r}')
+    session = session or db.session
+    now     = datetime.utcnow()
+    table   = Job.__table__
+    stmt    = dialect_insert(session.connection())(table).values(
+        kind            = kind,
+        payload         = payload or {},
+        status          = 'queued',
+        attempts        = 0,
+        max_attempts    = _handlers[kind][1],
+        idempotency_key = key,
+        run_at          = now + timedelta(seconds=delay),
+        created_at      = now,
+    )
+    if key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['idempotency_key'])
+    job_id = session.execute(stmt.returning(table.c.id)).scalar()
+    if job_id is not None:
+        session.info[_WAKE_KEY] = True
+    return job_id
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_after_commit(session):
+    if session.info.pop(_WAKE_KEY, False):
+        job_runner.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop(_WAKE_KEY, None)
+
+
+class JobRunner:
+    """Pool of worker threads executing jobs from the table."""
+
+    def __init__(self, app=None):
+        self.app           = None
+        self.workers       = 2
+        self.poll_interval = 1.0
+        self.lease         = 300
+        self.backoff_base  = 5.0
+        self.backoff_max   = 3600.0
+        self.succeeded     = 0
+        self.failed        = 0
+        self._threads      = []
+        self._pid          = None
+        self._lock         = threading.Lock()
+        self._wake         = threading.Event()
+        self._stopping     = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app           = app
+        self.workers       = app.config.get('JOBS_WORKERS', self.workers)
+        self.poll_interval = app.config.get('JOBS_POLL_INTERVAL', self.poll_interval)
+        self.lease         = app.config.get('JOBS_LEASE_SECONDS', self.lease)
+        self.backoff_base  = app.config.get('JOBS_BACKOFF_BASE', self.backoff_base)
+        self.backoff_max   = app.config.get('JOBS_BACKOFF_MAX', self.backoff_max)
+        app.extensions['job_runner'] = self
+
+    def wake(self):
+        """Nudge idle workers (starting the in-process pool if configured)."""
+        if self.workers > 0:
+            self.start(self.workers)
+        self._wake.set()
+
+    def start(self, workers):
+        # started lazily, and again in each forked worker (threads don't survive fork)
+        if self._threads and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._threads and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, args=(f'{os.getpid()}-{n}',), name=f'job-worker-{n}', daemon=True)
+                for n in range(workers)
+            ]
+            for t in self._threads:
+                t.start()
+            atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=None):
+        """Stop the workers after their current job."""
+        with self._lock:
+            if not self._threads or self._pid != os.getpid():
+                return
+            self._stopping.set()
+            self._wake.set()
+            for t in self._threads:
+                t.join(timeout)
+            self._threads = []
+
+    def _run(self, worker_id):
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_one(worker_id)
+            except Exception:
+                logger.exception('job worker %s failed to claim a job', worker_id)
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def run_one(self, worker_id='inline'):
+        """Claim and run one due job; False if none was due."""
+        with self.app.app_context():
+            try:
+                job = self._claim(worker_id)
+                if job is None:
+                    return False
+                self._execute(job, worker_id)
+                return True
+            finally:
+                db.session.remove()
+
+    def _claim(self, worker_id):
+        now   = datetime.utcnow()
+        table = Job.__table__
+        due   = db.or_(
+            db.and_(table.c.status == 'queued', table.c.run_at <= now),
+            # the worker holding it died or hung past the lease
+            db.and_(table.c.status == 'running', table.c.locked_at < now - timedelta(seconds=self.lease)),
+        )
+        candidate = db.select(table.c.id).where(due).order_by(table.c.run_at, table.c.id).limit(1)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            candidate = candidate.with_for_update(skip_locked=True)
+        job = db.session.execute(
+            db.update(table)
+              .where(table.c.id == candidate.scalar_subquery(), due)
+              .values(status='running', locked_by=worker_id, locked_at=now, attempts=table.c.attempts + 1)
+              .returning(table.c.id, table.c.kind, table.c.payload, table.c.attempts, table.c.max_attempts)
+        ).first()
+        db.session.commit()
+        return job
+
+    def _finish(self, job, worker_id, **values):
+        table = Job.__table__
+        db.session.execute(
+            db.update(table)
+              .where(table.c.id == job.id, table.c.locked_by == worker_id)
+              .values(locked_by=None, locked_at=None, **values)
+        )
+
+    def _execute(self, job, worker_id):
+        handler = _handlers.get(job.kind)
+        if handler is None or job.attempts > job.max_attempts:
+            error = f'No handler registered for job {job.kind!r}' if handler is None else 'Lease expired on the last attempt'
+            self._finish(job, worker_id, status='failed', last_error=error, finished_at=datetime.utcnow())
+            db.session.commit()
+            self.failed += 1
+            return
+
+        started = time.perf_counter()
+        try:
+            handler[0](job.payload)
+            # the handler's writes and the completion commit together
+            self._finish(job, worker_id, status='done', last_error=None, finished_at=datetime.utcnow())
+            db.session.commit()
+            self.succeeded += 1
+            logger.debug('job %s (%s) done in %.1f ms', job.id, job.kind, (time.perf_counter() - started) * 1000)
+        except Exception:
+            db.session.rollback()
+            error = traceback.format_exc(limit=5)
+            if job.attempts >= job.max_attempts:
+                self._finish(job, worker_id, status='failed', last_error=error, finished_at=datetime.utcnow())
+                self.failed += 1
+                logger.error('job %s (%s) failed after %d attempts: %s', job.id, job.kind, job.attempts, error)
+            else:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1)) * random.uniform(0.8, 1.2)
+                self._finish(job, worker_id, status='queued', last_error=error,
+                             run_at=datetime.utcnow() + timedelta(seconds=delay))
+                logger.warning('job %s (%s) attempt %d failed; retrying in %.0f s',
+                               job.id, job.kind, job.attempts, delay)
+            db.session.commit()
+
+
+job_runner = JobRunner()
+
+
+jobs_cli = AppGroup('jobs', help='Run and inspect background jobs.')
+
+
+@jobs_cli.command('run')
+@click.option('--workers', default=2, show_default=True, help='Worker threads.')
+@click.option('--burst', is_flag=True, help='Run due jobs in this thread and exit when none are left.')
+def run_command(workers, burst):
+    """Execute jobs until interrupted."""
+    if burst:
+        n = 0
+        while job_runner.run_one('cli'):
+            n += 1
+        click.echo(f'ran {n} job(s)')
+        return
+    job_runner.start(workers)
+    click.echo(f'{workers} job worker(s) running; Ctrl-C to stop')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        click.echo('stopping after current jobs...')
+        job_runner.shutdown()
+
+
+@jobs_cli.command('status')
+def status_command():
+    """Job counts by status and the age of the oldest due job."""
+    for status, count in db.session.execute(
+        db.select(Job.status, db.func.count()).group_by(Job.status).order_by(Job.status)
+    ):
+        click.echo(f'{status:>8}: {count}')
+    oldest = db.session.scalar(
+        db.select(db.func.min(Job.run_at)).where(Job.status == 'queued', Job.run_at <= datetime.utcnow())
+    )
+    if oldest is not None:
+        click.echo(f'oldest due job waiting {(datetime.utcnow() - oldest).total_seconds():.0f} s')
+
+
+@jobs_cli.command('retry-failed')
+@click.option('--kind', help='Only jobs of this kind.')
+def retry_failed_command(kind):
+    """Requeue failed jobs with a fresh attempt budget."""
+    stmt = db.update(Job).where(Job.status == 'failed')
+    if kind:
+        stmt = stmt.where(Job.kind == kind)
+    result = db.session.execute(stmt.values(
+        status='queued', attempts=0, run_at=datetime.utcnow(), finished_at=None
+    ))
+    db.session.commit()
+    click.echo(f'requeued {result.rowcount} job(s)')
@@ -0,0 +1,57 @@
+"""
+JSON encoding for responses and request bodies.
+
+With orjson installed (and JSON_PROVIDER left at "orjson") the app's
+``app.json`` is an ``OrjsonProvider``: ``jsonify``, ``request.get_json``
+and ``current_app.json.dumps`` all go through orjson, and responses are
+built from its bytes without a str round trip. Anything orjson can't
+encode natively falls back to Flask's ``default`` hook, and datetimes are
+routed there too so they keep Flask's HTTP-date format; the model schemas
+emit ISO strings themselves.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:      # optional; the stdlib provider is used instead
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    # key order follows the model schemas; sorting every dict costs time
+    sort_keys = False
+
+    def _options(self, sort_keys=None, indent=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumpb(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=kwargs.get('default', self.default),
+            option=self._options(kwargs.get('sort_keys'), kwargs.get('indent'))
+        )
+
+    def dumps(self, obj, **kwargs):
+        return self._dumpb(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj    = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumpb(obj, indent=indent) + b'\n', mimetype=self.mimetype
+        )
+
+
+def make_json_provider(app):
+    """The provider named by JSON_PROVIDER, falling back to Flask's own."""
+    if app.config.get('JSON_PROVIDER', 'orjson') == 'orjson' and orjson is not None:
+        return OrjsonProvider(app)
+    return DefaultJSONProvider(app)
@@ -0,0 +1,30 @@
+"""
+Outgoing email over SMTP. Call it from job handlers, not from requests:
+a slow or unreachable mail server should delay the job, not a response.
+Without MAIL_SERVER configured messages are logged instead of sent.
+"""
+import logging
+import smtplib
+from email.message import EmailMessage
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+def send_email(to, subject, body):
+    config = current_app.config
+    if not config.get('MAIL_SERVER'):
+        logger.info('mail to %s: %s (MAIL_SERVER not set, not sent)', to, subject)
+        return
+
+    msg            = EmailMessage()
+    msg['From']    = config['MAIL_SENDER']
+    msg['To']      = to
+    msg['Subject'] = subject
+    msg.set_content(body)
+    with smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=30) as smtp:
+        if config['MAIL_USE_TLS']:
+            smtp.starttls()
+        if config.get('MAIL_USERNAME'):
+            smtp.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+        smtp.send_message(msg)
@@ -0,0 +1,148 @@
+"""
+Per-user project membership, cached in-process.
+
+A user can access a project they own or collaborate on, until it is
+deleted (``Project.deleted_at``, see app.purge). The set of
+accessible project IDs is resolved with one UNION query and kept in a TTL
+cache, so route-level access checks are a set lookup. Cached entries are
+dropped after any commit that adds/removes a collaborator or creates/
+(soft-)deletes a project; the TTL bounds staleness across worker processes.
+"""
+import threading
+from functools import wraps
+from cachetools import TTLCache
+from flask import abort
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from extensions import db
+from models.project import Project
+from models.task import Task
+from models.collaborator import Collaborator
+from app.utils import current_user_id
+
+_PENDING_KEY = 'membership_invalidations'
+
+
+class MembershipService:
+    def __init__(self, app=None):
+        self._cache = TTLCache(maxsize=10000, ttl=60)
+        self._lock  = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._cache = TTLCache(
+            maxsize=app.config.get('MEMBERSHIP_CACHE_SIZE', 10000),
+            ttl=app.config.get('MEMBERSHIP_CACHE_TTL', 60)
+        )
+        app.extensions['membership'] = self
+
+    def project_ids(self, user_id):
+        """Return the frozenset of project IDs the user owns or collaborates on."""
+        user_id = int(user_id)
+        with self._lock:
+            cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        stmt = db.union(
+            db.select(Project.id).where(Project.owner_id == user_id, Project.deleted_at.is_(None)),
+            db.select(Collaborator.project_id)
+              .join(Project, Project.id == Collaborator.project_id)
+              .where(Collaborator.user_id == user_id, Project.deleted_at.is_(None))
+        )
+        ids = frozenset(db.session.scalars(stmt))
+        with self._lock:
+            self._cache[user_id] = ids
+        return ids
+
+    def is_member(self, user_id, project_id):
+        return project_id in self.project_ids(user_id)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            self._cache.pop(int(user_id), None)
+
+    def invalidate_project(self, project_id):
+        """Drop every cached user whose membership set includes the project."""
+        with self._lock:
+            stale = [uid for uid, ids in self._cache.items() if project_id in ids]
+            for uid in stale:
+                self._cache.pop(uid, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+membership = MembershipService()
+
+
+def require_project_access(project_id):
+    """Abort with 403 unless the current JWT user can access the project."""
+    if not membership.is_member(current_user_id(), project_id):
+        abort(403, description='Not a member of this project')
+
+
+def require_task_access(task_id):
+    """Resolve the task's project and check access; 404 if the task is missing."""
+    project_id = db.session.scalar(db.select(Task.project_id).where(Task.id == task_id))
+    if project_id is None:
+        abort(404)
+    require_project_access(project_id)
+    return project_id
+
+
+def project_member_required(fn):
+    """Route decorator for URLs carrying ``project_id``; place under ``@jwt_required()``."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        require_project_access(kwargs['project_id'])
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+# ─── CACHE INVALIDATION ────────────────────────────────────────────────────────
+# Changes are queued on the session during flush and applied only once the
+# transaction commits, so a concurrent request can't re-cache the old state.
+
+def _queue(target, kind, value):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add((kind, value))
+
+
+@event.listens_for(Collaborator, 'after_insert')
+@event.listens_for(Collaborator, 'after_delete')
+def _collaborator_changed(mapper, connection, target):
+    _queue(target, 'user', target.user_id)
+
+
+@event.listens_for(Project, 'after_insert')
+def _project_created(mapper, connection, target):
+    _queue(target, 'user', target.owner_id)
+
+
+@event.listens_for(Project, 'after_delete')
+def _project_deleted(mapper, connection, target):
+    _queue(target, 'project', target.id)
+
+
+@event.listens_for(Project, 'after_update')
+def _project_updated(mapper, connection, target):
+    if inspect(target).attrs.deleted_at.history.has_changes():
+        _queue(target, 'project', target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_invalidations(session):
+    for kind, value in session.info.pop(_PENDING_KEY, ()):
+        if kind == 'user':
+            membership.invalidate_user(value)
+        else:
+            membership.invalidate_project(value)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,41 @@
+"""
+Newsletter subscriptions. Subscribing stores the address and enqueues
+the welcome email; the job sends it and stamps ``welcomed_at``, so a
+retried job doesn't mail twice once that commit has happened.
+"""
+from datetime import datetime
+from extensions import db
+from app.database import dialect_insert
+from app.jobs import enqueue, job_handler
+from app.mail import send_email
+from models.newsletter_subscription import NewsletterSubscription
+
+WELCOME_JOB = 'newsletter.welcome'
+
+
+def subscribe(email):
+    """
+    Add ``email`` (already normalized) in the current session; True if it
+    is new. A repeat subscribe changes nothing and sends nothing.
+    """
+    table  = NewsletterSubscription.__table__
+    sub_id = db.session.execute(
+        dialect_insert(db.session.connection())(table)
+          .values(email=email, created_at=datetime.utcnow())
+          .on_conflict_do_nothing(index_elements=['email'])
+          .returning(table.c.id)
+    ).scalar()
+    if sub_id is None:
+        return False
+    enqueue(WELCOME_JOB, {'subscription_id': sub_id}, key=f'{WELCOME_JOB}:{sub_id}')
+    return True
+
+
+@job_handler(WELCOME_JOB, max_attempts=8)
+def send_welcome(payload):
+    sub = db.session.get(NewsletterSubscription, payload['subscription_id'])
+    if sub is None or sub.welcomed_at is not None:
+        return
+    send_email(sub.email, 'Welcome to the newsletter',
+               "Thanks for subscribing! We'll keep you posted on new features.")
+    sub.welcomed_at = datetime.utcnow()
@@ -0,0 +1,130 @@
+"""
+Writing notifications and pushing them to connected clients.
+
+``notify`` inserts every notification in one statement, bumps each
+recipient's ``User.unread_notifications`` counter and queues broker
+events that go out once the caller's transaction commits.
+"""
+from datetime import datetime
+from extensions import db
+from models.user import User
+from models.notification import Notification
+from app.broker import publish_after_commit
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def notification_entry(user_id, kind, title, message, project_id=None, task_id=None):
+    return {
+        'user_id':    user_id,
+        'kind':       kind,
+        'title':      title,
+        'message':    message,
+        'project_id': project_id,
+        'task_id':    task_id,
+    }
+
+
+def notify(entries, actor_id=None):
+    """
+    Persist notifications (dicts from ``notification_entry``) in the
+    current session. Entries addressed to the acting user or to nobody
+    are skipped. The caller commits.
+    """
+    entries = [e for e in entries if e['user_id'] and e['user_id'] != actor_id]
+    if not entries:
+        return []
+
+    now = datetime.utcnow()
+    for e in entries:
+        e['created_at'] = now
+    ids = db.session.scalars(
+        db.insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+        entries
+    ).all()
+
+    per_user = {}
+    for e in entries:
+        per_user[e['user_id']] = per_user.get(e['user_id'], 0) + 1
+    counts = _adjust_unread(per_user)
+
+    for notification_id, e in zip(ids, entries):
+        publish_after_commit(db.session, user_channel(e['user_id']), {
+            'event': 'notification',
+            'id':    notification_id,
+            'data':  {
+                'id':         notification_id,
+                'kind':       e['kind'],
+                'title':      e['title'],
+                'message':    e['message'],
+                'project_id': e['project_id'],
+                'task_id':    e['task_id'],
+                'read':       False,
+                'created_at': now.isoformat(),
+            }
+        })
+    _publish_unread(counts)
+    return ids
+
+
+def mark_read(user_id, ids=None):
+    """Mark the user's notifications (all, or just ``ids``) read; returns the new unread count."""
+    stmt = (
+        db.update(Notification.__table__)
+          .where(Notification.user_id == user_id, Notification.read_at.is_(None))
+          .values(read_at=datetime.utcnow())
+    )
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+    changed = db.session.execute(stmt).rowcount
+    counts  = _adjust_unread({user_id: -changed}) if changed else {}
+    _publish_unread(counts)
+    return counts.get(user_id, unread_count(user_id))
+
+
+def delete_notifications(ids):
+    """Delete notifications by id, taking unread ones off their recipients' counters."""
+    table = Notification.__table__
+    rows  = db.session.execute(
+        db.delete(table).where(table.c.id.in_(ids)).returning(table.c.user_id, table.c.read_at)
+    ).all()
+    per_user = {}
+    for user_id, read_at in rows:
+        if read_at is None:
+            per_user[user_id] = per_user.get(user_id, 0) - 1
+    _publish_unread(_adjust_unread(per_user))
+    return len(rows)
+
+
+def unread_count(user_id):
+    return db.session.scalar(db.select(User.unread_notifications).where(User.id == user_id)) or 0
+
+
+def _adjust_unread(deltas):
+    """Apply per-user counter deltas; returns {user_id: new_count}."""
+    users    = User.__table__
+    counts   = {}
+    by_delta = {}
+    for user_id, delta in deltas.items():
+        by_delta.setdefault(delta, []).append(user_id)
+    # one statement per distinct delta; a fan-out is mostly +1
+    for delta, user_ids in by_delta.items():
+        new_count = users.c.unread_notifications + delta
+        counts.update(db.session.execute(
+            db.update(users)
+              .where(users.c.id.in_(user_ids))
+              .values(unread_notifications=db.case((new_count < 0, 0), else_=new_count))
+              .returning(users.c.id, users.c.unread_notifications)
+        ).all())
+    return counts
+
+
+def _publish_unread(counts):
+    for user_id, count in counts.items():
+        publish_after_commit(db.session, user_channel(user_id), {
+            'event':    'unread',
+            'data':     {'unread_count': count},
+            'coalesce': 'unread',
+        })
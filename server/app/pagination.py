@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE     = 1000
+
+
+class PaginationError(ValueError):
+    """Raised when a client supplies a malformed cursor, limit or field list."""
+
+
+def _datetime_key(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def encode_cursor(key, row_id):
+    """
+    Build an opaque cursor pointing just after the row at (key, id) in a
+    listing ordered by (key, id): created_at for the default listings, a
+    search score, a change-feed seq. Datetimes are stored as ISO strings.
+    """
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = json.dumps([key, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, parse_key=_datetime_key):
+    """
+    Inverse of encode_cursor; returns (key, id) with the key passed
+    through ``parse_key`` (default: a created_at datetime or None; use
+    float or int for scores and sequence numbers).
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return parse_key(key), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if raw is None:
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError('limit must be an integer')
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+    return min(limit, maximum)
+
+
+def keyset_filter(created_col, id_col, cursor):
+    """WHERE clause selecting rows strictly after the decoded cursor.
+
+    Assumes the query is ordered by ``created_col NULLS FIRST, id_col``.
+    """
+    created_at, row_id = cursor
+    if created_at is None:
+        return or_(
+            and_(created_col.is_(None), id_col > row_id),
+            created_col.isnot(None)
+        )
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_col > row_id)
+    )
@@ -0,0 +1,80 @@
+"""
+Password hashing with configurable parameters.
+
+``PASSWORD_HASH_METHOD`` / ``PASSWORD_SALT_LENGTH`` pick the werkzeug
+method. With ``PASSWORD_HASH_WORKERS`` > 0, hashing and verification run
+in a bounded process pool so a burst of logins can't monopolize the
+request threads of a worker; once ``PASSWORD_HASH_QUEUE`` jobs are
+waiting, callers get ``HashingBusy`` instead of queueing forever.
+"""
+import threading
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(RuntimeError):
+    """Raised when the hashing pool is saturated."""
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.method       = 'scrypt:32768:8:1'
+        self.salt_length  = 16
+        self.workers      = 0
+        self.queue_size   = 0
+        self.wait_timeout = 5.0
+        self._pool        = None
+        self._slots       = None
+        self._lock        = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method       = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.salt_length  = app.config.get('PASSWORD_SALT_LENGTH', self.salt_length)
+        self.workers      = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.queue_size   = app.config.get('PASSWORD_HASH_QUEUE', self.workers * 4)
+        self.wait_timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.wait_timeout)
+        app.extensions['password_hasher'] = self
+
+    def _executor(self):
+        # created lazily so each forked server worker gets its own pool
+        # (and multiprocessing is only imported when a pool is configured)
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool  = ProcessPoolExecutor(max_workers=self.workers)
+                self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        pool = self._executor()
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise HashingBusy('Password hashing pool is saturated')
+        try:
+            return pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the stored hash was made with different parameters."""
+        parts = password_hash.split('$')
+        if len(parts) != 3:
+            return True
+        return parts[0] != self.method or len(parts[1]) != self.salt_length
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+hasher = PasswordHasher()
@@ -0,0 +1,249 @@
+"""
+Soft delete of projects and users, and the background purge.
+
+Deleting a project or a user only stamps its ``deleted_at`` and enqueues
+a purge job, so the request writes a handful of rows however much data
+hangs off it. From that commit on, ORM queries no longer see it: every
+SELECT run through a Session gets ``deleted_at IS NULL`` criteria for
+Project and User (the ``include_deleted`` execution option opts out).
+Core statements on the tables, like the membership sets in
+app.membership, filter for themselves.
+
+The job then removes the rows with set-based ``DELETE ... WHERE id IN
+(...)`` statements of at most PURGE_CHUNK_SIZE rows, committing after
+each, so no transaction holds the database for long and a purge that
+dies half way resumes where it stopped when the job is retried. Children
+go before their parents and the project or user row goes last; the
+foreign keys' ON DELETE actions catch stragglers where the database
+enforces them (SQLite, by default, doesn't).
+
+Purging a user also purges the projects they own, unassigns their tasks
+elsewhere and deletes their comments, collaborations, chat messages and
+notifications. The changes other members can see go through the
+revision bump and change log like any other write.
+"""
+from collections import defaultdict
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event
+from sqlalchemy.orm import Session, with_loader_criteria
+from extensions import db
+from app.changes import DELETE, UPSERT, log_changes
+from app.etags import bump_revision
+from app.jobs import enqueue, job_handler
+from app.notifications import delete_notifications
+from app.stats import StatsDeltas, apply_deltas, task_row_deltas
+from models.chat_message import ChatMessage
+from models.change_log import ChangeLog
+from models.collaborator import Collaborator
+from models.comment import Comment
+from models.notification import Notification
+from models.project import Project
+from models.task import Task
+from models.task_due_stats import TaskDueStats
+from models.task_reminder import TaskReminder
+from models.task_stats import TaskStats
+from models.user import User
+
+PURGE_PROJECT_JOB  = 'purge.project'
+PURGE_USER_JOB     = 'purge.user'
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _hide_deleted(state):
+    if (not state.is_select or state.is_column_load or state.is_relationship_load
+            or state.execution_options.get('include_deleted', False)):
+        return
+    state.statement = state.statement.options(
+        with_loader_criteria(Project, Project.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(User, User.deleted_at.is_(None), include_aliases=True),
+    )
+
+
+def delete_project(project):
+    """Soft-delete ``project`` and enqueue its purge; the caller commits."""
+    project.deleted_at = datetime.utcnow()
+    enqueue(PURGE_PROJECT_JOB, {'project_id': project.id})
+
+
+def delete_user(user):
+    """Soft-delete ``user`` with the projects they own and enqueue the purge; the caller commits."""
+    now = datetime.utcnow()
+    user.deleted_at = now
+    for project in db.session.scalars(db.select(Project).where(Project.owner_id == user.id)):
+        project.deleted_at = now
+    enqueue(PURGE_USER_JOB, {'user_id': user.id})
+
+
+# ─── PURGE ─────────────────────────────────────────────────────────────────────
+
+def _chunks(stmt, chunk_size):
+    """
+    Rows of ``stmt`` ``chunk_size`` at a time. The consumer must delete
+    (or otherwise stop ``stmt`` matching) each chunk and commit before
+    asking for the next, which is read afresh.
+    """
+    while True:
+        rows = db.session.execute(stmt.limit(chunk_size)).all()
+        if not rows:
+            return
+        yield rows
+
+
+def _deleter(table, entity=None):
+    """
+    A chunk consumer deleting rows of ``table`` by id; with ``entity`` it
+    also logs their tombstones, so the rows must carry project_id.
+    """
+    def delete(rows):
+        db.session.execute(db.delete(table).where(table.c.id.in_([row.id for row in rows])))
+        if entity is not None:
+            _log(rows, entity, DELETE)
+    return delete
+
+
+def _log(rows, entity, op):
+    """Bump the revisions and log ``op`` for rows of (id, project_id)."""
+    changes = defaultdict(dict)
+    for row in rows:
+        changes[row.project_id][(entity, row.id)] = op
+    bump_revision(changes)
+    log_changes(changes)
+
+
+def _delete_tasks(rows):
+    tasks, reminders = Task.__table__, TaskReminder.__table__
+    ids = [row.id for row in rows]
+    db.session.execute(db.delete(reminders).where(reminders.c.task_id.in_(ids)))
+    db.session.execute(db.delete(tasks).where(tasks.c.id.in_(ids)))
+
+
+def purge_project(project_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Delete a soft-deleted project and everything in it, committing every
+    ``chunk_size`` rows. Returns the number of child rows deleted; a
+    project that is gone or not deleted is left alone.
+    """
+    projects = Project.__table__
+    deleted  = db.session.scalar(db.select(projects.c.deleted_at).where(projects.c.id == project_id))
+    if deleted is None:
+        return 0
+
+    tasks, comments = Task.__table__, Comment.__table__
+    project_tasks   = db.select(tasks.c.id).where(tasks.c.project_id == project_id)
+    removed = 0
+    for stmt, delete in (
+        (db.select(comments.c.id).where(comments.c.task_id.in_(project_tasks)), _deleter(comments)),
+        (project_tasks, _delete_tasks),
+        *((db.select(model.__table__.c.id).where(model.__table__.c.project_id == project_id),
+           _deleter(model.__table__))
+          for model in (Collaborator, ChatMessage, ChangeLog)),
+        (db.select(Notification.__table__.c.id).where(Notification.__table__.c.project_id == project_id),
+         lambda rows: delete_notifications([row.id for row in rows])),
+    ):
+        for rows in _chunks(stmt, chunk_size):
+            delete(rows)
+            db.session.commit()
+            removed += len(rows)
+
+    for model in (TaskStats, TaskDueStats):
+        db.session.execute(db.delete(model.__table__).where(model.__table__.c.project_id == project_id))
+    db.session.execute(db.delete(projects).where(projects.c.id == project_id))
+    db.session.commit()
+    return removed
+
+
+def _unassign(rows):
+    tasks  = Task.__table__
+    deltas = StatsDeltas()
+    for row in rows:
+        task_row_deltas(deltas, old=row, new={**row._mapping, 'assignee_id': None})
+    db.session.execute(
+        db.update(tasks)
+          .where(tasks.c.id.in_([row.id for row in rows]))
+          .values(assignee_id=None, version=tasks.c.version + 1, updated_at=datetime.utcnow())
+    )
+    apply_deltas(deltas)
+    _log(rows, 'task', UPSERT)
+
+
+def purge_user(user_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Delete a soft-deleted user: their projects (see ``purge_project``),
+    then their rows in other projects, then the account. Returns the
+    number of rows deleted or unassigned.
+    """
+    users, projects = User.__table__, Project.__table__
+    deleted = db.session.scalar(db.select(users.c.deleted_at).where(users.c.id == user_id))
+    if deleted is None:
+        return 0
+
+    # including any created while the deletion was committing
+    db.session.execute(
+        db.update(projects)
+          .where(projects.c.owner_id == user_id, projects.c.deleted_at.is_(None))
+          .values(deleted_at=deleted)
+    )
+    db.session.commit()
+    removed = 0
+    for project_id in db.session.scalars(db.select(projects.c.id).where(projects.c.owner_id == user_id)).all():
+        removed += purge_project(project_id, chunk_size)
+
+    tasks, comments, collaborators = Task.__table__, Comment.__table__, Collaborator.__table__
+    for stmt, delete in (
+        (db.select(comments.c.id, tasks.c.project_id)
+           .join(tasks, tasks.c.id == comments.c.task_id)
+           .where(comments.c.user_id == user_id),
+         _deleter(comments, 'comment')),
+        (db.select(tasks.c.id, tasks.c.project_id, tasks.c.assignee_id, tasks.c.status, tasks.c.due_date)
+           .where(tasks.c.assignee_id == user_id),
+         _unassign),
+        (db.select(collaborators.c.id, collaborators.c.project_id).where(collaborators.c.user_id == user_id),
+         _deleter(collaborators, 'collaborator')),
+        *((db.select(model.__table__.c.id).where(model.__table__.c.user_id == user_id),
+           _deleter(model.__table__))
+          for model in (ChatMessage, Notification)),
+    ):
+        for rows in _chunks(stmt, chunk_size):
+            delete(rows)
+            db.session.commit()
+            removed += len(rows)
+
+    db.session.execute(db.delete(users).where(users.c.id == user_id))
+    db.session.commit()
+    return removed
+
+
+def _chunk_size():
+    return current_app.config.get('PURGE_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+@job_handler(PURGE_PROJECT_JOB, max_attempts=10)
+def purge_project_job(payload):
+    purge_project(payload['project_id'], _chunk_size())
+
+
+@job_handler(PURGE_USER_JOB, max_attempts=10)
+def purge_user_job(payload):
+    purge_user(payload['user_id'], _chunk_size())
+
+
+purge_cli = AppGroup('purge', help='Purge soft-deleted projects and users.')
+
+
+@purge_cli.command('run')
+@click.option('--chunk-size', type=int, help='Rows per transaction (default PURGE_CHUNK_SIZE).')
+def run_command(chunk_size):
+    """Purge everything soft-deleted now, e.g. after failed jobs."""
+    chunk_size = chunk_size or _chunk_size()
+    users, projects = User.__table__, Project.__table__
+    user_ids = db.session.scalars(db.select(users.c.id).where(users.c.deleted_at.isnot(None))).all()
+    for user_id in user_ids:
+        purge_user(user_id, chunk_size)
+    project_ids = db.session.scalars(db.select(projects.c.id).where(projects.c.deleted_at.isnot(None))).all()
+    for project_id in project_ids:
+        purge_project(project_id, chunk_size)
+    click.echo(f'purged {len(user_ids)} user(s) and {len(project_ids)} project(s)')
@@ -0,0 +1,51 @@
+"""
+Shared lookups for the project/task routes.
+
+Each helper resolves what a route needs in a single statement and aborts
+with 404 when nothing matches, so routes don't have to chain
+``get_or_404`` calls across related models.
+"""
+from flask import abort
+from extensions import db
+from models.project import Project
+from models.task import Task
+from models.comment import Comment
+
+
+def comment_counts(task_ids):
+    """
+    {task_id: number of comments} from one grouped query over the comment
+    index. ``task_ids`` is a list or a SELECT of ids; tasks without
+    comments are absent.
+    """
+    return dict(db.session.execute(
+        db.select(Comment.task_id, db.func.count())
+          .where(Comment.task_id.in_(task_ids))
+          .group_by(Comment.task_id)
+    ).all())
+
+
+def ensure_project(project_id):
+    """404 unless the project exists; selects only the primary key."""
+    found = db.session.scalar(db.select(Project.id).where(Project.id == project_id))
+    if found is None:
+        abort(404)
+    return found
+
+
+def get_project_or_404(project_id):
+    """Load a project by id; 404 if it doesn't exist."""
+    project = db.session.scalar(db.select(Project).where(Project.id == project_id))
+    if project is None:
+        abort(404)
+    return project
+
+
+def get_task_or_404(project_id, task_id):
+    """Load a task, verifying in the same query that it belongs to the project."""
+    task = db.session.scalar(
+        db.select(Task).where(Task.id == task_id, Task.project_id == project_id)
+    )
+    if task is None:
+        abort(404)
+    return task
@@ -0,0 +1,72 @@
+"""
+In-process token-bucket rate limiting.
+
+Each key (e.g. ``email:alice@example.com`` or ``ip:10.0.0.1``) gets a
+bucket holding up to ``capacity`` tokens that refills at ``rate`` tokens
+per second. Buckets live in a bounded LRU so a flood of distinct keys
+can't grow memory without limit.
+"""
+import threading
+import time
+from cachetools import LRUCache
+
+# longest wait hit() reports; a bucket with a zero refill rate never
+# refills, and Retry-After needs a finite number
+MAX_RETRY_AFTER = 3600
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, capacity, now):
+        self.tokens  = float(capacity)
+        self.updated = now
+
+
+class RateLimiter:
+    def __init__(self, config_prefix, capacity=10, rate=0.1, max_keys=100000, clock=time.monotonic):
+        self.config_prefix = config_prefix
+        self.capacity      = capacity
+        self.rate          = rate
+        self._clock        = clock
+        self._buckets      = LRUCache(maxsize=max_keys)
+        self._lock         = threading.Lock()
+
+    def init_app(self, app):
+        """Read ``<prefix>_LIMIT``, ``<prefix>_REFILL`` and ``<prefix>_MAX_KEYS``."""
+        prefix = self.config_prefix
+        with self._lock:
+            self.capacity = app.config.get(f'{prefix}_LIMIT', self.capacity)
+            self.rate     = app.config.get(f'{prefix}_REFILL', self.rate)
+            self._buckets = LRUCache(maxsize=app.config.get(f'{prefix}_MAX_KEYS', self._buckets.maxsize))
+        app.extensions.setdefault('rate_limiters', {})[prefix] = self
+
+    def hit(self, key, cost=1):
+        """
+        Take ``cost`` tokens from the key's bucket.
+
+        Returns 0 when allowed, otherwise the number of seconds until
+        enough tokens will have refilled, at most MAX_RETRY_AFTER.
+        """
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.capacity, now)
+            bucket.tokens  = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return 0
+            if not self.rate:
+                return MAX_RETRY_AFTER
+            return min((cost - bucket.tokens) / self.rate, MAX_RETRY_AFTER)
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+# per-email buckets are tight; per-IP buckets allow for shared office NATs
+login_limiter    = RateLimiter('LOGIN_RATE')
+login_ip_limiter = RateLimiter('LOGIN_IP_RATE', capacity=100, rate=1.0)
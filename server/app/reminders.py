@@ -0,0 +1,179 @@
+"""
+Due-date reminders.
+
+A run notifies the assignee of every open task whose due date falls
+within the next REMINDER_LEAD_HOURS. It walks ix_task_due_status over
+just that window in due-date order, in batches of REMINDER_BATCH_SIZE
+committed one at a time, so memory and transaction size stay bounded
+however many tasks exist. A batch resumes at the previous batch's last
+due date rather than re-reading the window from the start.
+
+``task_reminder`` records (task_id, due_date) per reminder sent. Tasks
+already in it are skipped, so each run only picks up tasks that entered
+the window since the last one, and a reminder is claimed with
+INSERT ... ON CONFLICT DO NOTHING before it is sent, so schedulers
+running in several processes never send it twice. Moving a task's due
+date re-arms its reminder. Rows for due dates in the past are pruned.
+
+Runs from ``flask reminders send`` (e.g. cron) or from a thread in each
+web process every REMINDER_INTERVAL seconds.
+"""
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+import click
+from flask.cli import AppGroup
+from extensions import db
+from app.database import dialect_insert
+from app.notifications import notification_entry, notify
+from app.stats import DEFAULT_STATUS, DONE_STATUS
+from models.project import Project
+from models.task import Task
+from models.task_reminder import TaskReminder
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _due_batch(after, horizon, limit):
+    tasks     = Task.__table__
+    reminders = TaskReminder.__table__
+    projects  = Project.__table__
+    users     = User.__table__
+    return db.session.execute(
+        db.select(tasks.c.id, tasks.c.title, tasks.c.project_id, tasks.c.assignee_id, tasks.c.due_date)
+          .join(projects, projects.c.id == tasks.c.project_id)
+          .join(users, users.c.id == tasks.c.assignee_id)
+          .where(tasks.c.due_date > after, tasks.c.due_date <= horizon,
+                 # nothing for deleted projects or users awaiting their purge
+                 projects.c.deleted_at.is_(None), users.c.deleted_at.is_(None),
+                 db.func.coalesce(tasks.c.status, DEFAULT_STATUS) != DONE_STATUS,
+                 ~db.exists().where(reminders.c.task_id == tasks.c.id,
+                                    reminders.c.due_date == tasks.c.due_date))
+          .order_by(tasks.c.due_date)
+          .limit(limit)
+    ).all()
+
+
+def _claim(rows, now):
+    """Record reminders for ``rows``; returns the task ids this run claimed."""
+    reminders = TaskReminder.__table__
+    return set(db.session.scalars(
+        dialect_insert(db.session.connection())(reminders)
+          .on_conflict_do_nothing()
+          .returning(reminders.c.task_id),
+        [{'task_id': r.id, 'due_date': r.due_date, 'sent_at': now} for r in rows]
+    ))
+
+
+def send_due_reminders(lead=timedelta(hours=24), batch_size=500, now=None):
+    """Notify assignees of tasks due within ``lead``; returns how many were sent."""
+    now     = now or datetime.utcnow()
+    horizon = now + lead
+    sent    = 0
+
+    db.session.execute(db.delete(TaskReminder).where(TaskReminder.due_date <= now))
+    db.session.commit()
+
+    after = now
+    while True:
+        rows = _due_batch(after, horizon, batch_size)
+        if not rows:
+            break
+        claimed = _claim(rows, now)
+        notify([
+            notification_entry(r.assignee_id, 'task_due', 'Task due soon',
+                               f'"{r.title}" is due {r.due_date:%Y-%m-%d %H:%M} UTC',
+                               project_id=r.project_id, task_id=r.id)
+            for r in rows if r.id in claimed
+        ])
+        db.session.commit()
+        sent += len(claimed)
+        if len(rows) < batch_size:
+            break
+        # re-read ties at the last due date; the ones just claimed are
+        # excluded by the NOT EXISTS
+        after = rows[-1].due_date - timedelta(microseconds=1)
+    return sent
+
+
+class ReminderScheduler:
+    """Runs ``send_due_reminders`` every ``interval`` seconds in a thread."""
+
+    def __init__(self, app=None):
+        self.app        = None
+        self.interval   = 0
+        self.lead       = timedelta(hours=24)
+        self.batch_size = 500
+        self._thread    = None
+        self._pid       = None
+        self._lock      = threading.Lock()
+        self._stopping  = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app        = app
+        self.interval   = app.config.get('REMINDER_INTERVAL', self.interval)
+        self.lead       = timedelta(hours=app.config.get('REMINDER_LEAD_HOURS', 24))
+        self.batch_size = app.config.get('REMINDER_BATCH_SIZE', self.batch_size)
+        app.extensions['reminder_scheduler'] = self
+        if self.interval > 0:
+            # started from the first request so that forked workers get their own
+            app.before_request(self._ensure_started)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='reminder-scheduler', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=None):
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                return
+            self._stopping.set()
+            self._thread.join(timeout)
+            self._thread = None
+            self._pid    = None
+
+    def run_once(self):
+        with self.app.app_context():
+            try:
+                return send_due_reminders(self.lead, self.batch_size)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                sent = self.run_once()
+                if sent:
+                    logger.info('sent %d due-date reminder(s)', sent)
+            except Exception:
+                logger.exception('due-date reminder run failed')
+            self._stopping.wait(self.interval)
+
+
+reminder_scheduler = ReminderScheduler()
+
+
+reminders_cli = AppGroup('reminders', help='Due-date reminders.')
+
+
+@reminders_cli.command('send')
+@click.option('--lead-hours', type=float, help='Reminder window (default REMINDER_LEAD_HOURS).')
+@click.option('--batch-size', type=int, help='Tasks per batch (default REMINDER_BATCH_SIZE).')
+def send_command(lead_hours, batch_size):
+    """Send reminders for tasks entering the due window."""
+    lead = timedelta(hours=lead_hours) if lead_hours is not None else reminder_scheduler.lead
+    sent = send_due_reminders(lead, batch_size or reminder_scheduler.batch_size)
+    click.echo(f'sent {sent} reminder(s)')
@@ -0,0 +1,214 @@
+"""
+Full-text search over task titles/descriptions and comment text.
+
+SQLite
+    Two external-content FTS5 tables, ``task_fts`` (title, description,
+    project_id) and ``comment_fts`` (text, project_id), whose rowids are
+    the task / comment ids. Triggers on ``task`` and ``comment`` keep them
+    in sync, so bulk Core writes (the batch endpoint, purges) are covered
+    as well as ORM ones. Ranking is FTS5's bm25 (lower is better).
+Postgres
+    No extra tables: GIN expression indexes on ``to_tsvector(...)`` of the
+    same columns, queried with ``plainto_tsquery`` and ranked by
+    ``ts_rank`` (negated so lower is better on both backends).
+
+A task's score is the best of its own match and its comments' matches.
+The DDL lives in the ``add_task_search`` migration; ``create_all`` (used
+by scripts and throwaway databases) gets it from the ``after_create``
+hooks registered here.
+"""
+import re
+from sqlalchemy import DDL, bindparam, event, text
+from extensions import db
+from models.task import Task
+from models.comment import Comment
+
+# FTS tables (and their shadow tables) aren't mapped; migrations/env.py skips them
+FTS_TABLE_PREFIXES = ('task_fts', 'comment_fts')
+
+# project_id is indexed as a token so a caller's scope can be part of the
+# MATCH itself: FTS5 intersects the doclists instead of ranking every match
+# in the table and filtering afterwards
+SQLITE_TASK_DDL = [
+    """CREATE VIRTUAL TABLE task_fts USING fts5(
+        title, description, project_id, content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description, project_id ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+]
+
+# comments take their project from the task, through a view as the content table
+SQLITE_COMMENT_DDL = [
+    """CREATE VIEW comment_search AS
+        SELECT comment.id AS id, comment.text AS text, task.project_id AS project_id
+          FROM comment JOIN task ON task.id = comment.task_id""",
+    """CREATE VIRTUAL TABLE comment_fts USING fts5(
+        text, project_id, content='comment_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER comment_fts_ai AFTER INSERT ON comment BEGIN
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_ad AFTER DELETE ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_au AFTER UPDATE OF text, task_id ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    # a task moving project re-tags its comments; one deleted before its
+    # comments takes their entries with it
+    """CREATE TRIGGER comment_fts_task_au AFTER UPDATE OF project_id ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT id, text, new.project_id FROM comment WHERE task_id = new.id;
+    END""",
+    """CREATE TRIGGER comment_fts_task_ad AFTER DELETE ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+    END""",
+]
+
+# must match the GIN index expressions exactly for the planner to use them
+PG_TASK_DOCUMENT    = "to_tsvector('english', coalesce(task.title, '') || ' ' || coalesce(task.description, ''))"
+PG_COMMENT_DOCUMENT = "to_tsvector('english', comment.text)"
+
+PG_TASK_DDL    = [f"CREATE INDEX ix_task_search ON task USING gin ({PG_TASK_DOCUMENT})"]
+PG_COMMENT_DDL = [f"CREATE INDEX ix_comment_search ON comment USING gin ({PG_COMMENT_DOCUMENT})"]
+
+for _table, _sqlite, _pg in ((Task.__table__, SQLITE_TASK_DDL, PG_TASK_DDL),
+                             (Comment.__table__, SQLITE_COMMENT_DDL, PG_COMMENT_DDL)):
+    for _stmt in _sqlite:
+        event.listen(_table, 'after_create', DDL(_stmt).execute_if(dialect='sqlite'))
+    for _stmt in _pg:
+        event.listen(_table, 'after_create', DDL(_stmt).execute_if(dialect='postgresql'))
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# shorter trailing words match exactly; "a*" would expand to a large part of the vocabulary
+MIN_PREFIX_LENGTH = 3
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by for if in into is it no not of on or such '
+    'that the their then there these they this to was will with'.split()
+)
+
+# beyond this many projects the scope is applied by a join instead of in the MATCH
+MAX_SCOPE_TOKENS = 500
+
+
+def fts5_terms(q):
+    """
+    Turn free text into a safe FTS5 expression: every word must match,
+    the last one as a prefix (search-as-you-type) once it is long enough
+    to be selective. English stopwords are dropped unless that would
+    leave nothing, as Postgres' 'english' configuration does. None if
+    there are no words.
+    """
+    words = [w.lower() for w in _WORD.findall(q)]
+    words = [w for w in words if w not in STOPWORDS] or words
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if len(words[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _sqlite_hits(q, project_ids):
+    terms = fts5_terms(q)
+    if terms is None:
+        return None
+    if len(project_ids) <= MAX_SCOPE_TOKENS:
+        scope = ' OR '.join(f'"{p}"' for p in sorted(project_ids))
+        task_match    = f'{{title description}} : ({terms}) AND project_id : ({scope})'
+        comment_match = f'text : ({terms}) AND project_id : ({scope})'
+    else:
+        # very wide scope: match everything, search_tasks filters by project
+        task_match    = f'{{title description}} : ({terms})'
+        comment_match = f'text : ({terms})'
+
+    # bm25 is lower-is-better; titles weigh most, comment hits least
+    return text("""
+        SELECT rowid AS task_id, bm25(task_fts, 10.0, 1.0, 0.0) AS score
+          FROM task_fts WHERE task_fts MATCH :task_match
+        UNION ALL
+        SELECT comment.task_id AS task_id, 0.5 * bm25(comment_fts, 1.0, 0.0) AS score
+          FROM comment_fts JOIN comment ON comment.id = comment_fts.rowid
+         WHERE comment_fts MATCH :comment_match
+    """).bindparams(task_match=task_match, comment_match=comment_match) \
+        .columns(task_id=db.Integer, score=db.Float)
+
+
+def _postgres_hits(q, project_ids):
+    if not _WORD.search(q):
+        return None
+    return text(f"""
+        SELECT task.id AS task_id, -ts_rank({PG_TASK_DOCUMENT}, plainto_tsquery('english', :q)) AS score
+          FROM task
+         WHERE {PG_TASK_DOCUMENT} @@ plainto_tsquery('english', :q)
+           AND task.project_id IN :projects
+        UNION ALL
+        SELECT comment.task_id AS task_id, -0.5 * ts_rank({PG_COMMENT_DOCUMENT}, plainto_tsquery('english', :q)) AS score
+          FROM comment JOIN task ON task.id = comment.task_id
+         WHERE {PG_COMMENT_DOCUMENT} @@ plainto_tsquery('english', :q)
+           AND task.project_id IN :projects
+    """).bindparams(
+        bindparam('projects', value=sorted(project_ids), expanding=True),
+        q=q,
+    ).columns(task_id=db.Integer, score=db.Float)
+
+
+def search_tasks(q, project_ids, status=None, assignee_id=None, due_before=None, cursor=None, limit=20):
+    """
+    Ranked matches for ``q`` within ``project_ids``: rows of
+    ``Task.schema.columns()`` plus ``score``, ordered by (score, id). ``cursor`` is the (score, id) of the last row
+    of the previous page.
+    """
+    if not project_ids:
+        return []
+    hits = (_postgres_hits if db.engine.dialect.name == 'postgresql' else _sqlite_hits)(q, project_ids)
+    if hits is None:
+        return []
+
+    hits   = hits.subquery('hits')
+    ranked = (
+        db.select(hits.c.task_id, db.func.min(hits.c.score).label('score'))
+          .group_by(hits.c.task_id)
+          .subquery('ranked')
+    )
+    stmt = (
+        db.select(*Task.schema.columns(), ranked.c.score)
+          .join(ranked, ranked.c.task_id == Task.id)
+          .where(Task.project_id.in_(project_ids))
+    )
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if assignee_id is not None:
+        stmt = stmt.where(Task.assignee_id == assignee_id)
+    if due_before is not None:
+        stmt = stmt.where(Task.due_date < due_before)
+    if cursor is not None:
+        score, task_id = cursor
+        stmt = stmt.where(db.or_(
+            ranked.c.score > score,
+            db.and_(ranked.c.score == score, Task.id > task_id)
+        ))
+    stmt = stmt.order_by(ranked.c.score, Task.id).limit(limit)
+    return db.session.execute(stmt).all()
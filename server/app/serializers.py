@@ -0,0 +1,95 @@
+"""
+Schema-driven serialization for the models.
+
+Each model declares its public fields once, as a ``Schema`` class
+attribute, and everything else derives from it: ``serialize()`` on an
+instance, the columns a route SELECTs, and the dicts built from the
+resulting ``Row`` tuples. Routes that list many records select just the
+columns they need and use ``dumper`` so no ORM instances (or identity-map
+bookkeeping) are created per row.
+
+    rows = db.session.execute(db.select(*Task.schema.columns(fields)).where(...))
+    dump = Task.schema.dumper(fields)
+    return jsonify([dump(row) for row in rows])
+"""
+from app.pagination import PaginationError
+
+
+def iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class Field:
+    """A serialized field: read from ``attr`` on the model and passed through ``convert``."""
+    __slots__ = ('name', 'attr', 'convert')
+
+    def __init__(self, name, attr=None, convert=None):
+        self.name    = name
+        self.attr    = attr or name
+        self.convert = convert
+
+
+def datetime_field(name):
+    return Field(name, convert=iso)
+
+
+class Schema:
+    def __init__(self, *fields):
+        self.fields  = {}
+        for f in fields:
+            f = f if isinstance(f, Field) else Field(f)
+            self.fields[f.name] = f
+        self.model    = None
+        self._dumpers = {}
+
+    def __set_name__(self, owner, name):
+        self.model = owner
+
+    @property
+    def names(self):
+        return tuple(self.fields)
+
+    def parse_fields(self, raw, default=None, extra=()):
+        """
+        Validated tuple of field names from a comma-separated ``fields=``
+        value. ``extra`` names fields the route computes itself.
+        """
+        if not raw:
+            return tuple(default or self.names)
+        fields  = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+        unknown = [f for f in fields if f not in self.fields and f not in extra]
+        if unknown:
+            raise PaginationError(f'Unknown fields: {", ".join(unknown)}')
+        return fields or tuple(default or self.names)
+
+    def columns(self, fields=None):
+        """Model columns backing ``fields``, in order, for ``db.select(*...)``."""
+        return [getattr(self.model, self.fields[name].attr) for name in (self.names if fields is None else fields)]
+
+    def dumper(self, fields=None):
+        """
+        A function turning a Row whose leading columns are ``columns(fields)``
+        into a dict. Extra trailing columns (e.g. cursor keys) are ignored.
+        """
+        fields = self.names if fields is None else tuple(fields)
+        dump   = self._dumpers.get(fields)
+        if dump is None:
+            convert = [(name, self.fields[name].convert) for name in fields if self.fields[name].convert]
+
+            def dump(row):
+                record = dict(zip(fields, row))
+                for name, fn in convert:
+                    record[name] = fn(record[name])
+                return record
+
+            self._dumpers[fields] = dump
+        return dump
+
+    def dump_obj(self, obj, fields=None):
+        """Serialize a model instance."""
+        record = {}
+        for name in (self.names if fields is None else fields):
+            field = self.fields[name]
+            value = getattr(obj, field.attr)
+            record[name] = field.convert(value) if field.convert else value
+        return record
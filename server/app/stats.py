@@ -0,0 +1,287 @@
+"""
+Per-project task statistics served from maintained aggregate tables.
+
+``task_stats`` holds counts per (project, assignee, status) and
+``task_due_stats`` open-task counts per (project, assignee, due day).
+Both are adjusted in the same transaction as the task write:
+
+* ORM writes (create/update/delete in task_routes, project deletes) via
+  the ``after_flush`` hook below, which diffs old and new attribute values;
+* bulk Core writes (the batch endpoint) by calling ``apply_deltas`` with
+  deltas built from ``task_row_deltas``.
+
+Overdue = open tasks due before now: whole past days come from
+``task_due_stats``; only today's tasks are counted from ``task`` (a
+one-day range on ix_task_due_status).
+
+Tasks without a status count as 'pending', the column default.
+``flask stats check`` recomputes everything with GROUP BY and reports
+drift; ``--repair`` rewrites the tables.
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime, time
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from extensions import db
+from app.database import dialect_insert
+from models.project import Project
+from models.task import Task
+from models.task_stats import TaskStats
+from models.task_due_stats import TaskDueStats
+
+DONE_STATUS    = 'done'
+DEFAULT_STATUS = 'pending'
+TRACKED        = ('project_id', 'assignee_id', 'status', 'due_date')
+
+
+class StatsDeltas:
+    """Pending +/- adjustments to both aggregate tables."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.due    = Counter()
+
+    def add(self, project_id, assignee_id, status, due_date, sign):
+        assignee_id = assignee_id or 0
+        status      = status or DEFAULT_STATUS
+        self.counts[(project_id, assignee_id, status)] += sign
+        if due_date is not None and status != DONE_STATUS:
+            if isinstance(due_date, str):
+                due_date = datetime.fromisoformat(due_date)
+            day = due_date.date() if isinstance(due_date, datetime) else due_date
+            self.due[(project_id, assignee_id, day)] += sign
+
+    def __bool__(self):
+        return any(self.counts.values()) or any(self.due.values())
+
+
+def task_row_deltas(deltas, old=None, new=None):
+    """Record a task going from ``old`` to ``new`` (dicts or rows; None for create/delete)."""
+    if old is not None:
+        deltas.add(_get(old, 'project_id'), _get(old, 'assignee_id'),
+                   _get(old, 'status'), _get(old, 'due_date'), -1)
+    if new is not None:
+        deltas.add(_get(new, 'project_id'), _get(new, 'assignee_id'),
+                   _get(new, 'status'), _get(new, 'due_date'), +1)
+
+
+def _get(row, name):
+    return row.get(name) if isinstance(row, dict) else getattr(row, name)
+
+
+def apply_deltas(deltas, connection=None):
+    """Upsert the deltas and drop rows that reached zero."""
+    connection = connection or db.session.connection()
+    for model, changes, key in (
+        (TaskStats,    deltas.counts, ('project_id', 'assignee_id', 'status')),
+        (TaskDueStats, deltas.due,    ('project_id', 'assignee_id', 'due_date')),
+    ):
+        rows = [dict(zip(key, k), count=n) for k, n in changes.items() if n]
+        if not rows:
+            continue
+        table = model.__table__
+        stmt  = dialect_insert(connection)(table)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=list(key),
+                set_={'count': table.c.count + stmt.excluded.count}
+            ),
+            rows
+        )
+        connection.execute(
+            db.delete(table).where(
+                table.c.project_id.in_({r['project_id'] for r in rows}),
+                table.c.count <= 0
+            )
+        )
+
+
+def _old_value(state, name):
+    hist = state.attrs[name].history
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    return state.attrs[name].value
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_task_writes(session, flush_context):
+    deltas, dropped = StatsDeltas(), set()
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            dropped.add(obj.id)
+        elif isinstance(obj, Task):
+            state = inspect(obj)
+            task_row_deltas(deltas, old={n: _old_value(state, n) for n in TRACKED})
+    for obj in session.new:
+        if isinstance(obj, Task):
+            task_row_deltas(deltas, new=obj)
+    for obj in session.dirty:
+        if not isinstance(obj, Task) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if any(state.attrs[n].history.has_changes() for n in TRACKED):
+            task_row_deltas(deltas, old={n: _old_value(state, n) for n in TRACKED}, new=obj)
+
+    connection = session.connection()
+    if dropped:
+        deltas.counts = Counter({k: n for k, n in deltas.counts.items() if k[0] not in dropped})
+        deltas.due    = Counter({k: n for k, n in deltas.due.items() if k[0] not in dropped})
+        for model in (TaskStats, TaskDueStats):
+            connection.execute(db.delete(model.__table__).where(model.__table__.c.project_id.in_(dropped)))
+    if deltas:
+        apply_deltas(deltas, connection)
+
+
+def _summary():
+    return {'total': 0, 'open': 0, 'overdue': 0, 'by_status': {}}
+
+
+def _count(summary, status, n):
+    summary['total'] += n
+    if status != DONE_STATUS:
+        summary['open'] += n
+    summary['by_status'][status] = summary['by_status'].get(status, 0) + n
+
+
+def project_stats(project_ids, now=None):
+    """
+    {project_id: summary} where a summary is total/open/overdue/by_status
+    plus ``by_assignee`` (the same summary per assignee_id, None for
+    unassigned).
+    """
+    project_ids = list(project_ids)
+    now         = now or datetime.utcnow()
+    today       = datetime.combine(now.date(), time.min)
+    stats       = {pid: {**_summary(), 'by_assignee': defaultdict(_summary)} for pid in project_ids}
+    if not project_ids:
+        return stats
+
+    for row in db.session.execute(
+        db.select(TaskStats.project_id, TaskStats.assignee_id, TaskStats.status, TaskStats.count)
+          .where(TaskStats.project_id.in_(project_ids))
+    ):
+        _count(stats[row.project_id], row.status, row.count)
+        _count(stats[row.project_id]['by_assignee'][row.assignee_id], row.status, row.count)
+
+    past_days = (
+        db.select(TaskDueStats.project_id, TaskDueStats.assignee_id, db.func.sum(TaskDueStats.count))
+          .where(TaskDueStats.project_id.in_(project_ids), TaskDueStats.due_date < now.date())
+          .group_by(TaskDueStats.project_id, TaskDueStats.assignee_id)
+    )
+    due_today = (
+        db.select(Task.project_id, db.func.coalesce(Task.assignee_id, 0), db.func.count())
+          .where(Task.project_id.in_(project_ids),
+                 Task.due_date >= today, Task.due_date < now,
+                 db.func.coalesce(Task.status, DEFAULT_STATUS) != DONE_STATUS)
+          .group_by(Task.project_id, db.func.coalesce(Task.assignee_id, 0))
+    )
+    for stmt in (past_days, due_today):
+        for project_id, assignee_id, n in db.session.execute(stmt):
+            stats[project_id]['overdue'] += n
+            stats[project_id]['by_assignee'][assignee_id]['overdue'] += n
+
+    for summary in stats.values():
+        summary['by_assignee'] = sorted(
+            ({'assignee_id': aid or None, **s} for aid, s in summary['by_assignee'].items()),
+            key=lambda s: (-s['total'], s['assignee_id'] or 0)
+        )
+    return stats
+
+
+def user_dashboard(user_id, project_ids, now=None):
+    """Per-project summaries, their totals, and the user's own workload across them."""
+    stats  = project_stats(project_ids, now)
+    totals = _summary()
+    mine   = _summary()
+    for summary in stats.values():
+        for status, n in summary['by_status'].items():
+            _count(totals, status, n)
+        totals['overdue'] += summary['overdue']
+        for assignee in summary['by_assignee']:
+            if assignee['assignee_id'] == user_id:
+                for status, n in assignee['by_status'].items():
+                    _count(mine, status, n)
+                mine['overdue'] += assignee['overdue']
+    return {
+        'projects': [
+            {'project_id': pid, **{k: v for k, v in s.items() if k != 'by_assignee'}}
+            for pid, s in sorted(stats.items())
+        ],
+        'totals':         totals,
+        'assigned_to_me': mine,
+    }
+
+
+def _day(column, dialect):
+    return db.func.date(column) if dialect == 'sqlite' else db.cast(column, db.Date)
+
+
+def expected_stats():
+    """Recompute both aggregates from `task` with GROUP BY."""
+    dialect  = db.session.get_bind().dialect.name
+    assignee = db.func.coalesce(Task.assignee_id, 0)
+    status   = db.func.coalesce(Task.status, DEFAULT_STATUS)
+    day      = _day(Task.due_date, dialect)
+    counts = {
+        (p, a, s): n for p, a, s, n in db.session.execute(
+            db.select(Task.project_id, assignee, status, db.func.count())
+              .group_by(Task.project_id, assignee, status)
+        )
+    }
+    due = {
+        (p, a, d if isinstance(d, date) else date.fromisoformat(d)): n for p, a, d, n in db.session.execute(
+            db.select(Task.project_id, assignee, day, db.func.count())
+              .where(Task.due_date.isnot(None), status != DONE_STATUS)
+              .group_by(Task.project_id, assignee, day)
+        )
+    }
+    return counts, due
+
+
+def check_stats(repair=False):
+    """
+    Compare the aggregate tables with a full recompute. Returns a list of
+    (table, key, expected, actual) for every mismatching row; with
+    ``repair`` the tables are rewritten from the recompute (caller commits).
+    """
+    counts, due = expected_stats()
+    drift = []
+    for model, expected, key in (
+        (TaskStats,    counts, ('project_id', 'assignee_id', 'status')),
+        (TaskDueStats, due,    ('project_id', 'assignee_id', 'due_date')),
+    ):
+        table  = model.__table__
+        actual = {tuple(row[:-1]): row[-1] for row in db.session.execute(
+            db.select(*(table.c[k] for k in key), table.c.count)
+        )}
+        for k in sorted(expected.keys() | actual.keys(), key=str):
+            if expected.get(k, 0) != actual.get(k, 0):
+                drift.append((table.name, k, expected.get(k, 0), actual.get(k, 0)))
+        if repair:
+            db.session.execute(db.delete(table))
+            if expected:
+                db.session.execute(db.insert(table), [dict(zip(key, k), count=n) for k, n in expected.items()])
+    return drift
+
+
+stats_cli = AppGroup('stats', help='Maintain the task statistics aggregates.')
+
+
+@stats_cli.command('check')
+@click.option('--repair', is_flag=True, help='Rewrite the aggregates from a full recompute.')
+def check_command(repair):
+    """Recompute task statistics from scratch and report drift."""
+    drift = check_stats(repair=repair)
+    for table, key, expected, actual in drift:
+        click.echo(f'{table} {key}: expected {expected}, found {actual}')
+    if repair:
+        db.session.commit()
+        click.echo(f'repaired {len(drift)} row(s)' if drift else 'no drift')
+    elif drift:
+        raise SystemExit(f'{len(drift)} row(s) drifted; rerun with --repair to fix')
+    else:
+        click.echo('no drift')
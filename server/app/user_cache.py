@@ -0,0 +1,85 @@
+"""
+Bounded TTL cache of user records for endpoints that need more than the
+JWT claims carry.
+
+Entries are plain dicts (never ORM instances, which are bound to the
+session that loaded them). Updates and deletes of a ``User`` evict the
+entry once the transaction commits, in the process that made them;
+other worker processes pick the change up when the entry expires
+(USER_CACHE_TTL).
+"""
+import threading
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from extensions import db, jwt
+from models.user import User
+
+_PENDING_KEY = 'user_cache_invalidations'
+
+
+class UserCache:
+    def __init__(self, app=None):
+        self._cache = TTLCache(maxsize=10000, ttl=60)
+        self._lock  = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._cache = TTLCache(
+            maxsize=app.config.get('USER_CACHE_SIZE', 10000),
+            ttl=app.config.get('USER_CACHE_TTL', 60)
+        )
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id):
+        """Return the user's serialized record, or None if there is no such user."""
+        user_id = int(user_id)
+        with self._lock:
+            record = self._cache.get(user_id)
+        if record is not None:
+            return record
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        record = user.serialize()
+        with self._lock:
+            self._cache[user_id] = record
+        return record
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._cache.pop(int(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+user_cache = UserCache()
+
+
+@jwt.user_lookup_loader
+def _load_current_user(jwt_header, jwt_data):
+    """Backs flask_jwt_extended.current_user with the cache."""
+    return user_cache.get(jwt_data['sub'])
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_invalidations(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
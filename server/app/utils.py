@@ -1,14 +1,22 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import verify_jwt_in_request, get_current_user, get_jwt, get_jwt_identity
 from flask_restful import abort
-from models.user import User
+
+
+def current_user_id():
+    """The authenticated user's id; JWT subjects are issued as strings."""
+    return int(get_jwt_identity())
+
 
 def admin_required(fn):
+    """
+    Authorize from the token's ``role`` claim and the cached user record
+    (app.user_cache), so a demotion applies before the token expires.
+    """
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user = User.query.get(get_jwt_identity())
-        if not user or not user.is_admin():
+        if get_jwt().get('role') != 'admin' or get_current_user()['role'] != 'admin':
             abort(403, message="Admin privileges required.")
         return fn(*args, **kwargs)
     return wrapper
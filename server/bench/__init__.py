@@ -0,0 +1,12 @@
+"""
+Load benchmark for the API.
+
+``datagen`` bulk-loads a synthetic, skewed dataset into an empty database;
+``driver`` runs concurrent workers against the real endpoints, either
+in-process through the Flask test client or over HTTP against a local
+threaded WSGI server; ``report`` turns the samples into JSON and compares
+two runs. Run from ``server/``:
+
+    python -m bench run --users 2000 --tasks 100000 --workers 8 --duration 30 --out head.json
+    python -m bench compare base.json head.json
+"""
@@ -0,0 +1,148 @@
+"""
+python -m bench {seed,run,compare} --help
+
+    # seed once into a file, then run against it as often as needed
+    python -m bench seed --db /tmp/bench.db --tasks 100000
+    python -m bench run --db /tmp/bench.db --mode wsgi --workers 16 --out head.json
+
+    # or seed a throwaway database and run in one go
+    python -m bench run --tasks 20000 --duration 20 --out base.json
+
+    python -m bench compare base.json head.json --threshold 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from bench.datagen import PASSWORD, Scale
+from bench.report import compare, load
+
+
+def _scale_args(parser):
+    defaults = Scale()
+    for name, value in defaults.as_dict().items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=type(value), default=value)
+
+
+def _mix(raw):
+    from bench.driver import DEFAULT_MIX
+
+    mix = {}
+    for part in raw.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'unknown operation {name!r}; one of {", ".join(DEFAULT_MIX)}')
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def _create_app(db_path):
+    # must be set before config is imported
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    # the workload logs in far more often than the brute-force limits allow
+    for name in ('LOGIN_RATE_LIMIT', 'LOGIN_IP_RATE_LIMIT'):
+        os.environ.setdefault(name, '1000000000')
+    os.environ.setdefault('SLOW_QUERY_MS', '1000')
+    from main import create_app
+    return create_app()
+
+
+def _scale(args):
+    return Scale(**{name: getattr(args, name) for name in Scale().as_dict()})
+
+
+def cmd_seed(args):
+    from bench.datagen import seed_app
+
+    if os.path.exists(args.db):
+        raise SystemExit(f'{args.db} already exists')
+    app = _create_app(args.db)
+    print(json.dumps(seed_app(app, _scale(args))))
+
+
+def cmd_run(args):
+    import time
+    from bench.datagen import seed_app
+    from bench.driver import run_workload
+    from bench.report import summarize
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), 'bench.db')
+    fresh   = not os.path.exists(db_path)
+    app     = _create_app(db_path)
+    if fresh:
+        started = time.perf_counter()
+        counts  = seed_app(app, _scale(args))
+        print(f'seeded {counts} in {time.perf_counter() - started:.1f} s', file=sys.stderr)
+
+    from extensions import db
+    from models import User, Project, Collaborator, Task, Comment
+    with app.app_context():
+        members = db.union(db.select(Project.owner_id), db.select(Collaborator.user_id)).subquery()
+        users   = list(db.session.scalars(
+            db.select(User.email).where(User.id.in_(db.select(members.c[0]))).order_by(User.id)
+        ))
+        dataset = {
+            name: db.session.scalar(db.select(db.func.count()).select_from(model))
+            for name, model in (('users', User), ('projects', Project), ('collaborators', Collaborator),
+                                ('tasks', Task), ('comments', Comment))
+        }
+
+    samples, seconds = run_workload(
+        app, users, PASSWORD, mode=args.mode, workers=args.workers, duration=args.duration,
+        warmup=args.warmup, mix=args.mix, seed=args.seed
+    )
+    result = summarize(samples, seconds, {
+        'mode':       args.mode,
+        'workers':    args.workers,
+        'duration_s': args.duration,
+        'warmup_s':   args.warmup,
+        'mix':        args.mix or None,
+    }, dataset)
+    out = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(out + '\n')
+    print(out)
+
+
+def cmd_compare(args):
+    lines, regressed = compare(load(args.base), load(args.head), args.threshold)
+    print('\n'.join(lines))
+    if regressed:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench', description='API load benchmark.')
+    sub    = parser.add_subparsers(dest='command', required=True)
+
+    seed = sub.add_parser('seed', help='load a synthetic dataset into a new SQLite file')
+    seed.add_argument('--db', required=True)
+    _scale_args(seed)
+    seed.set_defaults(func=cmd_seed)
+
+    run = sub.add_parser('run', help='drive the API and print results as JSON')
+    run.add_argument('--db', help='SQLite file; seeded first if it does not exist (default: a temp file)')
+    run.add_argument('--mode', choices=('client', 'wsgi'), default='client')
+    run.add_argument('--workers', type=int, default=8)
+    run.add_argument('--duration', type=float, default=10.0, help='measured seconds')
+    run.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before that')
+    run.add_argument('--mix', type=_mix, help='operation weights, e.g. get_tasks=50,create_task=10')
+    run.add_argument('--out', help='also write the JSON here')
+    _scale_args(run)
+    run.set_defaults(func=cmd_run)
+
+    cmp = sub.add_parser('compare', help='compare two result files; exits 1 on regression')
+    cmp.add_argument('base')
+    cmp.add_argument('head')
+    cmp.add_argument('--threshold', type=float, default=10.0, help='percent change counted as a regression')
+    cmp.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Synthetic dataset generator.
+
+Everything is inserted with multi-row Core INSERTs in large batches, so a
+100k-task dataset loads in seconds on SQLite. The shape is deliberately
+skewed, as real usage is:
+
+* project size follows a Zipf distribution: a few projects hold a large
+  share of the tasks, most have a handful;
+* user activity is Zipf too: a few users own several projects, sit in
+  many and write most of the comments;
+* comments concentrate on a minority of "hot" tasks;
+* tasks are assigned to project members (or unassigned), with a mix of
+  statuses and due dates around now.
+
+All users share one password so the driver can log in as anyone; it is
+hashed once with the app's configured method.
+"""
+import itertools
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+PASSWORD = 'bench-password'
+STATUSES = (('pending', 50), ('in-progress', 20), ('done', 30))
+BATCH    = 20000
+WORDS    = (
+    'api', 'bug', 'build', 'cache', 'client', 'deploy', 'design', 'docs', 'error', 'fix',
+    'index', 'login', 'migrate', 'mobile', 'page', 'query', 'refactor', 'release', 'review',
+    'search', 'server', 'slow', 'test', 'ui', 'update', 'upload',
+)
+
+
+class Scale:
+    """Dataset size; the defaults load in a few seconds."""
+
+    def __init__(self, users=1000, projects=200, members_per_project=5, tasks=20000,
+                 comments=40000, skew=1.1, seed=42):
+        self.users               = users
+        self.projects            = projects
+        self.members_per_project = members_per_project
+        self.tasks               = tasks
+        self.comments            = comments
+        self.skew                = skew
+        self.seed                = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _zipf_weights(n, skew):
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def _sentence(rnd, lo, hi):
+    return ' '.join(rnd.choices(WORDS, k=rnd.randint(lo, hi)))
+
+
+def _insert(conn, sql, rows):
+    for start in range(0, len(rows), BATCH):
+        conn.execute(text(sql), rows[start:start + BATCH])
+
+
+def seed(conn, scale, password_hash):
+    """
+    Load ``scale`` into an empty database through ``conn`` (inside a
+    transaction). Ids are assigned 1..n in insertion order.
+    """
+    if conn.execute(text('SELECT COUNT(*) FROM user')).scalar():
+        raise RuntimeError('bench.datagen.seed expects an empty database')
+
+    rnd = random.Random(scale.seed)
+    now = datetime.utcnow()
+
+    # rank -> id mappings are shuffled so "popular" isn't just "low id"
+    user_rank    = list(range(1, scale.users + 1))
+    project_rank = list(range(1, scale.projects + 1))
+    rnd.shuffle(user_rank)
+    rnd.shuffle(project_rank)
+    user_weights    = _zipf_weights(scale.users, scale.skew)
+    project_weights = _zipf_weights(scale.projects, scale.skew)
+
+    def active_users(k):
+        return rnd.choices(user_rank, cum_weights=user_weights, k=k)
+
+    _insert(conn,
+        "INSERT INTO user (first_name, last_name, email, password_hash, role, created_at) "
+        "VALUES (:first, :last, :email, :hash, 'user', :created)",
+        [{
+            'first':   f'User{i}',
+            'last':    'Bench',
+            'email':   f'user{i}@bench.test',
+            'hash':    password_hash,
+            'created': now - timedelta(days=365),
+        } for i in range(1, scale.users + 1)]
+    )
+
+    owners = active_users(scale.projects)
+    _insert(conn,
+        "INSERT INTO project (name, description, owner_id, created_at) "
+        "VALUES (:name, :description, :owner, :created)",
+        [{
+            'name':        f'Project {i} {_sentence(rnd, 1, 3)}',
+            'description': _sentence(rnd, 5, 20),
+            'owner':       owners[i - 1],
+            'created':     now - timedelta(days=rnd.randint(30, 365)),
+        } for i in range(1, scale.projects + 1)]
+    )
+
+    # popular projects get more members, drawn from the active users
+    members = {pid: {owners[pid - 1]} for pid in range(1, scale.projects + 1)}
+    total   = scale.projects * scale.members_per_project
+    for pid, uid in zip(rnd.choices(project_rank, cum_weights=project_weights, k=total), active_users(total)):
+        members[pid].add(uid)
+    _insert(conn,
+        "INSERT INTO collaborator (user_id, project_id, role, created_at) "
+        "VALUES (:user, :project, 'member', :created)",
+        [{'user': uid, 'project': pid, 'created': now - timedelta(days=30)}
+         for pid, uids in members.items() for uid in sorted(uids) if uid != owners[pid - 1]]
+    )
+    member_lists = {pid: sorted(uids) for pid, uids in members.items()}
+
+    statuses, status_weights = zip(*STATUSES)
+    task_projects = rnd.choices(project_rank, cum_weights=project_weights, k=scale.tasks)
+    task_rows     = []
+    for i, pid in enumerate(task_projects):
+        created = now - timedelta(minutes=(scale.tasks - i) * 5)
+        task_rows.append({
+            'title':       _sentence(rnd, 2, 6),
+            'description': _sentence(rnd, 0, 25) or None,
+            'status':      rnd.choices(statuses, status_weights)[0],
+            'due':         now + timedelta(hours=rnd.randint(-24 * 30, 24 * 60)) if rnd.random() < 0.7 else None,
+            'assignee':    rnd.choice(member_lists[pid]) if rnd.random() < 0.8 else None,
+            'project':     pid,
+            'created':     created,
+        })
+    _insert(conn,
+        "INSERT INTO task (title, description, status, due_date, assignee_id, project_id, created_at, updated_at) "
+        "VALUES (:title, :description, :status, :due, :assignee, :project, :created, :created)",
+        task_rows
+    )
+
+    if scale.tasks:
+        task_rank = list(range(1, scale.tasks + 1))
+        rnd.shuffle(task_rank)
+        hot_tasks = rnd.choices(task_rank, cum_weights=_zipf_weights(scale.tasks, scale.skew), k=scale.comments)
+        _insert(conn,
+            "INSERT INTO comment (task_id, user_id, text, created_at) VALUES (:task, :user, :text, :created)",
+            [{
+                'task':    tid,
+                'user':    rnd.choice(member_lists[task_projects[tid - 1]]),
+                'text':    _sentence(rnd, 3, 30),
+                'created': task_rows[tid - 1]['created'] + timedelta(minutes=rnd.randint(1, 600)),
+            } for tid in hot_tasks]
+        )
+
+    return {
+        'users':         scale.users,
+        'projects':      scale.projects,
+        'collaborators': sum(len(m) - 1 for m in members.values()),
+        'tasks':         scale.tasks,
+        'comments':      scale.comments if scale.tasks else 0,
+    }
+
+
+def seed_app(app, scale):
+    """
+    Seed the app's database, then rebuild the derived tables that the
+    app normally maintains on write (task statistics) and ANALYZE.
+    Returns the row counts.
+    """
+    from extensions import db
+    from app.passwords import hasher
+    from app.stats import check_stats
+
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            counts = seed(conn, scale, hasher.hash(PASSWORD))
+        check_stats(repair=True)
+        db.session.commit()
+        if db.engine.dialect.name == 'sqlite':
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql('ANALYZE')
+    return counts
@@ -0,0 +1,219 @@
+"""
+Concurrent workload driver.
+
+Each worker logs in as its own seeded user, primes its view of the
+user's projects and tasks, then loops until the deadline picking an
+operation by weight from the mix and timing it:
+
+    login         POST /api/auth/login
+    get_projects  GET  /api/projects
+    get_tasks     GET  /api/projects/<id>/tasks?limit=100
+    create_task   POST /api/projects/<id>/tasks
+    add_comment   POST /api/comments
+
+Transports: ``client`` calls the app in-process through the Flask test
+client (no sockets, measures the app itself); ``wsgi`` starts a local
+threaded werkzeug server and talks HTTP/1.1 keep-alive to it over
+loopback, one connection per worker.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+DEFAULT_MIX = {
+    'login':        2,
+    'get_projects': 20,
+    'get_tasks':    45,
+    'create_task':  13,
+    'add_comment':  20,
+}
+TASK_PAGE = 100
+
+
+class ClientTransport:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        resp    = self.client.open(path, method=method, json=body, headers=headers)
+        return resp.status_code, resp.get_data()
+
+    def close(self):
+        pass
+
+
+class HttpTransport:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.conn = http.client.HTTPConnection(host, port, timeout=60)
+
+    def request(self, method, path, body=None, token=None):
+        headers = {}
+        payload = None
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        for attempt in (1, 2):
+            try:
+                self.conn.request(method, path, payload, headers)
+                resp = self.conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                # the server closed an idle keep-alive connection; retry once
+                self.conn.close()
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        self.conn.close()
+
+
+class _KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LocalServer:
+    """Threaded werkzeug server on an ephemeral loopback port."""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_KeepAliveHandler)
+        self.port   = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+class Worker(threading.Thread):
+    def __init__(self, transport, email, password, mix, rnd, measure_from, deadline):
+        super().__init__(daemon=True)
+        self.transport    = transport
+        self.email        = email
+        self.password     = password
+        self.names        = list(mix)
+        self.weights      = [mix[n] for n in self.names]
+        self.rnd          = rnd
+        self.measure_from = measure_from
+        self.deadline     = deadline
+        self.token        = None
+        self.project_ids  = []
+        self.task_ids     = {}
+        self.samples      = []     # (operation, seconds, status)
+        self.error        = None
+
+    def run(self):
+        try:
+            self.login()
+            self.get_projects()
+            for project_id in self.project_ids[:5]:
+                self.get_tasks(project_id)
+            while True:
+                name    = self.rnd.choices(self.names, self.weights)[0]
+                started = time.perf_counter()
+                if started >= self.deadline:
+                    break
+                status  = getattr(self, name)()
+                if started >= self.measure_from:
+                    self.samples.append((name, time.perf_counter() - started, status))
+        except Exception as e:     # reported by the runner rather than lost in the thread
+            self.error = e
+        finally:
+            self.transport.close()
+
+    def _project(self):
+        return self.rnd.choice(self.project_ids)
+
+    def login(self):
+        status, body = self.transport.request(
+            'POST', '/api/auth/login', {'email': self.email, 'password': self.password}
+        )
+        if status == 200:
+            self.token = json.loads(body)['access_token']
+        elif self.token is None:
+            raise RuntimeError(f'login failed for {self.email}: {status} {body[:200]!r}')
+        return status
+
+    def get_projects(self):
+        status, body = self.transport.request('GET', '/api/projects', token=self.token)
+        if status == 200:
+            self.project_ids = [p['id'] for p in json.loads(body)] or self.project_ids
+        if not self.project_ids:
+            raise RuntimeError(f'{self.email} has no projects')
+        return status
+
+    def get_tasks(self, project_id=None):
+        project_id   = project_id or self._project()
+        status, body = self.transport.request(
+            'GET', f'/api/projects/{project_id}/tasks?limit={TASK_PAGE}', token=self.token
+        )
+        if status == 200:
+            self.task_ids[project_id] = [t['id'] for t in json.loads(body)['tasks']]
+        return status
+
+    def create_task(self):
+        project_id   = self._project()
+        status, body = self.transport.request('POST', f'/api/projects/{project_id}/tasks', {
+            'title':       f'bench task {self.rnd.randrange(10 ** 9)}',
+            'description': 'created by the load benchmark',
+        }, token=self.token)
+        if status == 201:
+            self.task_ids.setdefault(project_id, []).append(json.loads(body)['id'])
+        return status
+
+    def add_comment(self):
+        known = [tid for tids in self.task_ids.values() for tid in tids[-TASK_PAGE:]]
+        if not known:
+            return self.get_tasks()
+        status, _ = self.transport.request('POST', '/api/comments', {
+            'task_id': self.rnd.choice(known),
+            'text':    'benchmark comment',
+        }, token=self.token)
+        return status
+
+
+def run_workload(app, users, password, mode='client', workers=8, duration=10.0, warmup=2.0,
+                 mix=None, seed=0):
+    """
+    Run ``workers`` concurrent workers (each logged in as one of ``users``)
+    for ``warmup + duration`` seconds. Returns (samples, measured seconds).
+    """
+    mix = mix or DEFAULT_MIX
+    rnd = random.Random(seed)
+
+    def start(transport_factory):
+        now          = time.perf_counter()
+        measure_from = now + warmup
+        deadline     = measure_from + duration
+        pool = [
+            Worker(transport_factory(), email, password, mix, random.Random(rnd.random()), measure_from, deadline)
+            for email in rnd.sample(users, min(workers, len(users))) + rnd.choices(users, k=max(0, workers - len(users)))
+        ]
+        for w in pool:
+            w.start()
+        for w in pool:
+            w.join()
+        errors = [w.error for w in pool if w.error is not None]
+        if errors:
+            raise RuntimeError(f'{len(errors)} worker(s) failed; first: {errors[0]!r}')
+        return [s for w in pool for s in w.samples], duration
+
+    if mode == 'client':
+        return start(lambda: ClientTransport(app))
+    with LocalServer(app) as server:
+        return start(lambda: HttpTransport('127.0.0.1', server.port))
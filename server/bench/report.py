@@ -0,0 +1,104 @@
+"""
+Benchmark results as JSON, and comparison of two result files.
+
+A result looks like::
+
+    {"meta": {"commit": "...", "mode": "client", "workers": 8, ...},
+     "dataset": {"users": 1000, ...},
+     "total": {"requests": 5321, "errors": 0, "throughput_rps": 532.1,
+               "p50_ms": ..., "p95_ms": ..., "p99_ms": ..., "mean_ms": ...},
+     "operations": {"get_tasks": {...same keys...}, ...}}
+
+A request counts as an error when its status is not 2xx.
+"""
+import json
+import platform
+import sqlite3
+import subprocess
+import time
+from collections import Counter
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def _stats(samples, seconds):
+    latencies = sorted(s[1] for s in samples)
+    errors    = Counter(s[2] for s in samples if not 200 <= s[2] < 300)
+    return {
+        'requests':       len(samples),
+        'errors':         sum(errors.values()),
+        'error_statuses': {str(k): v for k, v in sorted(errors.items())},
+        'throughput_rps': round(len(samples) / seconds, 2) if seconds else 0.0,
+        'mean_ms':        round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms':         round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms':         round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms':         round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def git_commit(cwd=None):
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(samples, seconds, meta, dataset):
+    by_op = {}
+    for sample in samples:
+        by_op.setdefault(sample[0], []).append(sample)
+    return {
+        'meta': {
+            'commit':    git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python':    platform.python_version(),
+            'sqlite':    sqlite3.sqlite_version,
+            **meta,
+        },
+        'dataset':    dataset,
+        'total':      _stats(samples, seconds),
+        'operations': {op: _stats(s, seconds) for op, s in sorted(by_op.items())},
+    }
+
+
+def _change(base, head):
+    return (head - base) / base * 100 if base else 0.0
+
+
+def compare(base, head, threshold=10.0):
+    """
+    Lines describing throughput and latency changes from ``base`` to
+    ``head`` per operation, and whether any crossed ``threshold`` percent
+    in the bad direction (throughput down, p95 up, or new errors).
+    """
+    lines, regressed = [], False
+    header = f'{"operation":<14} {"rps base":>9} {"rps head":>9} {"Δ%":>7}   {"p95 base":>9} {"p95 head":>9} {"Δ%":>7}'
+    lines.append(header)
+    ops = sorted(set(base['operations']) | set(head['operations'])) + ['total']
+    for op in ops:
+        b = base['total'] if op == 'total' else base['operations'].get(op)
+        h = head['total'] if op == 'total' else head['operations'].get(op)
+        if b is None or h is None:
+            lines.append(f'{op:<14} only in {"head" if b is None else "base"}')
+            continue
+        rps = _change(b['throughput_rps'], h['throughput_rps'])
+        p95 = _change(b['p95_ms'], h['p95_ms'])
+        bad = rps < -threshold or p95 > threshold or h['errors'] > b['errors']
+        regressed |= bad
+        lines.append(
+            f'{op:<14} {b["throughput_rps"]:>9.1f} {h["throughput_rps"]:>9.1f} {rps:>+7.1f}   '
+            f'{b["p95_ms"]:>9.2f} {h["p95_ms"]:>9.2f} {p95:>+7.1f}{"  <- regression" if bad else ""}'
+        )
+    return lines, regressed
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
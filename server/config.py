@@ -1,16 +1,142 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+def engine_options(uri):
+    """Pool settings from the environment; SQLite keeps SQLAlchemy's own pool."""
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+    if not uri.startswith("sqlite"):
+        options.update(
+            pool_size     = int(os.getenv("DB_POOL_SIZE", 10)),
+            max_overflow  = int(os.getenv("DB_MAX_OVERFLOW", 20)),
+            pool_timeout  = int(os.getenv("DB_POOL_TIMEOUT", 30)),
+            pool_recycle  = int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        )
+    return options
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL", "sqlite:///taskflow.db"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # optional read replica; GET/HEAD requests read from it when set
+    SQLALCHEMY_BINDS = (
+        {"replica": {"url": os.getenv("DATABASE_READ_URL"),
+                     **engine_options(os.getenv("DATABASE_READ_URL"))}}
+        if os.getenv("DATABASE_READ_URL") else {}
+    )
+
+    # pragmas applied to every new SQLite connection
+    SQLITE_JOURNAL_MODE  = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS   = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT  = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))   # ms
 
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-super-secret")
-    JWT_ACCESS_TOKEN_EXPIRES = False
+    # tokens carry the user's role; a finite lifetime bounds how long a
+    # demoted or deleted user's existing tokens stay usable
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=float(os.getenv("JWT_ACCESS_TOKEN_HOURS", 12)))
 
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173")
+
+    # comma-separated feature blueprints to serve (see main.BLUEPRINTS);
+    # unset serves all of them
+    FEATURES = os.getenv("FEATURES")
+    # compile the URL map and mappers and open a database connection in
+    # create_app instead of on the first request
+    WARM_UP  = _env_bool("WARM_UP", True)
+
+    # "orjson" (used when installed) or "default" for Flask's stdlib json provider
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+    # response compression: encodings offered in preference order ("br" needs
+    # the brotli package), smallest body worth compressing (bytes), levels
+    COMPRESS_ALGORITHMS     = tuple(os.getenv("COMPRESS_ALGORITHMS", "br,gzip").split(","))
+    COMPRESS_MIN_SIZE       = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_GZIP_LEVEL     = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
+
+    # per-endpoint latency/SQL/size metrics served at /metrics; statements
+    # slower than SLOW_QUERY_MS are logged with their SQL
+    METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+    SLOW_QUERY_MS   = float(os.getenv("SLOW_QUERY_MS", 200))
+
+    # per-user project membership cache (seconds / max cached users)
+    MEMBERSHIP_CACHE_TTL  = int(os.getenv("MEMBERSHIP_CACHE_TTL", 60))
+    MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", 10000))
+
+    # cache of user records behind flask_jwt_extended.current_user; the TTL
+    # (seconds) bounds how long other workers serve a record after a change
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+    USER_CACHE_TTL  = int(os.getenv("USER_CACHE_TTL", 60))
+
+    # password hashing; use werkzeug's fully-expanded method string so stored
+    # hashes can be compared against it for rehash-on-login
+    PASSWORD_HASH_METHOD  = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH  = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    # >0 runs hashing in a process pool of this size; 0 hashes inline
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    PASSWORD_HASH_QUEUE   = int(os.getenv("PASSWORD_HASH_QUEUE", 8))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 5))
+
+    # login token buckets: burst size and refill rate (tokens/second)
+    LOGIN_RATE_LIMIT     = int(os.getenv("LOGIN_RATE_LIMIT", 10))
+    LOGIN_RATE_REFILL    = float(os.getenv("LOGIN_RATE_REFILL", 0.1))
+    LOGIN_IP_RATE_LIMIT  = int(os.getenv("LOGIN_IP_RATE_LIMIT", 100))
+    LOGIN_IP_RATE_REFILL = float(os.getenv("LOGIN_IP_RATE_REFILL", 1))
+    # reverse proxies in front of the app whose X-Forwarded-For entries are
+    # trusted; 0 keys the per-IP bucket on the socket address, which behind
+    # a proxy is the proxy's own
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", 0))
+
+    # per-subscriber event queue for streaming endpoints, and SSE keep-alive
+    BROKER_QUEUE_SIZE     = int(os.getenv("BROKER_QUEUE_SIZE", 100))
+    SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+
+    # chat persistence: "async" queues messages for a background writer that
+    # commits them in batches (send doesn't wait for the commit, queued
+    # messages are lost on a crash); "sync" commits inside the request
+    CHAT_DURABILITY        = os.getenv("CHAT_DURABILITY", "async")
+    CHAT_WRITER_BATCH_SIZE = int(os.getenv("CHAT_WRITER_BATCH_SIZE", 500))
+    CHAT_WRITER_QUEUE_SIZE = int(os.getenv("CHAT_WRITER_QUEUE_SIZE", 10000))
+    # longest a chat long-poll request waits for a message (seconds)
+    CHAT_POLL_TIMEOUT      = int(os.getenv("CHAT_POLL_TIMEOUT", 25))
+
+    # background jobs: worker threads in each web process (0 leaves jobs to
+    # `flask jobs run`), idle poll interval, seconds before a running job
+    # whose worker vanished is retried, and retry backoff (first delay in
+    # seconds, doubled per attempt up to the max)
+    JOBS_WORKERS       = int(os.getenv("JOBS_WORKERS", 2))
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+    JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", 300))
+    JOBS_BACKOFF_BASE  = float(os.getenv("JOBS_BACKOFF_BASE", 5))
+    JOBS_BACKOFF_MAX   = float(os.getenv("JOBS_BACKOFF_MAX", 3600))
+
+    # due-date reminders: how far ahead of the due date assignees are
+    # notified, tasks per batch, and how often each web process runs the
+    # scan (seconds; 0 leaves it to `flask reminders send`)
+    REMINDER_LEAD_HOURS = float(os.getenv("REMINDER_LEAD_HOURS", 24))
+    REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", 500))
+    REMINDER_INTERVAL   = int(os.getenv("REMINDER_INTERVAL", 300))
+
+    # change feed: days a deletion tombstone is kept; clients that last
+    # synced before that have to rebuild their copy
+    CHANGES_TOMBSTONE_DAYS = float(os.getenv("CHANGES_TOMBSTONE_DAYS", 30))
+
+    # rows deleted per transaction when purging a deleted project or user
+    PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", 1000))
+
+    # outgoing mail; with no MAIL_SERVER messages are only logged
+    MAIL_SERVER   = os.getenv("MAIL_SERVER")
+    MAIL_PORT     = int(os.getenv("MAIL_PORT", 587))
+    MAIL_USE_TLS  = _env_bool("MAIL_USE_TLS", True)
+    MAIL_USERNAME = os.getenv("MAIL_USERNAME")
+    MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+    MAIL_SENDER   = os.getenv("MAIL_SENDER", "no-reply@localhost")
@@ -1,53 +1,199 @@
 # main.py
-from flask import Flask, jsonify
+import time
+_import_started = time.perf_counter()
+
+import importlib
+import click
+from flask import Flask, Response, abort, jsonify
+from sqlalchemy.orm import configure_mappers
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
-from extensions import db, jwt, cors, migrate
-
-# ─── IMPORT BLUEPRINTS ─────────────────────────────────────────────────────────
-from routes.auth_routes         import auth_bp
-from routes.project_routes      import project_bp
-from routes.task_routes         import task_bp
-from routes.comment_routes      import comment_bp
-from routes.notification_routes import notification_bp
-from routes.chat_routes         import chat_bp
-from routes.collaborator_routes import collaborator_bp
-from routes.team_routes         import team_test_bp
-from routes.newsletter_routes   import newsletter_bp
-
-def create_app():
+from extensions import db, jwt, cors
+from app.database import configure_engines
+from app.json_provider import make_json_provider
+from app.compression import compression
+from app.instrumentation import metrics
+from app.cache_control import cache_control
+from app.membership import membership
+from app.user_cache import user_cache
+from app.passwords import hasher
+from app.jobs import job_runner, jobs_cli
+# imported whatever the features: their session listeners keep task_stats
+# and the change log in step with every write and hide soft-deleted rows
+# from every query, and the job workers need the purge handlers
+from app.stats import stats_cli
+from app.changes import changes_cli
+from app.purge import purge_cli
+
+# ─── FEATURE BLUEPRINTS ────────────────────────────────────────────────────────
+# feature -> (module, blueprint, url_prefix); a route module is only imported
+# by create_app when its feature is enabled
+BLUEPRINTS = {
+    'auth':          ('routes.auth_routes',         'auth_bp',         '/api/auth'),
+    'projects':      ('routes.project_routes',      'project_bp',      '/api'),
+    'tasks':         ('routes.task_routes',         'task_bp',         None),          # `/api/projects/...`
+    'comments':      ('routes.comment_routes',      'comment_bp',      '/api'),
+    'notifications': ('routes.notification_routes', 'notification_bp', '/api'),
+    'chat':          ('routes.chat_routes',         'chat_bp',         '/api/chat'),
+    'collaborators': ('routes.collaborator_routes', 'collaborator_bp', '/api'),
+    'team':          ('routes.team_routes',         'team_test_bp',    '/api/team'),
+    'newsletter':    ('routes.newsletter_routes',   'newsletter_bp',   '/api'),
+    'export':        ('routes.export_routes',       'export_bp',       '/api'),
+    'search':        ('routes.search_routes',       'search_bp',       '/api/tasks'),
+    'stats':         ('routes.stats_routes',        'stats_bp',        '/api'),
+    'changes':       ('routes.change_routes',       'change_bp',       '/api'),
+}
+# flask-restful resources rather than a blueprint
+FEATURES = (*BLUEPRINTS, 'admin')
+
+# ─── FEATURE SERVICES ──────────────────────────────────────────────────────────
+# feature -> services ('module:attribute') create_app calls init_app on, and
+# CLI groups it adds; like the route modules they are only imported when
+# their feature is enabled
+SERVICES = {
+    'auth':          ('app.rate_limit:login_limiter', 'app.rate_limit:login_ip_limiter'),
+    'chat':          ('app.broker:broker', 'app.chat:chat_writer'),
+    'notifications': ('app.broker:broker', 'app.reminders:reminder_scheduler'),
+}
+COMMANDS = {
+    'notifications': ('app.reminders:reminders_cli',),
+}
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+def enabled_features(features=None):
+    """Feature names from a list or comma-separated string; None means all."""
+    if features is None:
+        return FEATURES
+    if isinstance(features, str):
+        features = [f.strip() for f in features.split(',') if f.strip()]
+    unknown = set(features) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+    return tuple(f for f in FEATURES if f in features)
+
+def _load(path):
+    """The object at 'module:attribute', importing the module."""
+    module, attribute = path.split(':')
+    return getattr(importlib.import_module(module), attribute)
+
+def _feature_hooks(table, features):
+    """Entries of SERVICES/COMMANDS for ``features``, loaded once each."""
+    paths = dict.fromkeys(path for feature in features for path in table.get(feature, ()))
+    return [_load(path) for path in paths]
+
+def warm_up(app):
+    """
+    Do the one-off work a first request would otherwise pay for: configure
+    the ORM mappers, compile the URL matcher and open a pooled connection
+    per engine (running the SQLite pragmas). Returns seconds per step.
+    """
+    timings = {}
+    started = time.perf_counter()
+    configure_mappers()
+    timings['mappers'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    app.url_map.update()
+    timings['url_map'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.connect().close()
+    timings['connect'] = time.perf_counter() - started
+    return timings
+
+def create_app(features=None, warm=None):
+    """
+    ``features`` picks the blueprints to serve (default: Config.FEATURES,
+    else all) and ``warm`` overrides Config.WARM_UP. Seconds spent per
+    startup phase are left in app.extensions['startup'].
+    """
+    timings = {'import': IMPORT_SECONDS}
+    started = time.perf_counter()
+
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = make_json_provider(app)
+    # client address from the trusted proxies' X-Forwarded-For, so per-IP
+    # limits see clients rather than the proxy
+    if app.config.get('PROXY_FIX_X_FOR'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
 
     # ─── INIT EXTENSIONS 
     db.init_app(app)
+    configure_engines(app, db)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate pulls in alembic, a large share of import time; only the
+    # `flask db` commands need it and the CLI builds the app inside click
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    membership.init_app(app)
+    user_cache.init_app(app)
+    hasher.init_app(app)
+    job_runner.init_app(app)
+    features = enabled_features(features if features is not None else app.config.get('FEATURES'))
+    for service in _feature_hooks(SERVICES, features):
+        service.init_app(app)
+    metrics.init_app(app)
+    compression.init_app(app)
     cors.init_app(
         app,
         resources={ r"/api/*": {"origins": app.config["CORS_ORIGINS"]} },
         supports_credentials=True
     )
+    timings['extensions'] = time.perf_counter() - started
 
     # ─── REGISTER BLUEPRINTS 
-    app.register_blueprint(auth_bp,           url_prefix="/api/auth")
-    app.register_blueprint(project_bp,        url_prefix="/api")
-    app.register_blueprint(task_bp)                                    # `/api/projects/...`
-    app.register_blueprint(comment_bp,        url_prefix="/api")
-    app.register_blueprint(notification_bp,   url_prefix="/api")
-    app.register_blueprint(chat_bp,           url_prefix="/api/chat")
-    app.register_blueprint(collaborator_bp,   url_prefix="/api")
-    app.register_blueprint(team_test_bp,      url_prefix="/api/team")
-    app.register_blueprint(newsletter_bp,     url_prefix="/api")
+    started = time.perf_counter()
+    for feature in features:
+        if feature in BLUEPRINTS:
+            module, blueprint, url_prefix = BLUEPRINTS[feature]
+            app.register_blueprint(getattr(importlib.import_module(module), blueprint), url_prefix=url_prefix)
+
+    # ─── ADMIN RESOURCES 
+    if 'admin' in features:
+        from flask_restful import Api
+        from routes.admin import AdminUserList, AdminUserResource
+        api = Api(app)
+        api.add_resource(AdminUserList,     "/api/admin/users")
+        api.add_resource(AdminUserResource, "/api/admin/users/<int:user_id>")
+    timings['blueprints'] = time.perf_counter() - started
+
+    # ─── CLI COMMANDS 
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(changes_cli)
+    app.cli.add_command(purge_cli)
+    for group in _feature_hooks(COMMANDS, features):
+        app.cli.add_command(group)
 
     # ─── ROOT & HEALTH-CHECK ROUTES 
     @app.route("/", methods=["GET"])
+    @cache_control(public=True, max_age=3600)
     def index():
         return jsonify({"message": "Welcome to TaskFlow API"}), 200
 
     @app.route("/healthz", methods=["GET"])
+    @cache_control(no_store=True)
     def healthz():
         return jsonify({"status": "ok"}), 200
 
+    @app.route("/metrics", methods=["GET"])
+    @cache_control(no_store=True)
+    def prometheus_metrics():
+        if not metrics.enabled:
+            abort(404)
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    # ─── WARM-UP 
+    if app.config.get('WARM_UP', True) if warm is None else warm:
+        for step, seconds in warm_up(app).items():
+            timings[f'warm_up.{step}'] = seconds
+
+    app.extensions['startup'] = timings
     return app
 
 if __name__ == "__main__":
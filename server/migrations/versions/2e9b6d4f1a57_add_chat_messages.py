@@ -0,0 +1,36 @@
+"""Add chat messages
+
+Revision ID: 2e9b6d4f1a57
+Revises: 8d5f2b6c0e71
+Create Date: 2026-10-18 15:12:08.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e9b6d4f1a57'
+down_revision = '8d5f2b6c0e71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_message',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('uuid', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chat_message_project_id_id', 'chat_message', ['project_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_chat_message_project_id_id', table_name='chat_message')
+    op.drop_table('chat_message')
@@ -0,0 +1,46 @@
+"""Add indexes for foreign-key and filter columns
+
+Revision ID: 3f9a1c2d7b64
+Revises: e10624b12b27
+Create Date: 2026-10-18 09:02:41.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7b64'
+down_revision = 'e10624b12b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # keep the oldest row of any duplicated membership so the unique index can be built
+    op.execute(
+        'DELETE FROM collaborator WHERE id NOT IN ('
+        'SELECT MIN(id) FROM collaborator GROUP BY user_id, project_id)'
+    )
+
+    op.create_index('ix_project_owner_id', 'project', ['owner_id'], unique=False)
+    op.create_index('uq_collaborator_user_project', 'collaborator', ['user_id', 'project_id'], unique=True)
+    op.create_index('ix_collaborator_project_id', 'collaborator', ['project_id'], unique=False)
+    op.create_index('ix_task_project_status_due', 'task', ['project_id', 'status', 'due_date'], unique=False)
+    op.create_index('ix_task_project_created', 'task', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_task_assignee_status', 'task', ['assignee_id', 'status'], unique=False)
+    op.create_index('ix_task_due_status', 'task', ['due_date', 'status'], unique=False)
+    op.create_index('ix_comment_task_created', 'comment', ['task_id', 'created_at'], unique=False)
+    op.create_index('ix_comment_user_id', 'comment', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_comment_user_id', table_name='comment')
+    op.drop_index('ix_comment_task_created', table_name='comment')
+    op.drop_index('ix_task_due_status', table_name='task')
+    op.drop_index('ix_task_assignee_status', table_name='task')
+    op.drop_index('ix_task_project_created', table_name='task')
+    op.drop_index('ix_task_project_status_due', table_name='task')
+    op.drop_index('ix_collaborator_project_id', table_name='collaborator')
+    op.drop_index('uq_collaborator_user_project', table_name='collaborator')
+    op.drop_index('ix_project_owner_id', table_name='project')
@@ -0,0 +1,147 @@
+"""Add soft delete to projects and users, ON DELETE actions on their foreign keys
+
+Revision ID: 4c8e1a6d2f93
+Revises: 7e4c2a9f6b81
+Create Date: 2026-10-18 23:48:12.530184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8e1a6d2f93'
+down_revision = '7e4c2a9f6b81'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referred table, ondelete)
+FOREIGN_KEYS = [
+    ('project',      'owner_id',    'user',    'CASCADE'),
+    ('collaborator', 'user_id',     'user',    'CASCADE'),
+    ('collaborator', 'project_id',  'project', 'CASCADE'),
+    ('task',         'assignee_id', 'user',    'SET NULL'),
+    ('task',         'project_id',  'project', 'CASCADE'),
+    ('comment',      'task_id',     'task',    'CASCADE'),
+    ('comment',      'user_id',     'user',    'CASCADE'),
+    ('chat_message', 'project_id',  'project', 'CASCADE'),
+    ('chat_message', 'user_id',     'user',    'CASCADE'),
+    ('notification', 'user_id',     'user',    'CASCADE'),
+    ('notification', 'project_id',  'project', 'CASCADE'),
+]
+
+# The foreign keys were created unnamed; this names them the way
+# Postgres did, and gives batch mode a name to drop them by on SQLite.
+NAMING = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+# SQLite rebuilds a table to change its constraints. The search triggers
+# on task and comment go with the old table, and the comment_search view
+# blocks the rename, so they are dropped first and recreated after (as in
+# 6a1d3c8e5f20). The FTS indexes are keyed by rowid, which the rebuild
+# keeps, so they need no rebuild.
+SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS comment_fts_task_ad",
+    "DROP TRIGGER IF EXISTS comment_fts_task_au",
+    "DROP TRIGGER IF EXISTS comment_fts_au",
+    "DROP TRIGGER IF EXISTS comment_fts_ad",
+    "DROP TRIGGER IF EXISTS comment_fts_ai",
+    "DROP VIEW IF EXISTS comment_search",
+    "DROP TRIGGER IF EXISTS task_fts_au",
+    "DROP TRIGGER IF EXISTS task_fts_ad",
+    "DROP TRIGGER IF EXISTS task_fts_ai",
+]
+
+SQLITE_SEARCH_CREATE = [
+    """CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description, project_id ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+    """CREATE VIEW comment_search AS
+        SELECT comment.id AS id, comment.text AS text, task.project_id AS project_id
+          FROM comment JOIN task ON task.id = comment.task_id""",
+    """CREATE TRIGGER comment_fts_ai AFTER INSERT ON comment BEGIN
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_ad AFTER DELETE ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_au AFTER UPDATE OF text, task_id ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_task_au AFTER UPDATE OF project_id ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT id, text, new.project_id FROM comment WHERE task_id = new.id;
+    END""",
+    """CREATE TRIGGER comment_fts_task_ad AFTER DELETE ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+    END""",
+]
+
+
+def _run(statements):
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def _set_ondelete(with_actions):
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        _run(SQLITE_SEARCH_DROP)
+    tables = dict.fromkeys(table for table, *_ in FOREIGN_KEYS)
+    for table in tables:
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING) as batch_op:
+            for fk_table, column, referred, ondelete in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'],
+                                            ondelete=ondelete if with_actions else None)
+    if sqlite:
+        _run(SQLITE_SEARCH_CREATE)
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # lookups behind the purge and the cascades
+    op.create_index('ix_notification_project_id', 'notification', ['project_id'], unique=False)
+    op.create_index('ix_chat_message_user_id', 'chat_message', ['user_id'], unique=False)
+
+    _set_ondelete(with_actions=True)
+
+
+def downgrade():
+    _set_ondelete(with_actions=False)
+
+    op.drop_index('ix_chat_message_user_id', table_name='chat_message')
+    op.drop_index('ix_notification_project_id', table_name='notification')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
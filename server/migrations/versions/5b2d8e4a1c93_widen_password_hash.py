@@ -0,0 +1,35 @@
+"""Widen user.password_hash
+
+scrypt hashes from werkzeug are 162 characters, longer than the original
+VARCHAR(128).
+
+Revision ID: 5b2d8e4a1c93
+Revises: a7c3e9d1f052
+Create Date: 2026-10-18 12:31:55.274410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2d8e4a1c93'
+down_revision = 'a7c3e9d1f052'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=False)
@@ -0,0 +1,115 @@
+"""Add full-text search over tasks and comments
+
+Revision ID: 6a1d3c8e5f20
+Revises: 2e9b6d4f1a57
+Create Date: 2026-10-18 16:02:51.377120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a1d3c8e5f20'
+down_revision = '2e9b6d4f1a57'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE task_fts USING fts5(
+        title, description, project_id, content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+    END""",
+    """CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description, project_id ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+        INSERT INTO task_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END""",
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+    """CREATE VIEW comment_search AS
+        SELECT comment.id AS id, comment.text AS text, task.project_id AS project_id
+          FROM comment JOIN task ON task.id = comment.task_id""",
+    """CREATE VIRTUAL TABLE comment_fts USING fts5(
+        text, project_id, content='comment_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER comment_fts_ai AFTER INSERT ON comment BEGIN
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_ad AFTER DELETE ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_au AFTER UPDATE OF text, task_id ON comment BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', old.id, old.text, project_id FROM task WHERE id = old.task_id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT new.id, new.text, project_id FROM task WHERE id = new.task_id;
+    END""",
+    """CREATE TRIGGER comment_fts_task_au AFTER UPDATE OF project_id ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+        INSERT INTO comment_fts(rowid, text, project_id)
+        SELECT id, text, new.project_id FROM comment WHERE task_id = new.id;
+    END""",
+    """CREATE TRIGGER comment_fts_task_ad AFTER DELETE ON task BEGIN
+        INSERT INTO comment_fts(comment_fts, rowid, text, project_id)
+        SELECT 'delete', id, text, old.project_id FROM comment WHERE task_id = old.id;
+    END""",
+    "INSERT INTO comment_fts(comment_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS comment_fts_task_ad",
+    "DROP TRIGGER IF EXISTS comment_fts_task_au",
+    "DROP TRIGGER IF EXISTS comment_fts_au",
+    "DROP TRIGGER IF EXISTS comment_fts_ad",
+    "DROP TRIGGER IF EXISTS comment_fts_ai",
+    "DROP TABLE IF EXISTS comment_fts",
+    "DROP VIEW IF EXISTS comment_search",
+    "DROP TRIGGER IF EXISTS task_fts_au",
+    "DROP TRIGGER IF EXISTS task_fts_ad",
+    "DROP TRIGGER IF EXISTS task_fts_ai",
+    "DROP TABLE IF EXISTS task_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "CREATE INDEX ix_task_search ON task USING gin "
+    "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')))",
+    "CREATE INDEX ix_comment_search ON comment USING gin (to_tsvector('english', text))",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_comment_search",
+    "DROP INDEX IF EXISTS ix_task_search",
+]
+
+
+def _run(statements):
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_DOWNGRADE)
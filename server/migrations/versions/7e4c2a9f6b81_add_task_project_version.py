@@ -0,0 +1,33 @@
+"""Add optimistic-locking version to task and project
+
+Revision ID: 7e4c2a9f6b81
+Revises: b5d9f2c7a318
+Create Date: 2026-10-18 23:05:41.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4c2a9f6b81'
+down_revision = 'b5d9f2c7a318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    # not batch mode: rebuilding `task` on SQLite trips over the search
+    # view and triggers that reference it (DROP COLUMN needs SQLite 3.35)
+    op.drop_column('task', 'version')
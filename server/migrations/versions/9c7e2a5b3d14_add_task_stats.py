@@ -0,0 +1,52 @@
+"""Add task statistics aggregates
+
+Revision ID: 9c7e2a5b3d14
+Revises: 6a1d3c8e5f20
+Create Date: 2026-10-18 17:21:36.918254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c7e2a5b3d14'
+down_revision = '6a1d3c8e5f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_stats',
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('assignee_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('project_id', 'assignee_id', 'status')
+    )
+    op.create_table('task_due_stats',
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('assignee_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('project_id', 'assignee_id', 'due_date')
+    )
+
+    # backfill from existing tasks
+    day = 'date(due_date)' if op.get_bind().dialect.name == 'sqlite' else 'CAST(due_date AS DATE)'
+    op.execute(
+        "INSERT INTO task_stats (project_id, assignee_id, status, count) "
+        "SELECT project_id, coalesce(assignee_id, 0), coalesce(status, 'pending'), count(*) "
+        "FROM task GROUP BY project_id, coalesce(assignee_id, 0), coalesce(status, 'pending')"
+    )
+    op.execute(
+        "INSERT INTO task_due_stats (project_id, assignee_id, due_date, count) "
+        f"SELECT project_id, coalesce(assignee_id, 0), {day}, count(*) "
+        "FROM task WHERE due_date IS NOT NULL AND coalesce(status, 'pending') != 'done' "
+        f"GROUP BY project_id, coalesce(assignee_id, 0), {day}"
+    )
+
+
+def downgrade():
+    op.drop_table('task_due_stats')
+    op.drop_table('task_stats')
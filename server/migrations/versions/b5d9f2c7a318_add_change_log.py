@@ -0,0 +1,64 @@
+"""Add project change log
+
+Revision ID: b5d9f2c7a318
+Revises: f3b7c1e9a264
+Create Date: 2026-10-18 21:42:07.318540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d9f2c7a318'
+down_revision = 'f3b7c1e9a264'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_change_log_entity', 'change_log', ['project_id', 'entity', 'entity_id'], unique=True)
+    op.create_index('ix_change_log_project_seq', 'change_log', ['project_id', 'seq', 'id'], unique=False)
+    op.create_index('ix_change_log_op_changed', 'change_log', ['op', 'changed_at'], unique=False)
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('changes_floor', sa.Integer(), server_default='0', nullable=False))
+
+    # backfill the current state, so a first sync (since=0) returns everything;
+    # the bump keeps the backfilled seqs above 0
+    op.execute("UPDATE project SET revision = revision + 1")
+    op.execute(
+        "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+        "SELECT t.project_id, 'task', t.id, 'upsert', p.revision, CURRENT_TIMESTAMP "
+        "FROM task t JOIN project p ON p.id = t.project_id"
+    )
+    op.execute(
+        "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+        "SELECT t.project_id, 'comment', c.id, 'upsert', p.revision, CURRENT_TIMESTAMP "
+        "FROM comment c JOIN task t ON t.id = c.task_id JOIN project p ON p.id = t.project_id"
+    )
+    op.execute(
+        "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+        "SELECT c.project_id, 'collaborator', c.id, 'upsert', p.revision, CURRENT_TIMESTAMP "
+        "FROM collaborator c JOIN project p ON p.id = c.project_id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('changes_floor')
+
+    op.drop_index('ix_change_log_op_changed', table_name='change_log')
+    op.drop_index('ix_change_log_project_seq', table_name='change_log')
+    op.drop_index('uq_change_log_entity', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,26 @@
+"""Add project revision counter
+
+Revision ID: c4e1f7a92d38
+Revises: 5b2d8e4a1c93
+Create Date: 2026-10-18 13:20:16.804127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1f7a92d38'
+down_revision = '5b2d8e4a1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('revision')
@@ -0,0 +1,32 @@
+"""Add task due-date reminders
+
+Revision ID: f3b7c1e9a264
+Revises: d8a4f6b2c915
+Create Date: 2026-10-18 20:14:52.630187
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7c1e9a264'
+down_revision = 'd8a4f6b2c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_reminder',
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'due_date')
+    )
+    op.create_index('ix_task_reminder_due_date', 'task_reminder', ['due_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_reminder_due_date', table_name='task_reminder')
+    op.drop_table('task_reminder')
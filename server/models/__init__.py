@@ -7,3 +7,11 @@ from .project import Project
 from .task import Task
 from .collaborator import Collaborator
 from .comment import Comment
+from .notification import Notification
+from .chat_message import ChatMessage
+from .task_stats import TaskStats
+from .task_due_stats import TaskDueStats
+from .job import Job
+from .newsletter_subscription import NewsletterSubscription
+from .task_reminder import TaskReminder
+from .change_log import ChangeLog
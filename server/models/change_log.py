@@ -0,0 +1,24 @@
+# app/models/change_log.py
+
+from datetime import datetime
+from extensions import db
+
+class ChangeLog(db.Model):
+    """Latest change to a task, comment or collaborator of a project; see app.changes."""
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        # one row per entity: a new change replaces the previous one
+        db.Index('uq_change_log_entity', 'project_id', 'entity', 'entity_id', unique=True),
+        # the feed: a project's changes after a given seq
+        db.Index('ix_change_log_project_seq', 'project_id', 'seq', 'id'),
+        # tombstone pruning
+        db.Index('ix_change_log_op_changed', 'op', 'changed_at'),
+    )
+
+    id         = db.Column(db.Integer,    primary_key=True)
+    project_id = db.Column(db.Integer,    db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
+    entity     = db.Column(db.String(20), nullable=False)
+    entity_id  = db.Column(db.Integer,    nullable=False)
+    op         = db.Column(db.String(10), nullable=False)           # 'upsert' or 'delete'
+    seq        = db.Column(db.Integer,    nullable=False)           # project revision of the change
+    changed_at = db.Column(db.DateTime,   nullable=False, default=datetime.utcnow)
@@ -0,0 +1,30 @@
+# app/models/chat_message.py
+
+from datetime import datetime
+from extensions import db
+from app.serializers import Schema, datetime_field
+
+class ChatMessage(db.Model):
+    __tablename__ = 'chat_message'  # explicit table name
+    __table_args__ = (
+        # keyset-paginated history per project channel
+        db.Index('ix_chat_message_project_id_id', 'project_id', 'id'),
+        # user purges and ON DELETE CASCADE
+        db.Index('ix_chat_message_user_id', 'user_id'),
+    )
+
+    id         = db.Column(db.Integer,   primary_key=True)
+    project_id = db.Column(db.Integer,   db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
+    user_id    = db.Column(db.Integer,   db.ForeignKey('user.id', ondelete='CASCADE'),    nullable=False)
+    text       = db.Column(db.Text,      nullable=False)
+    # generated at send time so clients can match the stored message
+    uuid       = db.Column(db.String(36), nullable=False)
+    created_at = db.Column(db.DateTime,  default=datetime.utcnow)
+
+    schema = Schema(
+        'id', 'project_id', 'user_id', 'text', 'uuid', datetime_field('created_at')
+    )
+
+    def serialize(self):
+        """Return a JSON-serializable representation of the chat message."""
+        return self.schema.dump_obj(self)
@@ -1,12 +1,17 @@
 from datetime import datetime
 from extensions import db
+from app.serializers import Schema, datetime_field
 
 class Collaborator(db.Model):
     __tablename__ = 'collaborator'
+    __table_args__ = (
+        db.Index('uq_collaborator_user_project', 'user_id', 'project_id', unique=True),
+        db.Index('ix_collaborator_project_id', 'project_id'),
+    )
 
     id          = db.Column(db.Integer,   primary_key=True)
-    user_id     = db.Column(db.Integer,   db.ForeignKey('user.id'),    nullable=False)
-    project_id  = db.Column(db.Integer,   db.ForeignKey('project.id'), nullable=False)
+    user_id     = db.Column(db.Integer,   db.ForeignKey('user.id', ondelete='CASCADE'),    nullable=False)
+    project_id  = db.Column(db.Integer,   db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
     role        = db.Column(db.String(50), default='member')
     created_at  = db.Column(db.DateTime,  default=datetime.utcnow)
 
@@ -14,11 +19,10 @@ class Collaborator(db.Model):
     user        = db.relationship('User',    back_populates='collaborations')
     project     = db.relationship('Project', back_populates='collaborators')
 
+    schema = Schema(
+        'id', 'user_id', 'project_id', 'role', datetime_field('created_at')
+    )
+
     def serialize(self):
-        return {
-            'id':          self.id,
-            'user_id':     self.user_id,
-            'project_id':  self.project_id,
-            'role':        self.role,
-            'created_at':  self.created_at.isoformat()
-        }
+        """Return a JSON-serializable representation of the collaborator."""
+        return self.schema.dump_obj(self)
@@ -2,33 +2,35 @@
 
 from datetime import datetime
 from extensions import db
+from app.serializers import Schema, datetime_field
 
 class Comment(db.Model):
     __tablename__ = 'comment'  # explicit table name
+    __table_args__ = (
+        db.Index('ix_comment_task_created', 'task_id', 'created_at'),
+        db.Index('ix_comment_user_id', 'user_id'),
+    )
 
     id         = db.Column(db.Integer,   primary_key=True)
-    task_id    = db.Column(db.Integer,   db.ForeignKey('task.id'), nullable=False)
-    user_id    = db.Column(db.Integer,   db.ForeignKey('user.id'), nullable=False)
+    task_id    = db.Column(db.Integer,   db.ForeignKey('task.id', ondelete='CASCADE'), nullable=False)
+    user_id    = db.Column(db.Integer,   db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     text       = db.Column(db.Text,      nullable=False)
     created_at = db.Column(db.DateTime,  default=datetime.utcnow)
 
     # Relationships
     task   = db.relationship(
         'Task',
-        back_populates='comments',
-        cascade='all, delete'
+        back_populates='comments'
     )
     author = db.relationship(
         'User',
         back_populates='comments'
     )
 
+    schema = Schema(
+        'id', 'task_id', 'user_id', 'text', datetime_field('created_at')
+    )
+
     def serialize(self):
         """Return a JSON-serializable representation of the comment."""
-        return {
-            'id':         self.id,
-            'task_id':    self.task_id,
-            'user_id':    self.user_id,
-            'text':       self.text,
-            'created_at': self.created_at.isoformat()
-        }
+        return self.schema.dump_obj(self)
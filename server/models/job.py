@@ -0,0 +1,27 @@
+# app/models/job.py
+
+from datetime import datetime
+from extensions import db
+
+class Job(db.Model):
+    """A unit of background work; see app.jobs."""
+    __tablename__ = 'job'
+    __table_args__ = (
+        # what workers claim: the oldest due job
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
+
+    id              = db.Column(db.Integer,     primary_key=True)
+    kind            = db.Column(db.String(100), nullable=False)
+    payload         = db.Column(db.JSON,        nullable=False, default=dict)
+    status          = db.Column(db.String(20),  nullable=False, default='queued')
+    attempts        = db.Column(db.Integer,     nullable=False, default=0)
+    max_attempts    = db.Column(db.Integer,     nullable=False, default=5)
+    # enqueueing the same key twice is a no-op
+    idempotency_key = db.Column(db.String(255), unique=True)
+    run_at          = db.Column(db.DateTime,    nullable=False, default=datetime.utcnow)
+    locked_by       = db.Column(db.String(100))
+    locked_at       = db.Column(db.DateTime)
+    last_error      = db.Column(db.Text)
+    created_at      = db.Column(db.DateTime,    default=datetime.utcnow)
+    finished_at     = db.Column(db.DateTime)
@@ -0,0 +1,13 @@
+# app/models/newsletter_subscription.py
+
+from datetime import datetime
+from extensions import db
+
+class NewsletterSubscription(db.Model):
+    __tablename__ = 'newsletter_subscription'
+
+    id          = db.Column(db.Integer,     primary_key=True)
+    # stored lower-cased; the unique index is what deduplicates subscribes
+    email       = db.Column(db.String(255), unique=True, nullable=False)
+    created_at  = db.Column(db.DateTime,    default=datetime.utcnow)
+    welcomed_at = db.Column(db.DateTime)
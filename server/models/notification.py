@@ -0,0 +1,34 @@
+# app/models/notification.py
+
+from datetime import datetime
+from extensions import db
+from app.serializers import Field, Schema, datetime_field
+
+class Notification(db.Model):
+    __tablename__ = 'notification'  # explicit table name
+    __table_args__ = (
+        # per-user feed, newest first
+        db.Index('ix_notification_user_id_id', 'user_id', 'id'),
+        # project purges and ON DELETE CASCADE
+        db.Index('ix_notification_project_id', 'project_id'),
+    )
+
+    id         = db.Column(db.Integer,    primary_key=True)
+    user_id    = db.Column(db.Integer,    db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    kind       = db.Column(db.String(30), nullable=False)
+    title      = db.Column(db.String(150), nullable=False)
+    message    = db.Column(db.Text,       nullable=False)
+    project_id = db.Column(db.Integer,    db.ForeignKey('project.id', ondelete='CASCADE'))
+    task_id    = db.Column(db.Integer)
+    read_at    = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime,   default=datetime.utcnow)
+
+    schema = Schema(
+        'id', 'kind', 'title', 'message', 'project_id', 'task_id',
+        Field('read', attr='read_at', convert=lambda read_at: read_at is not None),
+        datetime_field('created_at')
+    )
+
+    def serialize(self):
+        """Return a JSON-serializable representation of the notification."""
+        return self.schema.dump_obj(self)
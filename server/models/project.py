@@ -2,6 +2,7 @@
 
 from datetime import datetime
 from extensions import db
+from app.serializers import Schema, datetime_field
 
 class Project(db.Model):
     __tablename__ = 'project'  # explicit table name
@@ -9,31 +10,45 @@ class Project(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     name        = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text)
-    owner_id    = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    owner_id    = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
     created_at  = db.Column(db.DateTime, default=datetime.utcnow)
+    # bumped on every write to the project, its tasks, comments or collaborators (see app.etags)
+    revision    = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # highest change-feed seq whose tombstones have been pruned (see app.changes)
+    changes_floor = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # optimistic locking for ORM updates/deletes of the project row itself;
+    # unlike `revision` it doesn't move when tasks change
+    version     = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    # set when the project is deleted; queries stop seeing it at once and
+    # a background job purges it and its rows (see app.purge)
+    deleted_at  = db.Column(db.DateTime)
+
+    __mapper_args__ = {'version_id_col': version}
 
     # Relationships
     owner = db.relationship(
         'User',
         back_populates='projects'
     )
+    # passive_deletes: leave unloaded children to ON DELETE CASCADE
     tasks = db.relationship(
         'Task',
         back_populates='project',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
     collaborators = db.relationship(
         'Collaborator',
         back_populates='project',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+
+    schema = Schema(
+        'id', 'name', 'description', 'owner_id', datetime_field('created_at')
     )
 
     def serialize(self):
         """Return a JSON-serializable representation of the project."""
-        return {
-            'id':           self.id,
-            'name':         self.name,
-            'description':  self.description,
-            'owner_id':     self.owner_id,
-            'created_at':   self.created_at.isoformat()
-        }
+        return self.schema.dump_obj(self)
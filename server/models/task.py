@@ -1,9 +1,19 @@
 # app/models/task.py
 from datetime import datetime
 from extensions import db
+from app.serializers import Schema, datetime_field
 
 class Task(db.Model):
     __tablename__ = 'task'  # explicit table name
+    __table_args__ = (
+        # project task lists filtered by status / ordered by due date
+        db.Index('ix_task_project_status_due', 'project_id', 'status', 'due_date'),
+        # keyset pagination order used by get_tasks
+        db.Index('ix_task_project_created', 'project_id', 'created_at', 'id'),
+        db.Index('ix_task_assignee_status', 'assignee_id', 'status'),
+        # due-window range scans
+        db.Index('ix_task_due_status', 'due_date', 'status'),
+    )
 
     id          = db.Column(db.Integer, primary_key=True)
     title       = db.Column(db.String(150), nullable=False)
@@ -12,8 +22,8 @@ class Task(db.Model):
     due_date    = db.Column(db.DateTime)
     
     # FKs
-    assignee_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    project_id  = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    assignee_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'))
+    project_id  = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
     
     # timestamps
     created_at  = db.Column(db.DateTime, default=datetime.utcnow)
@@ -22,12 +32,16 @@ class Task(db.Model):
         default=datetime.utcnow,
         onupdate=datetime.utcnow
     )
+    # incremented by every ORM UPDATE, which only matches the version it
+    # read: a concurrent write makes the flush raise StaleDataError
+    version     = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     # relationships
     project     = db.relationship(
         'Project',
-        back_populates='tasks',
-        cascade='all, delete'
+        back_populates='tasks'
     )
     assignee    = db.relationship(
         'User',
@@ -39,15 +53,13 @@ class Task(db.Model):
         cascade='all, delete-orphan'
     )
 
+    # public fields; also drives the column lists and Row dumps in the routes
+    schema = Schema(
+        'id', 'title', 'description', 'status', datetime_field('due_date'),
+        'assignee_id', 'project_id', datetime_field('created_at'), datetime_field('updated_at'),
+        'version'
+    )
+
     def serialize(self):
-        return {
-            'id':            self.id,
-            'title':         self.title,
-            'description':   self.description,
-            'status':        self.status,
-            'due_date':      self.due_date.isoformat() if self.due_date else None,
-            'assignee_id':   self.assignee_id,
-            'project_id':    self.project_id,
-            'created_at':    self.created_at.isoformat(),
-            'updated_at':    self.updated_at.isoformat()
-        }
+        """Return a JSON-serializable representation of the task."""
+        return self.schema.dump_obj(self)
@@ -0,0 +1,17 @@
+# app/models/task_due_stats.py
+
+from extensions import db
+
+class TaskDueStats(db.Model):
+    """
+    Open (not done) tasks per (project, assignee, due day), so overdue
+    counts are a sum over past days instead of a scan of `task`. Derived
+    data, maintained alongside TaskStats.
+    """
+    __tablename__ = 'task_due_stats'  # explicit table name
+
+    project_id  = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    # 0 = unassigned
+    assignee_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    due_date    = db.Column(db.Date,    primary_key=True)
+    count       = db.Column(db.Integer, nullable=False, default=0)
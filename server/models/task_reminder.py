@@ -0,0 +1,17 @@
+# app/models/task_reminder.py
+
+from datetime import datetime
+from extensions import db
+
+class TaskReminder(db.Model):
+    """A due-date reminder already sent for a task; see app.reminders."""
+    __tablename__ = 'task_reminder'
+    __table_args__ = (
+        # reminders for past due dates are pruned each run
+        db.Index('ix_task_reminder_due_date', 'due_date'),
+    )
+
+    # keyed by the due date reminded about, so moving it re-arms the reminder
+    task_id  = db.Column(db.Integer,  db.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    due_date = db.Column(db.DateTime, primary_key=True)
+    sent_at  = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
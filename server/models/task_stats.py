@@ -0,0 +1,17 @@
+# app/models/task_stats.py
+
+from extensions import db
+
+class TaskStats(db.Model):
+    """
+    Task counts per (project, assignee, status), kept up to date by
+    app.stats on every task write. Derived data: `flask stats check`
+    recomputes it from `task` and reports (or repairs) any drift.
+    """
+    __tablename__ = 'task_stats'  # explicit table name
+
+    project_id  = db.Column(db.Integer,    primary_key=True, autoincrement=False)
+    # 0 = unassigned (primary key columns can't be NULL)
+    assignee_id = db.Column(db.Integer,    primary_key=True, autoincrement=False)
+    status      = db.Column(db.String(20), primary_key=True)
+    count       = db.Column(db.Integer,    nullable=False, default=0)
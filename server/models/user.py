@@ -1,7 +1,8 @@
 # app/models/user.py
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from extensions import db
+from app.serializers import Schema, datetime_field
+from app.passwords import hasher
 
 class User(db.Model):
     __tablename__ = 'user'  # explicit table name
@@ -10,45 +11,56 @@ class User(db.Model):
     first_name    = db.Column(db.String(150), nullable=False)
     last_name     = db.Column(db.String(150), nullable=False)
     email         = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
+    role          = db.Column(db.String(20), nullable=False, default='user', server_default='user')
+    # maintained by app.notifications so unread badges never need COUNT(*)
+    unread_notifications = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at    = db.Column(db.DateTime, default=datetime.utcnow)
+    # soft delete; the account and its rows are purged in the background (see app.purge)
+    deleted_at    = db.Column(db.DateTime)
 
-    # relationships
+    # relationships; passive_deletes leaves unloaded children to the
+    # foreign keys' ON DELETE actions
     projects       = db.relationship(
         'Project',
         back_populates='owner',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
+    # ON DELETE SET NULL: a departing assignee doesn't take the tasks along
     tasks          = db.relationship(
         'Task',
         back_populates='assignee',
-        cascade='all, delete-orphan'
+        passive_deletes=True
     )
     comments       = db.relationship(
         'Comment',
         back_populates='author',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
     collaborations = db.relationship(
         'Collaborator',
         back_populates='user',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
 
     def set_password(self, password):
         """Hash and store the given password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hasher.hash(password)
 
     def check_password(self, password):
         """Verify a plaintext password against the stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return hasher.verify(self.password_hash, password)
+
+    def is_admin(self):
+        return self.role == 'admin'
+
+    schema = Schema(
+        'id', 'first_name', 'last_name', 'email', 'role', datetime_field('created_at')
+    )
 
     def serialize(self):
         """Return a JSON-serializable representation of the user."""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'created_at': self.created_at.isoformat()
-        }
+        return self.schema.dump_obj(self)
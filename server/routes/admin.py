@@ -2,6 +2,7 @@ from flask_restful import Resource
 from models.user import User
 from extensions import db
 from app.utils import admin_required
+from app.purge import delete_user
 
 class AdminUserList(Resource):
     method_decorators = [admin_required]
@@ -9,7 +10,13 @@ class AdminUserList(Resource):
     def get(self):
         users = User.query.all()
         return [
-            {"id": u.id, "username": u.username, "email": u.email, "role": u.role}
+            {
+                "id": u.id,
+                "first_name": u.first_name,
+                "last_name": u.last_name,
+                "email": u.email,
+                "role": u.role
+            }
             for u in users
         ], 200
 
@@ -18,6 +25,7 @@ class AdminUserResource(Resource):
 
     def delete(self, user_id):
         user = User.query.get_or_404(user_id)
-        db.session.delete(user)
+        # soft delete; the account and its data are purged by a background job
+        delete_user(user)
         db.session.commit()
         return {"message": "User deleted."}, 200
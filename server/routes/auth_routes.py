@@ -1,10 +1,22 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token
 from extensions import db
 from models.user import User
+from app.passwords import hasher, HashingBusy
+from app.rate_limit import login_limiter, login_ip_limiter
+from app.cache_control import cache_policy
 
 auth_bp = Blueprint('auth_bp', __name__)
+cache_policy(auth_bp, no_store=True)
+
+def _too_many(retry_after, message):
+    resp = jsonify({'error': message})
+    resp.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return resp
+
+@auth_bp.errorhandler(HashingBusy)
+def hashing_busy(e):
+    return _too_many(1, 'Server busy, try again shortly'), 503
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -16,17 +28,22 @@ def signup():
     if missing:
         return jsonify({'error': f'Missing fields: {", ".join(missing)}'}), 400
 
-    # Prevent duplicate emails
-    if User.query.filter_by(email=data['email']).first():
+    # Prevent duplicate emails (a deleted account keeps its email until purged)
+    if User.query.filter_by(email=data['email']).execution_options(include_deleted=True).first():
         return jsonify({'error': 'User with this email already exists'}), 400
 
+    # signups hash too, so they share the per-IP budget with logins
+    retry = login_ip_limiter.hit(f'ip:{request.remote_addr}')
+    if retry:
+        return _too_many(retry, 'Too many attempts, try again later'), 429
+
     try:
         # Create and save the new user
         user = User(
             first_name    = data['first_name'],
             last_name     = data['last_name'],
             email         = data['email'],
-            password_hash = generate_password_hash(data['password'])
+            password_hash = hasher.hash(data['password'])
         )
         db.session.add(user)
         db.session.commit()
@@ -39,25 +56,49 @@ def signup():
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Email and password required'}), 400
     email    = data.get('email')
     password = data.get('password')
 
     # Validate input
     if not email or not password:
         return jsonify({'error': 'Email and password required'}), 400
+    if not isinstance(email, str) or not isinstance(password, str):
+        return jsonify({'error': 'Email and password must be strings'}), 400
+
+    # checked before any hashing so credential stuffing can't burn CPU
+    email_key = f'email:{email.strip().lower()}'
+    retry = max(
+        login_ip_limiter.hit(f'ip:{request.remote_addr}'),
+        login_limiter.hit(email_key)
+    )
+    if retry:
+        return _too_many(retry, 'Too many login attempts, try again later'), 429
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
+    if not user or not hasher.verify(user.password_hash, password):
         return jsonify({'error': 'Invalid credentials'}), 401
+    login_limiter.reset(email_key)
+
+    # transparently upgrade hashes made with older parameters
+    if hasher.needs_rehash(user.password_hash):
+        user.password_hash = hasher.hash(password)
+        db.session.commit()
 
-    token = create_access_token(identity=user.id)
+    # the role travels as a claim; admin checks also consult the cached user
+    token = create_access_token(
+        identity          = str(user.id),
+        additional_claims = {'role': user.role}
+    )
     return jsonify({
         'access_token': token,
         'user': {
             'id': user.id,
             'first_name': user.first_name,
             'last_name': user.last_name,
-            'email': user.email
+            'email': user.email,
+            'role': user.role
         }
     }), 200
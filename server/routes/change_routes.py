@@ -0,0 +1,64 @@
+from flask import Blueprint, abort, request, jsonify
+from flask_jwt_extended import jwt_required
+from extensions import db
+from models.project import Project
+from app.changes import read_changes
+from app.membership import project_member_required
+from app.etags import make_etag, not_modified, with_etag
+from app.pagination import PaginationError, decode_cursor, encode_cursor, parse_limit
+from app.cache_control import cache_policy
+
+change_bp = Blueprint('change_bp', __name__)
+cache_policy(change_bp, private=True, no_cache=True)
+
+DEFAULT_CHANGES_PAGE = 500
+MAX_CHANGES_PAGE     = 5000
+
+@change_bp.route('/projects/<int:project_id>/changes', methods=['GET'])
+@jwt_required()
+@project_member_required
+def get_changes(project_id):
+    """
+    Changes to a project's tasks, comments and collaborators since a sync.
+
+    Query params:
+      since   `revision` from the end of the previous sync (default 0: everything)
+      limit   changes per page
+      after   `next_cursor` from the previous page of this sync
+
+    Each change is {seq, entity, id, op, data}; an 'upsert' carries the
+    entity's current fields, a 'delete' is a tombstone with data null.
+    With `reset: true` tombstones the client needed have been pruned: it
+    should drop its copy of the project and rebuild it from this sync.
+    Once `next_cursor` is null, `revision` is the next sync's `since`.
+    """
+    args = request.args
+    try:
+        since = int(args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'since must be an integer'}), 400
+    try:
+        limit  = parse_limit(args.get('limit'), DEFAULT_CHANGES_PAGE, MAX_CHANGES_PAGE)
+        cursor = decode_cursor(args['after'], int) if args.get('after') else None
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # read before the log, so every change up to it is in this sync
+    project = db.session.execute(
+        db.select(Project.revision, Project.changes_floor).where(Project.id == project_id)
+    ).first()
+    if project is None:
+        abort(404)
+    etag   = make_etag('changes', project_id, project.revision, project.changes_floor)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    reset = since < project.changes_floor
+    changes, next_after = read_changes(project_id, 0 if reset else since, limit, cursor)
+    return with_etag((jsonify({
+        'changes':     changes,
+        'revision':    project.revision,
+        'reset':       reset,
+        'next_cursor': encode_cursor(*next_after) if next_after else None,
+    }), 200), etag)
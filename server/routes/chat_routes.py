@@ -1,7 +1,174 @@
-from flask import Blueprint, jsonify
-
-chat_bp = Blueprint('chat_bp', __name__)
-
-@chat_bp.route('/test', methods=['GET'])
-def test_chat():
-    return jsonify({'message': 'Chat route is working!'}), 200
+import math
+from flask import Blueprint, Response, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from extensions import db
+from models.chat_message import ChatMessage
+from app.utils import current_user_id
+from app.membership import project_member_required
+from app.broker import broker, sse_format
+from app.chat import chat_channel, chat_writer, insert_messages, message_data, message_entry
+from app.pagination import PaginationError, parse_limit
+from app.cache_control import cache_policy
+
+chat_bp = Blueprint('chat_bp', __name__)
+cache_policy(chat_bp, private=True, no_store=True)
+
+MAX_MESSAGE_LENGTH = 4000
+REPLAY_LIMIT       = 500
+
+@chat_bp.route('/test', methods=['GET'])
+def test_chat():
+    return jsonify({'message': 'Chat route is working!'}), 200
+
+def _dump_messages(stmt):
+    dump = ChatMessage.schema.dumper()
+    return [dump(row) for row in db.session.execute(stmt)]
+
+def _messages_after(project_id, after, limit):
+    """Oldest-first messages with id > after, serialized."""
+    return _dump_messages(
+        db.select(*ChatMessage.schema.columns())
+          .where(ChatMessage.project_id == project_id, ChatMessage.id > after)
+          .order_by(ChatMessage.id)
+          .limit(limit)
+    )
+
+@chat_bp.route('/projects/<int:project_id>/messages', methods=['POST'])
+@jwt_required()
+@project_member_required
+def send_message(project_id):
+    """
+    Post a message to the project's channel.
+
+    Returns 201 with the stored message in sync durability mode, or 202
+    with its uuid once it's queued for the background writer; either way
+    it reaches subscribers (with its id) as soon as it's committed.
+    """
+    text = (request.get_json(silent=True) or {}).get('text')
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({'error': 'text is required'}), 400
+    if len(text) > MAX_MESSAGE_LENGTH:
+        return jsonify({'error': f'text must be at most {MAX_MESSAGE_LENGTH} characters'}), 400
+
+    entry = message_entry(project_id, current_user_id(), text)
+    if not chat_writer.durable and chat_writer.submit(entry):
+        return jsonify({**message_data(None, entry), 'status': 'queued'}), 202
+
+    [message_id] = insert_messages([entry])
+    db.session.commit()
+    return jsonify({**message_data(message_id, entry), 'status': 'stored'}), 201
+
+@chat_bp.route('/projects/<int:project_id>/messages', methods=['GET'])
+@jwt_required()
+@project_member_required
+def get_messages(project_id):
+    """
+    Message history, keyset-paginated on id.
+
+    Query params:
+      limit   page size (default 50)
+      before  newest-first page of messages older than this id
+      after   oldest-first page of messages newer than this id (catch-up)
+    """
+    try:
+        limit  = parse_limit(request.args.get('limit'), default=50, maximum=500)
+        before = request.args.get('before', type=int)
+        after  = request.args.get('after', type=int)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    if before is not None and after is not None:
+        return jsonify({'error': 'use either before or after, not both'}), 400
+
+    if after is not None:
+        messages = _messages_after(project_id, after, limit)
+        return jsonify({
+            'messages':   messages,
+            'next_after': messages[-1]['id'] if len(messages) == limit else None
+        }), 200
+
+    stmt = db.select(*ChatMessage.schema.columns()).where(ChatMessage.project_id == project_id)
+    if before is not None:
+        stmt = stmt.where(ChatMessage.id < before)
+    messages = _dump_messages(stmt.order_by(ChatMessage.id.desc()).limit(limit))
+    return jsonify({
+        'messages':    messages,
+        'next_before': messages[-1]['id'] if len(messages) == limit else None
+    }), 200
+
+@chat_bp.route('/projects/<int:project_id>/messages/poll', methods=['GET'])
+@jwt_required()
+@project_member_required
+def poll_messages(project_id):
+    """
+    Long-poll for messages newer than ?after=<id>.
+
+    Answers immediately if any are stored already, otherwise waits up to
+    ?timeout seconds (capped by CHAT_POLL_TIMEOUT) for the next one.
+    Pass the returned cursor as the next request's ``after``.
+    """
+    after   = request.args.get('after', 0, type=int)
+    cap     = current_app.config.get('CHAT_POLL_TIMEOUT', 25)
+    timeout = request.args.get('timeout', cap, type=float)
+    # like an unparsable value, nan (which slips past min/max) means the cap
+    timeout = min(max(timeout, 0), cap) if math.isfinite(timeout) else cap
+
+    # subscribe before querying so nothing committed in between is missed
+    with broker.subscribe(chat_channel(project_id)) as sub:
+        messages = _messages_after(project_id, after, REPLAY_LIMIT)
+        if not messages:
+            db.session.remove()
+            event = sub.get(timeout=timeout)
+            while event is not None:
+                if event['id'] > after:
+                    messages.append(event['data'])
+                event = sub.get(timeout=0)
+
+    return jsonify({
+        'messages': messages,
+        'cursor':   messages[-1]['id'] if messages else after
+    }), 200
+
+@chat_bp.route('/projects/<int:project_id>/messages/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+@project_member_required
+def stream_messages(project_id):
+    """
+    Server-Sent Events stream of the project's chat.
+
+    A reconnecting EventSource sends Last-Event-ID (or pass ?after=<id>);
+    messages stored since then are replayed before live ones. Emits
+    `resync` if events had to be dropped for a slow client, and a comment
+    heartbeat while idle.
+    """
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', type=int)
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+
+    sub    = broker.subscribe(chat_channel(project_id))
+    replay = _messages_after(project_id, after, REPLAY_LIMIT) if after is not None else []
+    # don't hold a DB connection for the lifetime of the stream
+    db.session.remove()
+
+    def stream():
+        last_id  = after or 0
+        replayed = {m['id'] for m in replay}
+        with sub:
+            for message in replay:
+                last_id = message['id']
+                yield sse_format({'event': 'message', 'id': last_id, 'data': message})
+            while not sub.closed:
+                event = sub.get(timeout=heartbeat)
+                if sub.dropped:
+                    dropped, sub.dropped = sub.dropped, 0
+                    yield sse_format({'event': 'resync', 'data': {'dropped': dropped, 'after': last_id}})
+                if event is None:
+                    yield ': ping\n\n'
+                elif event['id'] not in replayed:
+                    last_id = max(last_id, event['id'])
+                    yield sse_format(event)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control':     'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from extensions import db
 from models.user import User
 from models.project import Project
 from models.collaborator import Collaborator
+from app.utils import current_user_id
+from app.notifications import notification_entry, notify
+from app.cache_control import cache_policy
 
 # Blueprint name must match the variable below
 collaborator_bp = Blueprint('collaborator_bp', __name__)
+cache_policy(collaborator_bp, private=True, no_cache=True)
 
 @collaborator_bp.route('/collaborators', methods=['POST'])
 @jwt_required()
@@ -27,7 +31,7 @@ def add_collaborator():
         return jsonify({'error': 'Project not found'}), 404
 
     # Only project owner can add collaborators
-    if project.owner_id != get_jwt_identity():
+    if project.owner_id != current_user_id():
         return jsonify({'error': 'Only project owner can add collaborators'}), 403
 
     existing = Collaborator.query.filter_by(
@@ -39,6 +43,10 @@ def add_collaborator():
 
     collaborator = Collaborator(user_id=user.id, project_id=project.id)
     db.session.add(collaborator)
+    notify([notification_entry(
+        user.id, 'collaborator_added', 'Added to project',
+        f'You were added to "{project.name}".', project.id
+    )], actor_id=current_user_id())
     db.session.commit()
 
     return jsonify({'message': 'Collaborator added'}), 201
@@ -1,24 +1,74 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, abort, request, jsonify
+from flask_jwt_extended import jwt_required
 from extensions import db
-from models.task import Task
 from models.comment import Comment
+from models.task import Task
+from models.project import Project
+from models.user import User
+from app.membership import require_project_access
+from app.etags import make_etag, not_modified, task_project_revision, with_etag
+from app.utils import current_user_id
+from app.notifications import notification_entry, notify
+from app.pagination import PaginationError, decode_cursor, encode_cursor, keyset_filter, parse_limit
+from app.cache_control import cache_policy
 
 comment_bp = Blueprint('comment_bp', __name__)
+cache_policy(comment_bp, private=True, no_cache=True)
+
+DEFAULT_COMMENT_PAGE = 50
+MAX_COMMENT_PAGE     = 500
 
 @comment_bp.route('/comments/<int:task_id>', methods=['GET'])
 @jwt_required()
 def get_comments(task_id):
-    Task.query.get_or_404(task_id)
-    comments = Comment.query.filter_by(task_id=task_id).all()
-    return jsonify([
-        {
-            'id': c.id,
-            'user_id': c.user_id,      # or c.author_id if your model uses that
-            'text': c.text,
-            'timestamp': c.timestamp.isoformat()
-        } for c in comments
-    ]), 200
+    """
+    A task's comments, oldest first, each with its author embedded.
+
+    Query params:
+      limit   page size (default 50, max 500)
+      after   opaque cursor taken from a previous page's `next_cursor`
+    """
+    project_id, revision = task_project_revision(task_id)
+    require_project_access(project_id)
+    etag   = make_etag('comments', task_id, revision)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    try:
+        limit  = parse_limit(request.args.get('limit'), default=DEFAULT_COMMENT_PAGE, maximum=MAX_COMMENT_PAGE)
+        cursor = decode_cursor(request.args['after']) if request.args.get('after') else None
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # walks ix_comment_task_created in order; authors come from the same
+    # statement instead of a lazy load per comment
+    stmt = (
+        db.select(*Comment.schema.columns(), User.first_name, User.last_name)
+          .join(User, User.id == Comment.user_id)
+          .where(Comment.task_id == task_id)
+    )
+    if cursor:
+        stmt = stmt.where(keyset_filter(Comment.created_at, Comment.id, cursor))
+    rows = db.session.execute(
+        stmt.order_by(Comment.created_at.nulls_first(), Comment.id).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows        = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    dump     = Comment.schema.dumper()
+    comments = []
+    for row in rows:
+        comment = dump(row)
+        comment['author'] = {'id': row.user_id, 'first_name': row.first_name, 'last_name': row.last_name}
+        comments.append(comment)
+    return with_etag((jsonify({
+        'comments':    comments,
+        'next_cursor': next_cursor
+    }), 200), etag)
 
 @comment_bp.route('/comments', methods=['POST'])
 @jwt_required()
@@ -30,12 +80,26 @@ def add_comment():
     if not task_id or not text:
         return jsonify({'error': 'task_id and text required'}), 400
 
-    Task.query.get_or_404(task_id)
+    task = db.session.execute(
+        db.select(Task.title, Task.assignee_id, Task.project_id, Project.owner_id)
+          .join(Project, Task.project_id == Project.id)
+          .where(Task.id == task_id)
+    ).first()
+    if task is None:
+        abort(404)
+    require_project_access(task.project_id)
+
+    user_id = current_user_id()
     comment = Comment(
         task_id = task_id,
-        user_id = get_jwt_identity(),
+        user_id = user_id,
         text    = text
     )
     db.session.add(comment)
+    notify([
+        notification_entry(recipient, 'comment_added', 'New comment',
+                           f'New comment on "{task.title}".', task.project_id, task_id)
+        for recipient in {task.assignee_id, task.owner_id}
+    ], actor_id=user_id)
     db.session.commit()
     return jsonify({'id': comment.id, 'message': 'Comment added'}), 201
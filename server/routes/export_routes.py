@@ -0,0 +1,111 @@
+import csv
+import io
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from extensions import db
+from models.task import Task
+from models.comment import Comment
+from models.collaborator import Collaborator
+from app.queries import get_project_or_404
+from app.membership import project_member_required
+from app.cache_control import cache_policy
+
+export_bp = Blueprint('export_bp', __name__)
+cache_policy(export_bp, private=True, no_store=True)
+
+# rows fetched from the DB cursor per round trip
+YIELD_PER  = 1000
+# rows buffered before a chunk is flushed to the client
+CHUNK_ROWS = 500
+
+EXPORT_SCHEMAS = {
+    'tasks':         Task.schema,
+    'comments':      Comment.schema,
+    'collaborators': Collaborator.schema,
+}
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv':    'text/csv',
+}
+
+
+def _export_query(resource, project_id):
+    schema = EXPORT_SCHEMAS[resource]
+    stmt   = db.select(*schema.columns())
+    if resource == 'comments':
+        stmt = stmt.join(Task, Comment.task_id == Task.id).where(Task.project_id == project_id)
+    elif resource == 'tasks':
+        stmt = stmt.where(Task.project_id == project_id)
+    else:
+        stmt = stmt.where(Collaborator.project_id == project_id)
+    # yield_per keeps only one batch of rows alive at a time
+    return stmt.order_by(schema.model.id).execution_options(yield_per=YIELD_PER)
+
+
+def _iter_rows(resource, project_id):
+    dump = EXPORT_SCHEMAS[resource].dumper()
+    for row in db.session.execute(_export_query(resource, project_id)):
+        yield dump(row)
+
+
+def _ndjson_stream(project, resources):
+    dumps = current_app.json.dumps
+    yield dumps({'type': 'project', **project.serialize()}) + '\n'
+    for resource in resources:
+        kind  = resource[:-1]
+        chunk = []
+        for record in _iter_rows(resource, project.id):
+            chunk.append(dumps({'type': kind, **record}))
+            if len(chunk) >= CHUNK_ROWS:
+                yield '\n'.join(chunk) + '\n'
+                chunk = []
+        if chunk:
+            yield '\n'.join(chunk) + '\n'
+
+
+def _csv_stream(project_id, resource):
+    buf    = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_SCHEMAS[resource].names)
+    writer.writeheader()
+    for i, record in enumerate(_iter_rows(resource, project_id), 1):
+        writer.writerow(record)
+        if i % CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+@export_bp.route('/projects/<int:project_id>/export', methods=['GET'])
+@jwt_required()
+@project_member_required
+def export_project(project_id):
+    """
+    Stream a project's tasks, comments and collaborators.
+
+    Query params:
+      format    ndjson (default) or csv
+      resource  tasks, comments or collaborators; ndjson exports all of
+                them when omitted, csv defaults to tasks
+    """
+    fmt      = request.args.get('format', 'ndjson')
+    resource = request.args.get('resource')
+    if fmt not in FORMATS:
+        return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+    if resource is not None and resource not in EXPORT_SCHEMAS:
+        return jsonify({'error': f'Unknown resource: {resource}'}), 400
+
+    project = get_project_or_404(project_id)
+
+    if fmt == 'csv':
+        body     = _csv_stream(project.id, resource or 'tasks')
+        filename = f'project-{project.id}-{resource or "tasks"}.csv'
+    else:
+        body     = _ndjson_stream(project, [resource] if resource else list(EXPORT_SCHEMAS))
+        filename = f'project-{project.id}.ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
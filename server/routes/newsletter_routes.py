@@ -1,7 +1,13 @@
+import re
 from flask import Blueprint, request, jsonify
 from extensions import db
+from app.cache_control import cache_policy
+from app.newsletter import subscribe
 
 newsletter_bp = Blueprint('newsletter_bp', __name__)
+cache_policy(newsletter_bp, no_store=True)
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
 
 @newsletter_bp.route('/newsletter', methods=['POST'])
 def subscribe_newsletter():
@@ -10,10 +16,13 @@ def subscribe_newsletter():
 
     if not email:
         return jsonify({'error': 'Email required'}), 400
+    email = str(email).strip().lower()
+    if len(email) > 255 or not EMAIL_RE.match(email):
+        return jsonify({'error': 'Invalid email'}), 400
 
-    # TODO: Persist subscription
-    # sub = Newsletter(email=email)
-    # db.session.add(sub)
-    # db.session.commit()
+    # the welcome email is sent by a background job; a repeat subscribe
+    # gets the same answer without sending it again
+    created = subscribe(email)
+    db.session.commit()
 
-    return jsonify({'message': 'Subscribed successfully'}), 201
+    return jsonify({'message': 'Subscribed successfully'}), 201 if created else 200
@@ -1,11 +1,91 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from extensions import db
+from models.notification import Notification
+from app.utils import current_user_id
+from app.broker import broker, sse_format
+from app.notifications import mark_read, unread_count, user_channel
+from app.pagination import PaginationError, parse_limit
+from app.cache_control import cache_policy
 
 notification_bp = Blueprint('notification_bp', __name__)
+cache_policy(notification_bp, private=True, no_store=True)
 
 @notification_bp.route('/notifications', methods=['GET'])
+@jwt_required()
 def get_notifications():
-    sample = [
-        {'id': 1, 'title': 'Welcome!',        'message': 'Thanks for joining TaskFlow.'},
-        {'id': 2, 'title': 'Task Reminder',  'message': 'Task XYZ is due tomorrow.'}
-    ]
-    return jsonify(sample), 200
+    """
+    Newest-first notification feed.
+
+    Query params:
+      limit   page size (default 50)
+      before  only return notifications with a smaller id
+      unread  when "1", only unread notifications
+    """
+    user_id = current_user_id()
+    try:
+        limit  = parse_limit(request.args.get('limit'), default=50, maximum=200)
+        before = request.args.get('before', type=int)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = db.select(*Notification.schema.columns()).where(Notification.user_id == user_id)
+    if before:
+        stmt = stmt.where(Notification.id < before)
+    if request.args.get('unread') == '1':
+        stmt = stmt.where(Notification.read_at.is_(None))
+    dump          = Notification.schema.dumper()
+    notifications = [dump(row) for row in db.session.execute(stmt.order_by(Notification.id.desc()).limit(limit))]
+
+    return jsonify({
+        'notifications': notifications,
+        'unread_count':  unread_count(user_id),
+        'next_before':   notifications[-1]['id'] if len(notifications) == limit else None
+    }), 200
+
+@notification_bp.route('/notifications/read', methods=['POST'])
+@jwt_required()
+def read_notifications():
+    """Mark notifications read: {"ids": [...]} or an empty body for all."""
+    ids = (request.get_json(silent=True) or {}).get('ids')
+    if ids is not None and not (isinstance(ids, list) and all(isinstance(i, int) for i in ids)):
+        return jsonify({'error': 'ids must be a list of integers'}), 400
+
+    count = mark_read(current_user_id(), ids)
+    db.session.commit()
+    return jsonify({'unread_count': count}), 200
+
+@notification_bp.route('/notifications/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_notifications():
+    """
+    Server-Sent Events stream of the caller's notifications.
+
+    EventSource can't send headers, so the token may also be passed as
+    ?jwt=<token>. Emits `unread` (current count) on connect, then
+    `notification` and `unread` events as they happen, `resync` if events
+    had to be dropped, and a comment heartbeat while idle.
+    """
+    user_id   = current_user_id()
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+
+    # subscribe before reading the count so nothing falls in between
+    sub   = broker.subscribe(user_channel(user_id))
+    count = unread_count(user_id)
+    # don't hold a DB connection for the lifetime of the stream
+    db.session.remove()
+
+    def stream():
+        with sub:
+            yield sse_format({'event': 'unread', 'data': {'unread_count': count}})
+            while not sub.closed:
+                event = sub.get(timeout=heartbeat)
+                if sub.dropped:
+                    dropped, sub.dropped = sub.dropped, 0
+                    yield sse_format({'event': 'resync', 'data': {'dropped': dropped}})
+                yield sse_format(event) if event is not None else ': ping\n\n'
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control':     'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
@@ -1,10 +1,20 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, abort, request, jsonify
+from flask_jwt_extended import jwt_required
 from extensions import db
 from models.project import Project
 from models.task import Task
+from app.membership import membership, project_member_required
+from app.queries import comment_counts
+from app.purge import delete_project as soft_delete_project
+from app.utils import current_user_id
+from app.etags import make_etag, not_modified, project_revision, with_etag
+from app.cache_control import cache_policy
 
 project_bp = Blueprint('project_bp', __name__)
+cache_policy(project_bp, private=True, no_cache=True)
+
+PROJECT_FIELDS      = ('id', 'name', 'description')
+PROJECT_TASK_FIELDS = ('id', 'title', 'description', 'status')
 
 @project_bp.route('/projects', methods=['POST'])
 @jwt_required()
@@ -14,7 +24,7 @@ def create_project():
     if not name:
         return jsonify({'error': 'Project name required'}), 400
 
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     proj = Project(
         name       = name,
         description= data.get('description'),
@@ -27,33 +37,65 @@ def create_project():
 @project_bp.route('/projects', methods=['GET'])
 @jwt_required()
 def get_projects():
-    user_id  = get_jwt_identity()
-    projects = Project.query.filter(
-        (Project.owner_id == user_id) |
-        (Project.members.any(id=user_id))
+    user_id     = current_user_id()
+    project_ids = membership.project_ids(user_id)
+    if not project_ids:
+        return jsonify([]), 200
+
+    revisions = db.session.execute(
+        db.select(Project.id, Project.revision)
+          .where(Project.id.in_(project_ids))
+          .order_by(Project.id)
     ).all()
-    return jsonify([
-        {'id': p.id, 'name': p.name, 'description': p.description}
-        for p in projects
-    ]), 200
+    etag = make_etag('projects', user_id, *(f'{pid}.{rev}' for pid, rev in revisions))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    dump = Project.schema.dumper(PROJECT_FIELDS)
+    rows = db.session.execute(
+        db.select(*Project.schema.columns(PROJECT_FIELDS))
+          .where(Project.id.in_(project_ids))
+          .order_by(Project.id)
+    )
+    return with_etag((jsonify([dump(row) for row in rows]), 200), etag)
 
 @project_bp.route('/projects/<int:project_id>', methods=['GET'])
 @jwt_required()
+@project_member_required
 def get_project(project_id):
-    proj  = Project.query.get_or_404(project_id)
-    tasks = Task.query.filter_by(project_id=project_id).all()
-    return jsonify({
-        'project': {
-            'id': proj.id,
-            'name': proj.name,
-            'description': proj.description
-        },
-        'tasks': [
-            {
-                'id': t.id,
-                'title': t.title,
-                'description': t.description,
-                'status': t.status
-            } for t in tasks
-        ]
-    }), 200
+    etag   = make_etag('project', project_id, project_revision(project_id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    proj = db.session.execute(
+        db.select(*Project.schema.columns(PROJECT_FIELDS)).where(Project.id == project_id)
+    ).first()
+    if proj is None:
+        abort(404)
+    tasks = db.session.execute(
+        db.select(*Task.schema.columns(PROJECT_TASK_FIELDS))
+          .where(Task.project_id == project_id)
+          .order_by(Task.id)
+    )
+    dump_task = Task.schema.dumper(PROJECT_TASK_FIELDS)
+    counts    = comment_counts(db.select(Task.id).where(Task.project_id == project_id))
+    return with_etag((jsonify({
+        'project': Project.schema.dumper(PROJECT_FIELDS)(proj),
+        'tasks':   [{**dump_task(row), 'comment_count': counts.get(row.id, 0)} for row in tasks]
+    }), 200), etag)
+
+@project_bp.route('/projects/<int:project_id>', methods=['DELETE'])
+@jwt_required()
+@project_member_required
+def delete_project(project_id):
+    """Delete a project (owner only). It disappears at once; its data is purged in the background."""
+    proj = db.session.get(Project, project_id)
+    if proj is None:
+        abort(404)
+    if proj.owner_id != current_user_id():
+        return jsonify({'error': 'Only the project owner can delete it'}), 403
+    soft_delete_project(proj)
+    db.session.commit()
+    return jsonify({'message': 'Project deleted'}), 200
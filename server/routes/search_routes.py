@@ -0,0 +1,62 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from models.task import Task
+from app.utils import current_user_id
+from app.membership import membership
+from app.pagination import PaginationError, decode_cursor, encode_cursor, parse_limit
+from app.search import search_tasks
+from app.cache_control import cache_policy
+
+search_bp = Blueprint('search_bp', __name__)
+cache_policy(search_bp, private=True, no_cache=True)
+
+@search_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search():
+    """
+    Ranked full-text search over tasks (title, description and comment
+    text) in every project the caller owns or collaborates on.
+
+    Query params:
+      q           search text; all words must match, the last as a prefix
+      status      exact task status
+      assignee    assignee user id
+      due_before  ISO date/datetime; tasks due strictly before it
+      limit       page size (default 20)
+      cursor      next_cursor from the previous page
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit  = parse_limit(request.args.get('limit'), default=20, maximum=100)
+        cursor = request.args.get('cursor')
+        cursor = decode_cursor(cursor, float) if cursor else None
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    assignee = request.args.get('assignee')
+    if assignee is not None and not assignee.isdigit():
+        return jsonify({'error': 'assignee must be a user id'}), 400
+    due_before = request.args.get('due_before')
+    if due_before is not None:
+        try:
+            due_before = datetime.fromisoformat(due_before)
+        except ValueError:
+            return jsonify({'error': 'due_before must be an ISO date'}), 400
+
+    rows = search_tasks(
+        q,
+        membership.project_ids(current_user_id()),
+        status=request.args.get('status'),
+        assignee_id=int(assignee) if assignee is not None else None,
+        due_before=due_before,
+        cursor=cursor,
+        limit=limit,
+    )
+    dump = Task.schema.dumper()
+    return jsonify({
+        'results':     [{**dump(row), 'score': row.score} for row in rows],
+        'next_cursor': encode_cursor(rows[-1].score, rows[-1].id) if len(rows) == limit else None
+    }), 200
@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app.utils import current_user_id
+from app.queries import ensure_project
+from app.membership import membership, project_member_required
+from app.stats import project_stats, user_dashboard
+from app.cache_control import cache_policy
+
+stats_bp = Blueprint('stats_bp', __name__)
+cache_policy(stats_bp, private=True, no_cache=True)
+
+@stats_bp.route('/projects/<int:project_id>/stats', methods=['GET'])
+@jwt_required()
+@project_member_required
+def get_project_stats(project_id):
+    """Task counts by status, open and overdue totals, and the same per assignee."""
+    ensure_project(project_id)
+    stats = project_stats([project_id])[project_id]
+    return jsonify({'project_id': project_id, **stats}), 200
+
+@stats_bp.route('/me/dashboard', methods=['GET'])
+@jwt_required()
+def get_dashboard():
+    """Summary of every project the caller can access, plus their own workload."""
+    user_id = current_user_id()
+    return jsonify(user_dashboard(user_id, membership.project_ids(user_id))), 200
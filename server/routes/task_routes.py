@@ -1,45 +1,151 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from flask_jwt_extended import jwt_required
+from sqlalchemy.orm.exc import StaleDataError
 from extensions import db
-from models.project import Project
 from models.task import Task
+from models.comment import Comment
+from models.task_reminder import TaskReminder
+from app.queries import comment_counts, ensure_project, get_task_or_404
+from app.membership import project_member_required
+from app.etags import (
+    bump_revision, if_match_failed, make_etag, not_modified, project_revision, version_etag, with_etag
+)
+from app.changes import DELETE, UPSERT, log_changes
+from app.notifications import notification_entry, notify
+from app.stats import StatsDeltas, apply_deltas, task_row_deltas
+from app.utils import current_user_id
+from app.pagination import PaginationError, decode_cursor, encode_cursor, keyset_filter, parse_limit
+from app.cache_control import cache_policy
 
 # prefix = /api/projects
 task_bp = Blueprint('task_bp', __name__, url_prefix='/api/projects')
+cache_policy(task_bp, private=True, no_cache=True)
+
+DEFAULT_TASK_FIELDS = ('id', 'title', 'description', 'status', 'due_date', 'assignee_id', 'version', 'comment_count')
+# not Task columns; filled in after the page is read
+COMPUTED_FIELDS     = ('comment_count',)
+UPDATABLE_FIELDS    = ('title', 'description', 'status', 'due_date', 'assignee_id')
+
+MAX_BATCH_SIZE = 10000
+# a PUT re-reads and re-checks the task this often when concurrent
+# writers keep committing between its read and its write
+MAX_UPDATE_ATTEMPTS = 3
+
+def _parse_due_date(value):
+    """ISO-8601 string (or null) from a request body -> datetime; raises ValueError."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError('due_date must be an ISO-8601 datetime')
+
+def _task_notifications(project_id, task_id, title, old_assignee, new_assignee):
+    """Notification entries for a task whose assignee went from old to new."""
+    if not new_assignee:
+        return []
+    if new_assignee != old_assignee:
+        return [notification_entry(new_assignee, 'task_assigned', 'Task assigned',
+                                   f'You were assigned "{title}".', project_id, task_id)]
+    return [notification_entry(new_assignee, 'task_updated', 'Task updated',
+                               f'"{title}" was updated.', project_id, task_id)]
 
 @task_bp.route('/<int:project_id>/tasks', methods=['GET'])
 @jwt_required()
+@project_member_required
 def get_tasks(project_id):
-    Project.query.get_or_404(project_id)
-    tasks = Task.query.filter_by(project_id=project_id).all()
-    return jsonify([
-        {
-            'id': t.id,
-            'title': t.title,
-            'description': t.description,
-            'status': t.status,
-            'due_date': t.due_date.isoformat() if t.due_date else None,
-            'assignee_id': t.assignee_id
-        } for t in tasks
-    ]), 200
+    """
+    List a project's tasks.
+
+    Query params:
+      fields  comma-separated Task.schema field names (plus comment_count);
+              only these are SELECTed
+      limit   page size, switches the response to keyset-paginated mode
+      after   opaque cursor taken from a previous page's `next_cursor`
+    """
+    etag   = make_etag('tasks', project_id, project_revision(project_id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    args = request.args
+    try:
+        fields    = Task.schema.parse_fields(args.get('fields'), DEFAULT_TASK_FIELDS, extra=COMPUTED_FIELDS)
+        paginated = 'limit' in args or 'after' in args
+        limit     = parse_limit(args.get('limit'))
+        cursor    = decode_cursor(args['after']) if args.get('after') else None
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    with_counts = 'comment_count' in fields
+    fields      = tuple(f for f in fields if f not in COMPUTED_FIELDS)
+
+    # the cursor columns are always selected so the next cursor can be built
+    columns = Task.schema.columns(fields)
+    dump    = Task.schema.dumper(fields)
+    columns += [Task.created_at.label('_cursor_created_at'), Task.id.label('_cursor_id')]
+
+    def dump_all(rows):
+        records = [dump(row) for row in rows]
+        if with_counts:
+            # one grouped count for the whole page; a whole listing counts
+            # by project rather than sending every id back
+            counts = comment_counts(
+                [row._cursor_id for row in rows] if paginated
+                else db.select(Task.id).where(Task.project_id == project_id)
+            )
+            for record, row in zip(records, rows):
+                record['comment_count'] = counts.get(row._cursor_id, 0)
+        return records
+
+    stmt = db.select(*columns).where(Task.project_id == project_id)
+    if not paginated:
+        return with_etag((jsonify(dump_all(db.session.execute(stmt).all())), 200), etag)
+
+    if cursor:
+        stmt = stmt.where(keyset_filter(Task.created_at, Task.id, cursor))
+    stmt = stmt.order_by(Task.created_at.nulls_first(), Task.id).limit(limit + 1)
+    rows = db.session.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last._cursor_created_at, last._cursor_id)
+
+    return with_etag((jsonify({
+        'tasks':       dump_all(rows),
+        'next_cursor': next_cursor
+    }), 200), etag)
 
 @task_bp.route('/<int:project_id>/tasks', methods=['POST'])
 @jwt_required()
+@project_member_required
 def create_task(project_id):
-    Project.query.get_or_404(project_id)
+    ensure_project(project_id)
     data  = request.get_json() or {}
     title = data.get('title')
     if not title:
         return jsonify({'error': 'Title required'}), 400
+    try:
+        due_date = _parse_due_date(data.get('due_date'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     task = Task(
         title       = title,
         description = data.get('description'),
-        due_date    = data.get('due_date'),
+        due_date    = due_date,
         assignee_id = data.get('assignee_id'),
         project_id  = project_id
     )
     db.session.add(task)
+    db.session.flush()
+    notify(
+        _task_notifications(project_id, task.id, task.title, None, task.assignee_id),
+        actor_id=current_user_id()
+    )
     db.session.commit()
     return jsonify({
         'id': task.id,
@@ -47,23 +153,266 @@ def create_task(project_id):
         'status': task.status
     }), 201
 
+def _task_conflicts(task, changes, base):
+    """
+    Fields in ``changes`` that someone else changed since the client read
+    ``base`` (its values as last seen): the current value differs both
+    from the client's base and from what the client wants to write.
+    """
+    return [
+        f for f, value in changes.items()
+        if getattr(task, f) != value and (f not in base or base[f] != getattr(task, f))
+    ]
+
+def _stale(task, status, error, **extra):
+    resp = jsonify({'error': error, 'version': task.version, **extra})
+    resp.set_etag(version_etag('task', task.id, task.version))
+    return resp, status
+
 @task_bp.route('/<int:project_id>/tasks/<int:task_id>', methods=['PUT'])
 @jwt_required()
+@project_member_required
 def update_task(project_id, task_id):
-    Project.query.get_or_404(project_id)
-    task = Task.query.get_or_404(task_id)
-    data = request.get_json() or {}
-    for f in ('title','description','status','due_date','assignee_id'):
-        if f in data:
-            setattr(task, f, data[f])
-    db.session.commit()
-    return jsonify({'message': 'Task updated'}), 200
+    """
+    Update some of a task's fields.
+
+    With `If-Match: <the task's ETag>` the update only applies to that
+    version. Against a newer version it fails with 412, unless the body
+    has `base`, the values of the changed fields as the client last saw
+    them: then fields nobody else touched since are merged in, and it's
+    409 with the current values only when another writer changed the
+    same fields. Without If-Match the fields are written to whatever
+    version is current. The response carries the new version and ETag.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object'}), 400
+    base = data.get('base') or {}
+    if not isinstance(base, dict):
+        return jsonify({'error': 'base must be an object'}), 400
+    try:
+        for values in (data, base):
+            if 'due_date' in values:
+                values['due_date'] = _parse_due_date(values['due_date'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    changes = {f: data[f] for f in UPDATABLE_FIELDS if f in data}
+
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        task = get_task_or_404(project_id, task_id)
+        if if_match_failed(version_etag('task', task.id, task.version)):
+            if 'base' not in data:
+                return _stale(task, 412, 'Task was modified')
+            conflicts = _task_conflicts(task, changes, base)
+            if conflicts:
+                return _stale(task, 409, 'Conflicting changes',
+                              conflicts=Task.schema.dump_obj(task, conflicts))
+
+        old_assignee = task.assignee_id
+        for f, value in changes.items():
+            setattr(task, f, value)
+        try:
+            notify(
+                _task_notifications(project_id, task.id, task.title, old_assignee, task.assignee_id),
+                actor_id=current_user_id()
+            )
+            db.session.commit()
+        except StaleDataError:
+            # another writer committed after our read; check against theirs
+            db.session.rollback()
+            continue
+        resp = jsonify({'message': 'Task updated', 'version': task.version})
+        resp.set_etag(version_etag('task', task.id, task.version))
+        return resp, 200
+
+    return _stale(get_task_or_404(project_id, task_id), 409, 'Task is being modified concurrently; retry')
 
 @task_bp.route('/<int:project_id>/tasks/<int:task_id>', methods=['DELETE'])
 @jwt_required()
+@project_member_required
 def delete_task(project_id, task_id):
-    Project.query.get_or_404(project_id)
-    task = Task.query.get_or_404(task_id)
-    db.session.delete(task)
-    db.session.commit()
-    return jsonify({'message': 'Task deleted'}), 200
+    """Delete a task; with If-Match only if it is still at that version."""
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        task = get_task_or_404(project_id, task_id)
+        if if_match_failed(version_etag('task', task.id, task.version)):
+            return _stale(task, 412, 'Task was modified')
+        # SQLite doesn't enforce the reminders' ON DELETE CASCADE
+        db.session.execute(db.delete(TaskReminder).where(TaskReminder.task_id == task.id))
+        db.session.delete(task)
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            continue
+        return jsonify({'message': 'Task deleted'}), 200
+
+    return _stale(get_task_or_404(project_id, task_id), 409, 'Task is being modified concurrently; retry')
+
+def _validate_batch_op(op, seen_ids):
+    """
+    Normalize one batch operation; returns (op, task_id, values, version)
+    or raises ValueError. ``version`` is the If-Match of an update/delete.
+    """
+    if not isinstance(op, dict):
+        raise ValueError('Operation must be an object')
+    kind = op.get('op')
+    if kind not in ('create', 'update', 'delete'):
+        raise ValueError("op must be one of 'create', 'update', 'delete'")
+
+    task_id = None
+    if kind != 'create':
+        task_id = op.get('id')
+        # bool is an int subclass; {"id": true} would address task 1
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise ValueError('id required')
+        if task_id in seen_ids:
+            raise ValueError(f'Task {task_id} appears in more than one operation')
+        seen_ids.add(task_id)
+    version = op.get('version')
+    if version is not None and (kind == 'create' or not isinstance(version, int) or isinstance(version, bool)):
+        raise ValueError('version must be an integer, on update or delete only')
+
+    values = {}
+    if kind != 'delete':
+        data = op.get('data') or {}
+        if not isinstance(data, dict):
+            raise ValueError('data must be an object')
+        values = {f: data[f] for f in UPDATABLE_FIELDS if f in data}
+        if kind == 'create' and not values.get('title'):
+            raise ValueError('Title required')
+        if kind == 'update' and 'title' in values and not values['title']:
+            raise ValueError('Title cannot be empty')
+        if 'due_date' in values:
+            values['due_date'] = _parse_due_date(values['due_date'])
+    return kind, task_id, values, version
+
+@task_bp.route('/<int:project_id>/tasks:batch', methods=['POST'])
+@jwt_required()
+@project_member_required
+def batch_tasks(project_id):
+    """
+    Apply many create/update/delete operations in one transaction.
+
+    Body: {"operations": [
+        {"op": "create", "data": {...}},
+        {"op": "update", "id": 1, "data": {...}, "version": 3},
+        {"op": "delete", "id": 2}
+    ]}
+
+    Every operation is validated before anything is written; if any fail,
+    nothing is applied and the per-item errors are returned with a 400.
+    An update or delete with a `version` applies only to that version of
+    the task; otherwise the whole batch is refused with a 409 listing the
+    conflicting items and their current versions.
+    """
+    ensure_project(project_id)
+    body       = request.get_json(silent=True)
+    operations = body.get('operations') if isinstance(body, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations must be a non-empty list'}), 400
+    if len(operations) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} operations per batch'}), 400
+
+    parsed, errors, seen_ids = [], [], set()
+    for i, op in enumerate(operations):
+        try:
+            parsed.append(_validate_batch_op(op, seen_ids))
+        except ValueError as e:
+            parsed.append(None)
+            errors.append({'index': i, 'error': str(e)})
+
+    # one query confirms every referenced task exists and belongs to this project
+    found = {}
+    if seen_ids:
+        found = {
+            row.id: row for row in db.session.execute(
+                db.select(Task.id, Task.title, Task.assignee_id, Task.status, Task.due_date, Task.version)
+                  .where(Task.project_id == project_id, Task.id.in_(seen_ids))
+            )
+        }
+        for i, item in enumerate(parsed):
+            if item and item[1] is not None and item[1] not in found:
+                errors.append({'index': i, 'error': f'Task {item[1]} not found'})
+    if errors:
+        return jsonify({'errors': sorted(errors, key=lambda e: e['index'])}), 400
+
+    conflicts = [
+        {'index': i, 'id': t, 'version': found[t].version}
+        for i, (_, t, _, version) in enumerate(parsed)
+        if version is not None and version != found[t].version
+    ]
+    if conflicts:
+        return jsonify({'error': 'Tasks were modified', 'conflicts': conflicts}), 409
+
+    now     = datetime.utcnow()
+    creates = [(i, v) for i, (k, _, v, _) in enumerate(parsed) if k == 'create']
+    updates = [(i, t, v) for i, (k, t, v, _) in enumerate(parsed) if k == 'update']
+    deletes = [(i, t) for i, (k, t, _, _) in enumerate(parsed) if k == 'delete']
+    results = [None] * len(parsed)
+    pending = []
+    deltas  = StatsDeltas()
+    changes = {}
+
+    try:
+        if creates:
+            new_ids = db.session.scalars(
+                db.insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                [{**v, 'project_id': project_id} for _, v in creates]
+            ).all()
+            for (i, v), task_id in zip(creates, new_ids):
+                results[i] = {'index': i, 'op': 'create', 'id': task_id, 'status': 201}
+                changes[('task', task_id)] = UPSERT
+                task_row_deltas(deltas, new={'project_id': project_id, **v})
+                pending.extend(_task_notifications(
+                    project_id, task_id, v['title'], None, v.get('assignee_id')
+                ))
+
+        if updates:
+            # ORM bulk UPDATE by primary key; with Task's version_id_col each
+            # row only matches the version read above, else StaleDataError
+            db.session.execute(
+                db.update(Task),
+                [{**v, 'id': t, 'updated_at': now, 'version': found[t].version} for _, t, v in updates]
+            )
+            for i, task_id, v in updates:
+                results[i] = {'index': i, 'op': 'update', 'id': task_id, 'status': 200}
+                changes[('task', task_id)] = UPSERT
+                old = found[task_id]
+                task_row_deltas(deltas, old={**old._mapping, 'project_id': project_id},
+                                new={**old._mapping, **v, 'project_id': project_id})
+                pending.extend(_task_notifications(
+                    project_id, task_id, v.get('title', old.title),
+                    old.assignee_id, v.get('assignee_id', old.assignee_id)
+                ))
+
+        if deletes:
+            ids = [t for _, t in deletes]
+            comment_ids = db.session.scalars(
+                db.delete(Comment).where(Comment.task_id.in_(ids)).returning(Comment.id)
+            ).all()
+            db.session.execute(db.delete(TaskReminder).where(TaskReminder.task_id.in_(ids)))
+            deleted = db.session.execute(
+                db.delete(Task).where(db.tuple_(Task.id, Task.version).in_([(t, found[t].version) for t in ids]))
+            ).rowcount
+            if deleted != len(ids):
+                raise StaleDataError(f'DELETE matched {deleted} of {len(ids)} tasks')
+            changes.update({('comment', comment_id): DELETE for comment_id in comment_ids})
+            for i, task_id in deletes:
+                results[i] = {'index': i, 'op': 'delete', 'id': task_id, 'status': 200}
+                changes[('task', task_id)] = DELETE
+                task_row_deltas(deltas, old={**found[task_id]._mapping, 'project_id': project_id})
+
+        # bulk statements bypass the ORM flush hooks
+        bump_revision([project_id])
+        log_changes({project_id: changes})
+        apply_deltas(deltas)
+        notify(pending, actor_id=current_user_id())
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Tasks were modified concurrently; retry'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Database error', 'details': str(e)}), 500
+
+    return jsonify({'results': results}), 200
@@ -1,7 +1,9 @@
 from flask import Blueprint
+from app.cache_control import cache_policy
 
 # Give this blueprint a unique name
 team_test_bp = Blueprint('team_test_bp', __name__)
+cache_policy(team_test_bp, private=True, no_cache=True)
 
 @team_test_bp.route('/test', methods=['GET'])
 def test_team():
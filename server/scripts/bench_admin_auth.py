@@ -0,0 +1,86 @@
+"""
+Requests/sec on an admin-only endpoint: the old DB-lookup admin check
+versus app.utils.admin_required, which reads the role claim and the
+cached user record.
+
+Both variants guard the same trivial route and are driven through the
+Flask test client against a throwaway SQLite database.
+
+    python scripts/bench_admin_auth.py --requests 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from functools import wraps
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def legacy_admin_required(fn):
+    """The previous implementation: one User lookup per request."""
+    from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+    from flask_restful import abort
+    from extensions import db
+    from models.user import User
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        user = db.session.get(User, int(get_jwt_identity()))
+        if not user or not user.is_admin():
+            abort(403, message="Admin privileges required.")
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_admin.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask import jsonify
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models.user import User
+    from app.utils import admin_required
+
+    app = create_app()
+
+    @app.route('/bench/legacy')
+    @legacy_admin_required
+    def legacy():
+        return jsonify({'ok': True})
+
+    @app.route('/bench/claims')
+    @admin_required
+    def claims():
+        return jsonify({'ok': True})
+
+    with app.app_context():
+        db.create_all()
+        admin = User(first_name='Bench', last_name='Admin', email='admin@example.com',
+                     password_hash='x', role='admin')
+        db.session.add(admin)
+        db.session.commit()
+        token = create_access_token(identity=str(admin.id), additional_claims={'role': admin.role})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client = app.test_client()
+    for label, url in (('db lookup', '/bench/legacy'), ('jwt claims', '/bench/claims')):
+        client.get(url, headers=headers)
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            resp = client.get(url, headers=headers)
+            assert resp.status_code == 200, resp.get_json()
+        elapsed = time.perf_counter() - started
+        print(f'{label:>10}: {args.requests / elapsed:8.0f} req/s')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare per-request task updates with the tasks:batch endpoint.
+
+Seeds a throwaway SQLite database with N tasks, then updates every task
+once through PUT /api/projects/<id>/tasks/<task_id> and once through a
+single POST /api/projects/<id>/tasks:batch, printing the throughput of
+each path.
+
+    python scripts/bench_batch.py --tasks 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_batch.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models.user import User
+    from models.project import Project
+    from models.task import Task
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Bench', last_name='User', email='bench@example.com', password_hash='x')
+        db.session.add(owner)
+        db.session.flush()
+        project = Project(name='bench', owner_id=owner.id)
+        db.session.add(project)
+        db.session.flush()
+        db.session.execute(db.insert(Task), [
+            {'title': f'task {i}', 'project_id': project.id} for i in range(args.tasks)
+        ])
+        db.session.commit()
+        project_id = project.id
+        task_ids   = db.session.scalars(db.select(Task.id).where(Task.project_id == project_id)).all()
+        headers    = {'Authorization': f'Bearer {create_access_token(identity=str(owner.id))}'}
+
+    client = app.test_client()
+
+    started = time.perf_counter()
+    for task_id in task_ids:
+        resp = client.put(f'/api/projects/{project_id}/tasks/{task_id}',
+                          json={'status': 'in-progress'}, headers=headers)
+        assert resp.status_code == 200, resp.get_json()
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resp = client.post(f'/api/projects/{project_id}/tasks:batch', headers=headers, json={
+        'operations': [{'op': 'update', 'id': t, 'data': {'status': 'done'}} for t in task_ids]
+    })
+    assert resp.status_code == 200, resp.get_json()
+    batch = time.perf_counter() - started
+
+    n = len(task_ids)
+    print(f'per-request: {n / single:10.0f} updates/s  ({single:.2f} s)')
+    print(f'batch:       {n / batch:10.0f} updates/s  ({batch:.2f} s)')
+    print(f'speedup:     {single / batch:10.1f}x')
+
+
+if __name__ == "__main__":
+    main()
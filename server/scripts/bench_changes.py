@@ -0,0 +1,139 @@
+"""
+Keeping a client copy of a project current: full re-fetch vs change feed.
+
+Seeds one project with --tasks tasks and a few comments on each, then
+makes --changes single-task edits between two syncs and compares (median
+of --repeat runs, response size and statement count of one run):
+
+    refetch      GET /api/projects/<id>/tasks plus every task's comments,
+                 what the client does today
+    changes      GET /api/projects/<id>/changes?since=<revision before the edits>
+    unchanged    the same with If-None-Match once nothing else changed (304)
+    full sync    every page of GET /api/projects/<id>/changes from 0 at
+                 limit=5000, a client's first sync
+
+It also reports the median latency of PUT /api/projects/<id>/tasks/<id>,
+which now writes the change-log row in its transaction.
+
+    python scripts/bench_changes.py --tasks 5000 --changes 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def measure(fn, repeat):
+    from app.instrumentation import count_queries
+
+    with count_queries() as q:
+        size = fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), q.count, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--changes', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL']      = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "bench_changes.db")}'
+    os.environ['REMINDER_INTERVAL'] = '0'
+    os.environ['JOBS_WORKERS']      = '0'
+    os.environ['SLOW_QUERY_MS']     = '600000'
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import text
+    from main import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+                "VALUES ('Bench', 'User', 'bench@bench.test', 'x', :now)"
+            ), {'now': now})
+            conn.execute(text(
+                "INSERT INTO project (name, owner_id, created_at, revision) VALUES ('bench', 1, :now, 1)"
+            ), {'now': now})
+            conn.execute(text(
+                "INSERT INTO task (title, status, project_id, created_at, updated_at) "
+                "VALUES (:title, 'pending', 1, :now, :now)"
+            ), [{'title': f'task {i}', 'now': now} for i in range(args.tasks)])
+            conn.execute(text(
+                "INSERT INTO comment (task_id, user_id, text, created_at) VALUES (:task, 1, 'benchmark comment', :now)"
+            ), [{'task': t, 'now': now} for t in range(1, args.tasks + 1) for _ in range(t % 4)])
+            # what the migration's backfill does for existing data
+            conn.execute(text(
+                "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+                "SELECT 1, 'task', id, 'upsert', 1, :now FROM task"
+            ), {'now': now})
+            conn.execute(text(
+                "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+                "SELECT 1, 'comment', id, 'upsert', 1, :now FROM comment"
+            ), {'now': now})
+            conn.exec_driver_sql('ANALYZE')
+        token = create_access_token(identity='1')
+
+    client  = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def get(path, **extra):
+        resp = client.get(path, headers={**headers, **extra})
+        assert resp.status_code in (200, 304), resp.get_data()
+        return resp
+
+    with app.app_context():
+        since = get('/api/projects/1/changes?limit=1').get_json()['revision']
+        edits = []
+        for i in range(args.changes):
+            started = time.perf_counter()
+            resp    = client.put(f'/api/projects/1/tasks/{i * 7 % args.tasks + 1}',
+                                 json={'status': 'in_progress', 'title': f'edited {i}'}, headers=headers)
+            edits.append(time.perf_counter() - started)
+            assert resp.status_code == 200, resp.get_data()
+        etag = get(f'/api/projects/1/changes?since={since}').headers['ETag']
+
+        def refetch():
+            size = len(get('/api/projects/1/tasks').get_data())
+            for task_id in range(1, args.tasks + 1):
+                size += len(get(f'/api/comments/{task_id}').get_data())
+            return size
+
+        def full_sync():
+            size, cursor = 0, None
+            while True:
+                resp   = get('/api/projects/1/changes?limit=5000' + (f'&after={cursor}' if cursor else ''))
+                size  += len(resp.get_data())
+                cursor = resp.get_json()['next_cursor']
+                if not cursor:
+                    return size
+
+        print(f"{args.tasks} tasks, {args.changes} edited since the last sync; median of {args.repeat}")
+        for name, fn, repeat in (
+            ('refetch',   refetch, max(1, args.repeat // 5)),
+            ('changes',   lambda: len(get(f'/api/projects/1/changes?since={since}').get_data()), args.repeat),
+            ('unchanged', lambda: len(get(f'/api/projects/1/changes?since={since}', **{'If-None-Match': etag}).get_data()),
+                          args.repeat),
+            ('full sync', full_sync, args.repeat),
+        ):
+            seconds, statements, size = measure(fn, repeat)
+            print(f"{name:<10} {seconds * 1000:9.2f} ms  {statements:6d} statements  {size / 1024:9.1f} KiB")
+        print(f"task PUT   {statistics.median(edits) * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
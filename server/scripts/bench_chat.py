@@ -0,0 +1,147 @@
+"""
+Chat throughput: messages/sec across N concurrent channels.
+
+Runs the same workload in a fresh process per durability mode (sync:
+commit per send; async: background group-commit writer). One subscriber
+per project channel listens on the broker while sender threads post
+messages through the Flask test client round-robin across channels. The
+script reports send throughput and latency, end-to-end delivery latency
+(send -> subscriber, i.e. including the commit) and how many messages
+ended up stored.
+
+    python scripts/bench_chat.py --channels 50 --senders 16 --messages 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+MODES = ('sync', 'async')
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0
+
+
+def run_workload(channels, senders, messages):
+    path = os.path.join(tempfile.mkdtemp(), 'bench_chat.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models.user import User
+    from models.project import Project
+    from models.chat_message import ChatMessage
+    from app.broker import broker
+    from app.chat import chat_channel, chat_writer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Bench', last_name='User', email='bench@example.com', password_hash='x')
+        db.session.add(owner)
+        db.session.flush()
+        projects = [Project(name=f'bench {i}', owner_id=owner.id) for i in range(channels)]
+        db.session.add_all(projects)
+        db.session.commit()
+        project_ids = [p.id for p in projects]
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(owner.id))}'}
+
+    total     = senders * messages
+    delivered = []
+    lock      = threading.Lock()
+    subs      = [broker.subscribe(chat_channel(pid), maxsize=total) for pid in project_ids]
+
+    def listen(sub):
+        while True:
+            event = sub.get(timeout=30)
+            if event is None:
+                return
+            latency = time.perf_counter() - float(event['data']['text'])
+            with lock:
+                delivered.append(latency)
+                if len(delivered) >= total:
+                    return
+
+    listeners = [threading.Thread(target=listen, args=(s,), daemon=True) for s in subs]
+    for t in listeners:
+        t.start()
+
+    send_latencies, errors = [], []
+
+    def sender(n):
+        client = app.test_client()
+        for i in range(messages):
+            pid = project_ids[(n * messages + i) % channels]
+            started = time.perf_counter()
+            resp = client.post(f'/api/chat/projects/{pid}/messages', json={'text': repr(started)}, headers=headers)
+            elapsed = time.perf_counter() - started
+            if resp.status_code not in (201, 202):
+                errors.append(resp.status_code)
+            with lock:
+                send_latencies.append(elapsed)
+
+    pool = [threading.Thread(target=sender, args=(n,)) for n in range(senders)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    send_s = time.perf_counter() - started
+    chat_writer.flush()
+    deadline = time.time() + 10
+    while len(delivered) < total and time.time() < deadline:
+        time.sleep(0.01)
+    total_s = time.perf_counter() - started
+
+    for s in subs:
+        s.close()
+    with app.app_context():
+        stored = db.session.scalar(db.select(db.func.count()).select_from(ChatMessage))
+
+    return {
+        'sent':           total - len(errors),
+        'errors':         len(errors),
+        'stored':         stored,
+        'delivered':      len(delivered),
+        'send_msgs_sec':  round(total / send_s, 1),
+        'e2e_msgs_sec':   round(len(delivered) / total_s, 1),
+        'send_p50_ms':    round(percentile(send_latencies, 50) * 1000, 2),
+        'send_p99_ms':    round(percentile(send_latencies, 99) * 1000, 2),
+        'deliver_p50_ms': round(percentile(delivered, 50) * 1000, 2),
+        'deliver_p99_ms': round(percentile(delivered, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=50)
+    parser.add_argument('--senders', type=int, default=16)
+    parser.add_argument('--messages', type=int, default=200, help='messages per sender')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_workload(args.channels, args.senders, args.messages)))
+        return
+
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--channels', str(args.channels),
+             '--senders', str(args.senders), '--messages', str(args.messages)],
+            env={**os.environ, 'CHAT_DURABILITY': mode}, capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f'{mode:>6}: {result}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Comment listing and per-task comment counts at 10k comments per task.
+
+Seeds one project whose first task has --comments comments from --users
+authors, plus --tasks further tasks with a few comments each, then
+compares (median of --repeat runs, with the statement count of one run):
+
+comments
+    lazy     Task.comments through the ORM, touching comment.author
+             for the name (one SELECT per distinct author)
+    all      every comment as Rows in one SELECT, no authors (the
+             unpaginated route)
+    page     GET /api/comments/<id>?limit=50, authors joined in
+    deep     the same, from a cursor halfway through the task
+    walk     every page at limit=500
+counts
+    lazy     len(task.comments) for each task in the project
+    grouped  GET /api/projects/<id>/tasks with comment_count
+    none     the same listing without comment_count
+
+    python scripts/bench_comments.py --comments 10000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def seed(conn, users, comments, tasks):
+    from sqlalchemy import text
+
+    now = datetime.utcnow()
+    conn.execute(text(
+        "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+        "VALUES (:first, 'Bench', :email, 'x', :now)"
+    ), [{'first': f'User{i}', 'email': f'user{i}@bench.test', 'now': now} for i in range(1, users + 1)])
+    conn.execute(text(
+        "INSERT INTO project (name, owner_id, created_at) VALUES ('bench', 1, :now)"
+    ), {'now': now})
+    conn.execute(text(
+        "INSERT INTO task (title, status, project_id, created_at, updated_at) "
+        "VALUES (:title, 'pending', 1, :now, :now)"
+    ), [{'title': f'task {i}', 'now': now} for i in range(tasks + 1)])
+    rows = [{'task': 1, 'user': i % users + 1, 'at': now + timedelta(seconds=i)} for i in range(comments)]
+    rows += [{'task': t, 'user': t % users + 1, 'at': now + timedelta(seconds=i)}
+             for t in range(2, tasks + 2) for i in range(t % 7)]
+    conn.execute(text(
+        "INSERT INTO comment (task_id, user_id, text, created_at) VALUES (:task, :user, 'benchmark comment', :at)"
+    ), rows)
+
+
+def measure(fn, repeat):
+    from app.instrumentation import count_queries
+
+    with count_queries() as q:
+        fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), q.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--comments', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL']      = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "bench_comments.db")}'
+    os.environ['REMINDER_INTERVAL'] = '0'
+    os.environ['SLOW_QUERY_MS']     = '600000'
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models import Comment, Task
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            seed(conn, args.users, args.comments, args.tasks)
+            conn.exec_driver_sql('ANALYZE')
+        token = create_access_token(identity='1')
+
+    client  = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def get(path):
+        resp = client.get(path, headers=headers)
+        assert resp.status_code == 200, resp.get_data()
+        return resp.get_json()
+
+    def lazy_comments():
+        task = db.session.get(Task, 1)
+        [{'id': c.id, 'text': c.text, 'author': c.author.first_name} for c in task.comments]
+        db.session.remove()
+
+    def all_rows():
+        db.session.execute(db.select(*Comment.schema.columns()).where(Comment.task_id == 1)
+                             .order_by(Comment.created_at, Comment.id)).all()
+        db.session.remove()
+
+    def walk():
+        cursor = None
+        while True:
+            page   = get('/api/comments/1?limit=500' + (f'&after={cursor}' if cursor else ''))
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+
+    def lazy_counts():
+        for task in db.session.scalars(db.select(Task).where(Task.project_id == 1)):
+            len(task.comments)
+        db.session.remove()
+
+    with app.app_context():
+        cursor = None
+        for _ in range(args.comments // 2 // 500):
+            cursor = get('/api/comments/1?limit=500' + (f'&after={cursor}' if cursor else ''))['next_cursor']
+
+        print(f"{args.comments} comments on one task, {args.tasks} more tasks; median of {args.repeat}")
+        for name, fn in (
+            ('comments lazy',   lazy_comments),
+            ('comments all',    all_rows),
+            ('comments page',   lambda: get('/api/comments/1?limit=50')),
+            ('comments deep',   lambda: get(f'/api/comments/1?limit=50&after={cursor}')),
+            ('comments walk',   walk),
+            ('counts lazy',     lazy_counts),
+            ('counts grouped',  lambda: get('/api/projects/1/tasks')),
+            ('counts none',     lambda: get('/api/projects/1/tasks?fields=id,title,description,status,due_date,assignee_id')),
+        ):
+            seconds, statements = measure(fn, args.repeat)
+            print(f"{name:<15} {seconds * 1000:8.2f} ms  {statements:5d} statements")
+
+
+if __name__ == '__main__':
+    main()
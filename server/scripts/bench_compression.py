@@ -0,0 +1,87 @@
+"""
+Bytes on the wire and latency of a 10k-task listing per content encoding.
+
+Seeds a throwaway SQLite database with one project of --tasks tasks and
+fetches GET /api/projects/<id>/tasks through the Flask test client with
+Accept-Encoding identity, gzip and br. For each it reports the body size,
+p50/p95 server time (query + serialization + compression) and the time
+the body would take to transfer at --mbps, plus client-side decode time.
+ETags are bypassed so every request does the full work.
+
+    python scripts/bench_compression.py --tasks 10000 --requests 30 --mbps 20
+"""
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_serialize import seed
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def decode(body, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        import brotli
+        return brotli.decompress(body)
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--mbps', type=float, default=20, help='link speed for the transfer estimate')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_compression.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from app.compression import brotli
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            seed(conn, args.tasks)
+        token = create_access_token(identity='1')
+
+    client    = app.test_client()
+    encodings = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+    baseline  = None
+    for encoding in encodings:
+        headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': encoding}
+        latencies, decode_s = [], []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            resp    = client.get('/api/projects/1/tasks', headers=headers)
+            latencies.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            body    = decode(resp.data, resp.headers.get('Content-Encoding'))
+            decode_s.append(time.perf_counter() - started)
+        assert resp.status_code == 200 and body.startswith(b'[')
+        wire     = len(resp.data)
+        baseline = baseline or wire
+        transfer = wire * 8 / (args.mbps * 1e6)
+        p50      = percentile(latencies, 50)
+        print(f'{encoding:>8}: {wire / 1024:8.1f} KiB ({wire / baseline:6.1%})  '
+              f'server p50 {p50 * 1000:6.1f} ms  p95 {percentile(latencies, 95) * 1000:6.1f} ms  '
+              f'transfer@{args.mbps:g}Mbps {transfer * 1000:6.1f} ms  '
+              f'decode {percentile(decode_s, 50) * 1000:5.1f} ms  '
+              f'total {(p50 + transfer + percentile(decode_s, 50)) * 1000:6.1f} ms')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Check that the streaming export keeps memory flat as a project grows.
+
+Seeds a throwaway SQLite database with N tasks (plus one comment per
+task), streams /api/projects/<id>/export through the test client and
+reports the tracemalloc peak for a small and a large project. Exits 1
+when the large export's peak exceeds the small one's by more than
+--max-growth (a fraction, default 0.5), i.e. memory grew with the data.
+
+    python scripts/bench_export.py --tasks 300000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def seed(db, project_id, owner_id, n_tasks):
+    from models.task import Task
+    from models.comment import Comment
+
+    batch = 10000
+    for start in range(0, n_tasks, batch):
+        stop = min(start + batch, n_tasks)
+        db.session.execute(db.insert(Task), [
+            {'title': f'task {i}', 'project_id': project_id} for i in range(start, stop)
+        ])
+    db.session.execute(
+        db.insert(Comment).from_select(
+            ['task_id', 'user_id', 'text'],
+            db.select(Task.id, db.literal(owner_id), db.literal('comment'))
+              .where(Task.project_id == project_id)
+        )
+    )
+    db.session.commit()
+
+
+def measure(client, headers, project_id, fmt):
+    tracemalloc.start()
+    started = time.perf_counter()
+    resp    = client.get(f'/api/projects/{project_id}/export?format={fmt}', headers=headers, buffered=False)
+    first   = None
+    size    = 0
+    for chunk in resp.response:
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    resp.close()
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'bytes': size, 'first_byte_s': first, 'total_s': total, 'peak_kib': peak // 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=300000)
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--max-growth', type=float, default=0.5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_export.db')
+    os.environ['DATABASE_URL']      = f'sqlite:///{path}'
+    os.environ['REMINDER_INTERVAL'] = '0'
+    os.environ['JOBS_WORKERS']      = '0'
+    os.environ['SLOW_QUERY_MS']     = '600000'
+
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models.user import User
+    from models.project import Project
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Bench', last_name='User', email='bench@example.com', password_hash='x')
+        db.session.add(owner)
+        db.session.flush()
+        small = Project(name='small', owner_id=owner.id)
+        large = Project(name='large', owner_id=owner.id)
+        db.session.add_all([small, large])
+        db.session.commit()
+
+        seed(db, small.id, owner.id, 1000)
+        seed(db, large.id, owner.id, args.tasks)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(owner.id))}'}
+        small_id, large_id = small.id, large.id
+
+    client = app.test_client()
+    peaks  = {}
+    for label, project_id, n in (('small', small_id, 1000), ('large', large_id, args.tasks)):
+        result = measure(client, headers, project_id, args.format)
+        peaks[label] = result['peak_kib']
+        print(f"{label:>5} {n:>8} tasks  {result['bytes'] / 1e6:8.1f} MB  "
+              f"first byte {result['first_byte_s'] * 1000:7.1f} ms  "
+              f"total {result['total_s']:6.2f} s  peak {result['peak_kib']:>7} KiB")
+
+    allowed = peaks['small'] * (1 + args.max_growth)
+    if peaks['large'] > allowed:
+        print(f"FAIL large export peak {peaks['large']} KiB > {allowed:.0f} KiB "
+              f"(small peak + {args.max_growth:.0%})")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
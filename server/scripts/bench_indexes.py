@@ -0,0 +1,137 @@
+"""
+Show query plans and latency for the hot list queries with and without
+the secondary indexes declared on the models.
+
+Seeds a throwaway SQLite database (default 1M tasks), drops every
+non-primary-key index, times each query, then builds the indexes and
+times them again.
+
+    python scripts/bench_indexes.py --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+QUERIES = {
+    'tasks by project+status order by due': (
+        "SELECT id, title FROM task WHERE project_id = :project AND status = 'pending' "
+        "ORDER BY due_date LIMIT 100"
+    ),
+    'task page (keyset)': (
+        "SELECT id, title FROM task WHERE project_id = :project "
+        "ORDER BY created_at, id LIMIT 100"
+    ),
+    'tasks by assignee': (
+        "SELECT id FROM task WHERE assignee_id = :user AND status != 'done'"
+    ),
+    'tasks due in window': (
+        "SELECT id FROM task WHERE due_date BETWEEN :start AND :end AND status != 'done'"
+    ),
+    'comments by task': (
+        "SELECT id, text FROM comment WHERE task_id = :task ORDER BY created_at"
+    ),
+    'projects for user': (
+        "SELECT id FROM project WHERE owner_id = :user "
+        "UNION SELECT project_id FROM collaborator WHERE user_id = :user"
+    ),
+}
+
+
+def seed(conn, n_tasks, n_users=2000, n_projects=5000):
+    from sqlalchemy import text
+
+    now = datetime.utcnow()
+    rnd = random.Random(42)
+    conn.execute(text(
+        "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+        "VALUES ('u', 'u', :email, 'x', :now)"
+    ), [{'email': f'user{i}@example.com', 'now': now} for i in range(n_users)])
+    conn.execute(text(
+        "INSERT INTO project (name, owner_id, created_at) VALUES ('p', :owner, :now)"
+    ), [{'owner': rnd.randint(1, n_users), 'now': now} for _ in range(n_projects)])
+    members = {(rnd.randint(1, n_users), rnd.randint(1, n_projects)) for _ in range(n_projects * 3)}
+    conn.execute(text(
+        "INSERT INTO collaborator (user_id, project_id, role, created_at) "
+        "VALUES (:user, :project, 'member', :now)"
+    ), [{'user': u, 'project': p, 'now': now} for u, p in sorted(members)])
+
+    statuses = ('pending', 'in-progress', 'done')
+    batch    = 50000
+    for start in range(0, n_tasks, batch):
+        conn.execute(text(
+            "INSERT INTO task (title, status, due_date, assignee_id, project_id, created_at, updated_at) "
+            "VALUES ('t', :status, :due, :assignee, :project, :created, :created)"
+        ), [{
+            'status':   rnd.choice(statuses),
+            'due':      now + timedelta(hours=rnd.randint(-2000, 2000)),
+            'assignee': rnd.randint(1, n_users),
+            # skewed so a few projects are very large
+            'project':  min(int(rnd.paretovariate(1.2)), n_projects),
+            'created':  now - timedelta(seconds=i),
+        } for i in range(start, min(start + batch, n_tasks))])
+    conn.execute(text(
+        "INSERT INTO comment (task_id, user_id, text, created_at) "
+        "SELECT id, assignee_id, 'c', created_at FROM task WHERE id % 4 = 0"
+    ))
+
+
+def run_queries(conn, repeat):
+    from sqlalchemy import text
+
+    now    = datetime.utcnow()
+    params = {'project': 1, 'user': 7, 'task': 400, 'start': now, 'end': now + timedelta(days=1)}
+    report = {}
+    for name, sql in QUERIES.items():
+        plan = [row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql), params)]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(text(sql), params).fetchall()
+        report[name] = ((time.perf_counter() - started) / repeat * 1000, plan)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from main import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        indexes = [ix for table in db.metadata.sorted_tables for ix in table.indexes]
+        with db.engine.begin() as conn:
+            for ix in indexes:
+                ix.drop(conn)
+            started = time.perf_counter()
+            seed(conn, args.tasks)
+            print(f'seeded {args.tasks} tasks in {time.perf_counter() - started:.1f} s')
+            conn.exec_driver_sql('ANALYZE')
+            before = run_queries(conn, args.repeat)
+
+            started = time.perf_counter()
+            for ix in indexes:
+                ix.create(conn)
+            conn.exec_driver_sql('ANALYZE')
+            print(f'built {len(indexes)} indexes in {time.perf_counter() - started:.1f} s\n')
+            after = run_queries(conn, args.repeat)
+
+    for name in QUERIES:
+        (t0, plan0), (t1, plan1) = before[name], after[name]
+        print(f'{name}\n  before {t0:9.2f} ms  {" | ".join(plan0)}\n  after  {t1:9.2f} ms  {" | ".join(plan1)}')
+
+
+if __name__ == "__main__":
+    main()
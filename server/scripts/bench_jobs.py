@@ -0,0 +1,82 @@
+"""
+Request latency of POST /api/newsletter while welcome emails are slow.
+
+The welcome email is replaced by a sleep of --email-ms to stand in for
+a slow SMTP server. Each scenario subscribes --requests new addresses
+through the Flask test client and reports the request latency:
+
+    idle   no job workers; jobs only pile up in the table
+    busy   JOBS_WORKERS threads are sending the emails meanwhile
+
+With the email in the request instead, every subscribe would take at
+least --email-ms. The busy scenario also reports how long the workers
+took to drain the queue afterwards.
+
+    python scripts/bench_jobs.py --requests 200 --email-ms 100 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def run(create_app, name, workers, args):
+    from config import Config
+    from extensions import db
+    from bench.report import percentile
+    from app.jobs import job_runner
+    from models.job import Job
+
+    Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "bench_jobs.db")}'
+    Config.JOBS_WORKERS            = workers
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    latencies = []
+    for i in range(args.requests):
+        started = time.perf_counter()
+        resp    = client.post('/api/newsletter', json={'email': f'{name}{i}@bench.test'})
+        latencies.append(time.perf_counter() - started)
+        assert resp.status_code == 201, resp.get_data()
+    latencies.sort()
+
+    drained = None
+    if workers:
+        started = time.perf_counter()
+        with app.app_context():
+            while db.session.scalar(db.select(db.func.count()).where(Job.status != 'done')):
+                db.session.remove()
+                time.sleep(0.05)
+        drained = time.perf_counter() - started
+        job_runner.shutdown()
+
+    print(f"{name:<5} p50 {percentile(latencies, 50) * 1000:6.2f} ms  "
+          f"p95 {percentile(latencies, 95) * 1000:6.2f} ms  "
+          f"max {latencies[-1] * 1000:6.2f} ms"
+          + (f"  (queue drained {drained:.1f} s after the last request)" if drained is not None else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--email-ms', type=float, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    import app.newsletter
+    from main import create_app
+
+    app.newsletter.send_email = lambda *a, **kw: time.sleep(args.email_ms / 1000)
+    print(f"{args.requests} subscribes, {args.email_ms:.0f} ms per welcome email "
+          f"(inline that is >= {args.email_ms:.0f} ms per request)")
+    run(create_app, 'idle', 0, args)
+    run(create_app, 'busy', args.workers, args)
+
+
+if __name__ == '__main__':
+    main()
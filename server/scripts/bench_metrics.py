@@ -0,0 +1,73 @@
+"""
+Overhead of the request metrics hooks on a hello-world route.
+
+Builds two apps in one process, one with METRICS_ENABLED off and one with
+it on, and alternates rounds of GET /healthz through the Flask test
+client so drift in machine load hits both equally; CPU time is measured
+to keep other processes out of it. Reports the median per-request time of
+each, the median on/off ratio of adjacent rounds, and the cost of the
+before/after hooks timed on their own.
+
+    python scripts/bench_metrics.py --requests 5000 --rounds 21
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000, help='requests per round')
+    parser.add_argument('--rounds', type=int, default=21)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "bench_metrics.db")}'
+    from config import Config
+    from main import create_app
+
+    # the "on" app is built last so the shared metrics object ends up enabled
+    apps = {}
+    for name, enabled in (('off', False), ('on', True)):
+        Config.METRICS_ENABLED = enabled
+        apps[name] = create_app()
+
+    clients = {name: app.test_client() for name, app in apps.items()}
+    for client in clients.values():
+        for _ in range(1000):
+            client.get('/healthz')
+
+    means, ratios = {'off': [], 'on': []}, []
+    for i in range(args.rounds):
+        for name in (('off', 'on') if i % 2 else ('on', 'off')):
+            client  = clients[name]
+            started = time.process_time()
+            for _ in range(args.requests):
+                client.get('/healthz')
+            means[name].append((time.process_time() - started) / args.requests)
+        ratios.append(means['on'][-1] / means['off'][-1])
+
+    off, on = statistics.median(means['off']), statistics.median(means['on'])
+    print(f"metrics off: {off * 1e6:7.1f} us/request (median of {args.rounds} rounds)")
+    print(f"metrics on:  {on * 1e6:7.1f} us/request")
+    print(f"overhead:    {statistics.median(ratios) - 1:+.2%} median of paired rounds "
+          f"(min {min(ratios) - 1:+.2%}, max {max(ratios) - 1:+.2%})")
+
+    # the hooks alone, which is less noisy than the end-to-end difference
+    from flask import Response
+    from app.instrumentation import metrics
+    response = Response('{}', mimetype='application/json')
+    with apps['on'].test_request_context('/healthz'):
+        started = time.process_time()
+        for _ in range(args.requests * 10):
+            metrics._start_request()
+            metrics._finish_request(response)
+        hooks = (time.process_time() - started) / (args.requests * 10)
+    print(f"hooks alone: {hooks * 1e6:7.2f} us/request ({hooks / off:.2%} of the hello-world request)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Deleting a large project: ORM cascade vs soft delete + chunked purge.
+
+Seeds a file-backed SQLite database with one project of --tasks tasks (a
+comment on every other one, a notification and a change-log row per
+task) plus a small second project, then deletes the big one:
+
+    orm      load the project with its tasks, comments and
+             collaborators and session.delete() it, as the relationship
+             cascades did before projects were soft-deleted
+    purge    DELETE /api/projects/<id>, then the purge job it enqueued,
+             PURGE_CHUNK_SIZE rows per transaction
+
+Meanwhile --writers threads keep creating tasks in the small project, to
+show how long other writes wait on the deletion. Each mode runs in a
+fresh process and reports the time until the request returns and until
+the rows are gone, the number and longest of the deleting transactions,
+and the writers' p50/max latency and failures. The database is built
+with create_all(), so the search triggers from the migrations aren't
+installed.
+
+    python scripts/bench_purge.py --tasks 100000 --chunk-size 1000
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def seed(db, tasks):
+    from sqlalchemy import text
+
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+            "VALUES ('Owner', 'User', 'owner@bench.test', 'x', :now), ('Other', 'User', 'other@bench.test', 'x', :now)"
+        ), {'now': now})
+        conn.execute(text(
+            "INSERT INTO project (name, owner_id, created_at) VALUES ('big', 1, :now), ('small', 2, :now)"
+        ), {'now': now})
+        conn.execute(text("INSERT INTO collaborator (user_id, project_id) VALUES (2, 1)"))
+        conn.execute(text(
+            "INSERT INTO task (title, status, project_id, assignee_id, created_at, updated_at) "
+            "VALUES (:title, 'pending', 1, 2, :now, :now)"
+        ), [{'title': f'task {i}', 'now': now} for i in range(tasks)])
+        conn.execute(text(
+            "INSERT INTO comment (task_id, user_id, text, created_at) "
+            "SELECT id, 2, 'benchmark comment', :now FROM task WHERE id % 2 = 0"
+        ), {'now': now})
+        conn.execute(text(
+            "INSERT INTO notification (user_id, kind, title, message, project_id, task_id, created_at) "
+            "SELECT 2, 'task_assigned', 'Task assigned', title, 1, id, :now FROM task"
+        ), {'now': now})
+        conn.execute(text("UPDATE user SET unread_notifications = :n WHERE id = 2"), {'n': tasks})
+        conn.execute(text(
+            "INSERT INTO change_log (project_id, entity, entity_id, op, seq, changed_at) "
+            "SELECT 1, 'task', id, 'upsert', 1, :now FROM task"
+        ), {'now': now})
+        conn.execute(text(
+            "INSERT INTO task_stats (project_id, assignee_id, status, count) VALUES (1, 2, 'pending', :n)"
+        ), {'n': tasks})
+        conn.exec_driver_sql('ANALYZE')
+
+
+def run(mode, args):
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "bench_purge.db")}'
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import event, text
+    from sqlalchemy.orm import Session, selectinload
+    from main import create_app
+    from extensions import db
+    from app.jobs import job_runner
+    from models.project import Project
+    from models.task import Task
+
+    app = create_app()
+    app.config['PURGE_CHUNK_SIZE'] = args.chunk_size
+    # failed writes ("database is locked") are counted, not logged
+    app.logger.setLevel(logging.CRITICAL)
+    with app.app_context():
+        db.create_all()
+        seed(db, args.tasks)
+        owner = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+        other = {'Authorization': f'Bearer {create_access_token(identity="2")}'}
+
+    # the deleting thread's write transactions
+    main, begun, transactions = threading.get_ident(), {}, []
+
+    @event.listens_for(Session, 'after_begin')
+    def _begin(session, transaction, connection):
+        if threading.get_ident() == main:
+            begun.setdefault(id(session), time.perf_counter())
+
+    @event.listens_for(Session, 'after_commit')
+    def _commit(session):
+        if threading.get_ident() == main and id(session) in begun:
+            transactions.append(time.perf_counter() - begun.pop(id(session)))
+
+    latencies, failures, stop = [], [], threading.Event()
+
+    def writer():
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            resp    = client.post('/api/projects/2/tasks', json={'title': 'concurrent'}, headers=other)
+            latencies.append(time.perf_counter() - started)
+            if resp.status_code != 201:
+                failures.append(resp.status_code)
+
+    writers = [threading.Thread(target=writer) for _ in range(args.writers)]
+    for t in writers:
+        t.start()
+    time.sleep(0.5)
+    latencies.clear()
+
+    started = time.perf_counter()
+    if mode == 'orm':
+        with app.app_context():
+            project = db.session.scalars(
+                db.select(Project).where(Project.id == 1).options(
+                    selectinload(Project.tasks).selectinload(Task.comments),
+                    selectinload(Project.collaborators)
+                )
+            ).one()
+            db.session.delete(project)
+            db.session.commit()
+        returned = gone = time.perf_counter() - started
+    else:
+        resp = app.test_client().delete('/api/projects/1', headers=owner)
+        assert resp.status_code == 200, resp.get_data()
+        returned = time.perf_counter() - started
+        while job_runner.run_one('bench'):
+            pass
+        gone = time.perf_counter() - started
+
+    stop.set()
+    for t in writers:
+        t.join()
+    event.remove(Session, 'after_begin', _begin)
+    event.remove(Session, 'after_commit', _commit)
+
+    with app.app_context():
+        left = db.session.execute(text("SELECT count(*) FROM task WHERE project_id = 1")).scalar()
+    print(f"{mode:<6} {returned:8.2f} s {gone:8.2f} s  {len(transactions):5d} txns  "
+          f"{max(transactions):7.3f} s  {statistics.median(latencies) * 1000:8.1f} ms "
+          f"{max(latencies) * 1000:9.1f} ms  {len(failures):5d}  ({left} tasks left)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--mode', choices=('orm', 'purge'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        os.environ['REMINDER_INTERVAL'] = '0'
+        os.environ['JOBS_WORKERS']      = '0'
+        os.environ['SLOW_QUERY_MS']     = '600000'
+        run(args.mode, args)
+        return
+
+    print(f"{args.tasks} tasks, chunks of {args.chunk_size}, {args.writers} concurrent writers")
+    print(f"{'':<6} {'returned':>10} {'gone':>10}  {'txns':>9}  {'longest':>9}  "
+          f"{'writer p50':>11} {'writer max':>12}  {'fails':>5}")
+    for mode in ('orm', 'purge'):
+        subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--tasks', str(args.tasks),
+             '--chunk-size', str(args.chunk_size), '--writers', str(args.writers)],
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
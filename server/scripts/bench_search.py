@@ -0,0 +1,137 @@
+"""
+Latency of /api/tasks/search on a large SQLite database.
+
+Seeds a throwaway database (default 1M tasks, a comment on every fourth
+task) whose titles, descriptions and comments are drawn from a Zipf-
+distributed vocabulary, so some words are rare and some appear in a large
+share of rows. The FTS tables are filled by the same triggers the app
+uses. Then it issues searches through the Flask test client as random
+users and reports p50/p95 per query shape.
+
+    python scripts/bench_search.py --tasks 1000000 --queries 200
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+VOCABULARY = 20000
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def word(rank):
+    return f'w{rank}'
+
+
+# Zipf (s=1) over the vocabulary: w1 is ~9% of all words, like "the" in English
+_CUM_WEIGHTS = list(itertools.accumulate(1 / r for r in range(1, VOCABULARY + 1)))
+
+
+def sentence(rnd, lo, hi):
+    ranks = rnd.choices(range(1, VOCABULARY + 1), cum_weights=_CUM_WEIGHTS, k=rnd.randint(lo, hi))
+    return ' '.join(word(r) for r in ranks)
+
+
+def seed(conn, n_tasks, n_users=2000, n_projects=5000):
+    from sqlalchemy import text
+
+    now = datetime.utcnow()
+    rnd = random.Random(42)
+    conn.execute(text(
+        "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+        "VALUES ('u', 'u', :email, 'x', :now)"
+    ), [{'email': f'user{i}@example.com', 'now': now} for i in range(n_users)])
+    conn.execute(text(
+        "INSERT INTO project (name, owner_id, created_at) VALUES ('p', :owner, :now)"
+    ), [{'owner': rnd.randint(1, n_users), 'now': now} for _ in range(n_projects)])
+    members = {(rnd.randint(1, n_users), rnd.randint(1, n_projects)) for _ in range(n_projects * 3)}
+    conn.execute(text(
+        "INSERT INTO collaborator (user_id, project_id, role, created_at) "
+        "VALUES (:user, :project, 'member', :now)"
+    ), [{'user': u, 'project': p, 'now': now} for u, p in sorted(members)])
+
+    statuses = ('pending', 'in-progress', 'done')
+    batch    = 50000
+    for start in range(0, n_tasks, batch):
+        conn.execute(text(
+            "INSERT INTO task (title, description, status, due_date, assignee_id, project_id, created_at, updated_at) "
+            "VALUES (:title, :description, :status, :due, :assignee, :project, :now, :now)"
+        ), [{
+            'title':       sentence(rnd, 3, 8),
+            'description': sentence(rnd, 0, 30),
+            'status':      rnd.choice(statuses),
+            'due':         now + timedelta(hours=rnd.randint(-2000, 2000)),
+            'assignee':    rnd.randint(1, n_users),
+            'project':     rnd.randint(1, n_projects),
+            'now':         now,
+        } for _ in range(start, min(start + batch, n_tasks))])
+    conn.execute(text(
+        "INSERT INTO comment (task_id, user_id, text, created_at) VALUES (:task, :user, :text, :now)"
+    ), [{
+        'task': task_id,
+        'user': rnd.randint(1, n_users),
+        'text': sentence(rnd, 3, 15),
+        'now':  now,
+    } for task_id in range(4, n_tasks + 1, 4)])
+    return n_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=200, help='searches per query shape')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_search.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        with db.engine.begin() as conn:
+            n_users = seed(conn, args.tasks)
+            conn.exec_driver_sql('ANALYZE')
+        print(f'seeded {args.tasks} tasks (+ FTS) in {time.perf_counter() - started:.1f} s '
+              f'({os.path.getsize(path) / 2**20:.0f} MiB)')
+        tokens = [create_access_token(identity=str(u)) for u in range(1, n_users + 1)]
+
+    rnd    = random.Random(7)
+    shapes = {
+        'stopword-like (top 3)': lambda: word(rnd.randint(1, 3)),
+        'common word':           lambda: word(rnd.randint(10, 100)),
+        'mid-frequency word':    lambda: word(rnd.randint(100, 1000)),
+        'rare word':             lambda: word(rnd.randint(5000, VOCABULARY)),
+        'two words':             lambda: f'{word(rnd.randint(10, 100))} {word(rnd.randint(100, 2000))}',
+        'prefix (typing)':       lambda: word(rnd.randint(100, 999))[:3],
+        'word + status filter':  lambda: f'{word(rnd.randint(10, 200))}&status=pending',
+    }
+    client = app.test_client()
+    for name, make in shapes.items():
+        latencies, hits = [], 0
+        for _ in range(args.queries):
+            headers = {'Authorization': f'Bearer {rnd.choice(tokens)}'}
+            started = time.perf_counter()
+            resp = client.get(f'/api/tasks/search?q={make()}', headers=headers)
+            latencies.append(time.perf_counter() - started)
+            hits += len(resp.get_json()['results'])
+        print(f'{name:>21}: p50 {percentile(latencies, 50) * 1000:6.2f} ms  '
+              f'p95 {percentile(latencies, 95) * 1000:6.2f} ms  avg hits/page {hits / args.queries:.1f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Time to serialize a 10k-task listing, before vs after the schema layer.
+
+before: load Task instances through the ORM, build each dict by hand (as
+        the routes used to) and encode with Flask's stdlib JSON provider.
+after:  SELECT just the schema's columns, turn each Row into a dict with
+        Task.schema.dumper() and encode with the orjson provider.
+
+Each variant is split into "build" (query + dicts) and "encode" (dicts ->
+response body) and reported as the median of --repeat runs.
+
+    python scripts/bench_serialize.py --tasks 10000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def seed(conn, n_tasks):
+    from sqlalchemy import text
+
+    now = datetime.utcnow()
+    conn.execute(text(
+        "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+        "VALUES ('Bench', 'User', 'bench@example.com', 'x', :now)"
+    ), {'now': now})
+    conn.execute(text(
+        "INSERT INTO project (name, owner_id, created_at) VALUES ('bench', 1, :now)"
+    ), {'now': now})
+    conn.execute(text(
+        "INSERT INTO task (title, description, status, due_date, assignee_id, project_id, created_at, updated_at) "
+        "VALUES (:title, :description, 'pending', :due, 1, 1, :now, :now)"
+    ), [{
+        'title':       f'task {i}',
+        'description': f'description of task {i} ' * 4,
+        'due':         now + timedelta(hours=i),
+        'now':         now,
+    } for i in range(n_tasks)])
+
+
+def build_before():
+    from models.task import Task
+
+    return [{
+        'id':          t.id,
+        'title':       t.title,
+        'description': t.description,
+        'status':      t.status,
+        'due_date':    t.due_date.isoformat() if t.due_date else None,
+        'assignee_id': t.assignee_id,
+        'project_id':  t.project_id,
+        'created_at':  t.created_at.isoformat(),
+        'updated_at':  t.updated_at.isoformat(),
+    } for t in Task.query.filter_by(project_id=1).all()]
+
+
+def build_after():
+    from extensions import db
+    from models.task import Task
+
+    dump = Task.schema.dumper()
+    rows = db.session.execute(db.select(*Task.schema.columns()).where(Task.project_id == 1))
+    return [dump(row) for row in rows]
+
+
+def timed(fn, repeat, cleanup=None):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result  = fn()
+        samples.append(time.perf_counter() - started)
+        if cleanup:
+            cleanup()
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_serialize.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask.json.provider import DefaultJSONProvider
+    from main import create_app
+    from extensions import db
+    from app.json_provider import OrjsonProvider, orjson
+
+    if orjson is None:
+        raise SystemExit('orjson is not installed')
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            seed(conn, args.tasks)
+
+    providers = {'before': DefaultJSONProvider(app), 'after': OrjsonProvider(app)}
+    builders  = {'before': build_before, 'after': build_after}
+    results   = {}
+    for name in ('before', 'after'):
+        with app.test_request_context():
+            build_ms, records = timed(builders[name], args.repeat, cleanup=db.session.remove)
+            encode_ms, resp   = timed(lambda: providers[name].response(records), args.repeat)
+            results[name] = (build_ms, encode_ms, len(resp.get_data()))
+        print(f'{name:>6}: build {build_ms:7.2f} ms  encode {encode_ms:7.2f} ms  '
+              f'total {build_ms + encode_ms:7.2f} ms  ({results[name][2] / 1024:.0f} KiB)')
+
+    before, after = results['before'], results['after']
+    print(f'speedup: build x{before[0] / after[0]:.1f}  encode x{before[1] / after[1]:.1f}  '
+          f'total x{(before[0] + before[1]) / (after[0] + after[1]):.1f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Concurrent-writer load test against a file-backed SQLite database.
+
+Runs the same workload in a fresh process per mode:
+
+    none     no pragmas: rollback journal, synchronous=FULL and
+             busy_timeout=0, which also turns off the 5 s timeout
+             pysqlite sets itself, so a writer that finds the database
+             locked fails at once
+    default  the same journal with Config's busy_timeout
+    wal      the WAL settings from Config
+
+Each of N threads creates, updates and lists tasks through the Flask
+test client; the script reports throughput, how many requests failed
+and how many of those were "database is locked".
+
+    python scripts/bench_sqlite_wal.py --threads 16 --iterations 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+MODES = {
+    'none':    {'SQLITE_JOURNAL_MODE': '',       'SQLITE_SYNCHRONOUS': '',       'SQLITE_BUSY_TIMEOUT': '0'},
+    'default': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_BUSY_TIMEOUT': '5000'},
+    'wal':     {'SQLITE_JOURNAL_MODE': 'WAL',    'SQLITE_SYNCHRONOUS': 'NORMAL', 'SQLITE_BUSY_TIMEOUT': '5000'},
+}
+
+
+def run_workload(threads, iterations):
+    path = os.path.join(tempfile.mkdtemp(), 'bench_wal.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask import got_request_exception
+    from flask_jwt_extended import create_access_token
+    from main import create_app
+    from extensions import db
+    from models.user import User
+    from models.project import Project
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Bench', last_name='User', email='bench@example.com', password_hash='x')
+        db.session.add(owner)
+        db.session.flush()
+        project = Project(name='bench', owner_id=owner.id)
+        db.session.add(project)
+        db.session.commit()
+        project_id = project.id
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(owner.id))}'}
+
+    errors, locked, done = [], [], []
+
+    # failed requests are counted here rather than logged
+    app.logger.disabled = True
+
+    def on_exception(sender, exception, **extra):
+        if 'database is locked' in str(exception):
+            locked.append(exception)
+    got_request_exception.connect(on_exception, app)
+
+    def worker():
+        client = app.test_client()
+        ok = 0
+        for i in range(iterations):
+            try:
+                resp = client.post(f'/api/projects/{project_id}/tasks', json={'title': f'task {i}'}, headers=headers)
+                if resp.status_code != 201:
+                    errors.append(resp.status_code)
+                    continue
+                task_id = resp.get_json()['id']
+                resp = client.put(f'/api/projects/{project_id}/tasks/{task_id}',
+                                  json={'status': 'done'}, headers=headers)
+                if resp.status_code != 200:
+                    errors.append(resp.status_code)
+                    continue
+                resp = client.get(f'/api/projects/{project_id}/tasks?limit=20', headers=headers)
+                if resp.status_code != 200:
+                    errors.append(resp.status_code)
+                    continue
+                ok += 1
+            except Exception as e:
+                errors.append(type(e).__name__)
+                if 'database is locked' in str(e):
+                    locked.append(e)
+        done.append(ok)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'iterations_ok': sum(done),
+        'errors':        len(errors),
+        'locked':        len(locked),
+        'error_kinds':   sorted({str(e) for e in errors}),
+        'seconds':       round(elapsed, 2),
+        'ops_per_sec':   round(sum(done) * 3 / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_workload(args.threads, args.iterations)))
+        return
+
+    for mode, env in MODES.items():
+        out = subprocess.run(
+            [sys.executable, __file__, '--mode', mode,
+             '--threads', str(args.threads), '--iterations', str(args.iterations)],
+            env={**os.environ, **env}, capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f'{mode:>8}: {result}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Cold start: a new process importing main, building the app and serving
+its first request.
+
+Each configuration runs --runs times, every time in a fresh interpreter
+against a small seeded SQLite file, and reports the median per phase:
+
+    import      importing main and everything it pulls in
+    extensions  create_app() up to the blueprints
+    blueprints  importing and registering the enabled route modules
+    warm_up     mappers, URL map and first connection (0 when off)
+    first       first GET /api/projects/1/tasks
+    second      the same request again
+    process     wall clock of the whole process, interpreter start-up included
+
+--importtime adds one ``python -X importtime -c "import main"`` and
+lists the top-level packages that account for most of the import.
+
+    python scripts/bench_startup.py --runs 9
+    python scripts/bench_startup.py --features auth,projects,tasks --importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(SERVER_DIR)
+
+PHASES = ('import', 'extensions', 'blueprints', 'warm_up', 'first', 'second', 'process')
+
+PROBE = '''
+import json, sys, time
+import main
+from flask_jwt_extended import create_access_token
+app = main.create_app(features=sys.argv[1] or None, warm=sys.argv[2] == "1")
+with app.app_context():
+    headers = {"Authorization": "Bearer " + create_access_token(identity="1")}
+client  = app.test_client()
+timings = dict(app.extensions["startup"])
+for name in ("first", "second"):
+    started = time.perf_counter()
+    resp    = client.get("/api/projects/1/tasks", headers=headers)
+    timings[name] = time.perf_counter() - started
+    assert resp.status_code == 200, resp.status_code
+print(json.dumps(timings))
+'''
+
+
+def seed(db_path):
+    import sqlite3
+    from main import create_app
+    from extensions import db
+
+    app = create_app(features=(), warm=False)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO user (first_name, last_name, email, password_hash, created_at) "
+            "VALUES ('Bench', 'User', 'bench@bench.test', 'x', CURRENT_TIMESTAMP)"
+        )
+        conn.execute("INSERT INTO project (name, owner_id, created_at) VALUES ('bench', 1, CURRENT_TIMESTAMP)")
+        conn.executemany(
+            "INSERT INTO task (title, status, project_id, created_at, updated_at) "
+            "VALUES (?, 'pending', 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            [(f'task {i}',) for i in range(20)]
+        )
+
+
+def run_once(features, warm):
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE, features or '', '1' if warm else '0'],
+        cwd=SERVER_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(out.strip().splitlines()[-1])
+    timings['process'] = time.perf_counter() - started
+    timings['warm_up'] = sum(v for k, v in timings.items() if k.startswith('warm_up.'))
+    return timings
+
+
+def import_profile(top):
+    err = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=SERVER_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    # lines look like "import time:   self [us] | cumulative | imported package";
+    # summing self time per top-level name avoids double counting nested imports
+    packages = {}
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    total = sum(packages.values())
+    print(f"\nimport main: {total / 1000:.1f} ms of self time; largest top-level packages")
+    for package, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {package:<24} {us / 1000:7.1f} ms  {us / total:6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=9)
+    parser.add_argument('--features', help='also measure with only these features, e.g. auth,projects,tasks')
+    parser.add_argument('--importtime', action='store_true')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_startup.db')
+    # inherited by the probe processes
+    os.environ['DATABASE_URL']      = f'sqlite:///{db_path}'
+    os.environ['REMINDER_INTERVAL'] = '0'
+    os.environ['SLOW_QUERY_MS']     = '600000'
+    seed(db_path)
+
+    configs = [('all features, no warm-up', None, False), ('all features, warm-up', None, True)]
+    if args.features:
+        configs.append((f'{args.features}, warm-up', args.features, True))
+
+    print(f"median of {args.runs} fresh processes, ms")
+    print(f"{'':<32}" + ''.join(f"{p:>11}" for p in PHASES))
+    for name, features, warm in configs:
+        runs = [run_once(features, warm) for _ in range(args.runs)]
+        print(f"{name:<32}" + ''.join(
+            f"{statistics.median(r[p] for r in runs) * 1000:>11.1f}" for p in PHASES
+        ))
+
+    if args.importtime:
+        import_profile(args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Check that conditional GETs answer 304 with a single SQL statement.
+
+Seeds a project with a few tasks and comments in a throwaway SQLite
+database, GETs each listing once (which also warms the membership and
+user caches), then repeats the request with If-None-Match set to the
+ETag it returned. Every repeat must be a 304 that ran exactly one
+statement, the revision lookup, counted with
+app.instrumentation.count_queries. Exits 1 otherwise.
+
+    python scripts/check_conditional_get.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ENDPOINTS = (
+    ('get_projects', '/api/projects'),
+    ('get_project',  '/api/projects/1'),
+    ('get_tasks',    '/api/projects/1/tasks'),
+    ('get_comments', '/api/comments/1'),
+)
+
+
+def main():
+    os.environ['DATABASE_URL']      = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "check_conditional_get.db")}'
+    os.environ['REMINDER_INTERVAL'] = '0'
+    os.environ['JOBS_WORKERS']      = '0'
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import text
+    from main import create_app
+    from extensions import db
+    from app.instrumentation import count_queries
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO user (first_name, last_name, email, password_hash) "
+                "VALUES ('Check', 'User', 'check@check.test', 'x')"
+            ))
+            conn.execute(text("INSERT INTO project (name, owner_id, revision) VALUES ('check', 1, 1)"))
+            conn.execute(text(
+                "INSERT INTO task (title, status, project_id) VALUES ('one', 'pending', 1), ('two', 'done', 1)"
+            ))
+            conn.execute(text(
+                "INSERT INTO comment (task_id, user_id, text) VALUES (1, 1, 'first'), (1, 1, 'second')"
+            ))
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    client = app.test_client()
+    failed = False
+    with app.app_context():
+        for name, path in ENDPOINTS:
+            resp = client.get(path, headers=headers)
+            etag = resp.headers.get('ETag')
+            if resp.status_code != 200 or not etag:
+                print(f"FAIL {name:<13} first GET: {resp.status_code}, ETag {etag!r}")
+                failed = True
+                continue
+            with count_queries() as q:
+                resp = client.get(path, headers={**headers, 'If-None-Match': etag})
+            ok = resp.status_code == 304 and q.count == 1
+            failed |= not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name:<13} {resp.status_code}  {q.count} statement(s)")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,14 @@
 import os
 import sys
 
-# Add the parent directory to the path so Python can find 'app'
+# Add the parent directory to the path so Python can find 'main'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app import create_app  # this initializes db with app
-from extensions import db   # import AFTER app is created
+from main import create_app  # this initializes db with app
+from extensions import db     # import AFTER app is created
 
-app = create_app()
+# tables only: no routes to register and nothing to warm up
+app = create_app(features=(), warm=False)
 
 with app.app_context():
     db.create_all()